@@ -0,0 +1,45 @@
+"""Add HNSW approximate-nearest-neighbour index on embedding vectors
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-04-29
+
+Vector search previously had no ANN index, so every query computed the cosine
+distance against every chunk of the wiki and sorted the lot. This adds an HNSW
+index for cosine distance.
+
+pgvector caps HNSW on `vector` at 2000 dimensions, and text-embedding-3-large
+produces 3072, so the index is built on a `halfvec` cast of the column
+(supported up to 4000 dimensions). The search query orders by the same
+expression so the planner can use it. Half precision only affects candidate
+ranking inside the index; stored vectors keep full precision.
+
+Uses CREATE INDEX CONCURRENTLY so the embedding worker keeps writing while the
+graph is being built.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from mw_mcp_server.config import settings
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dims = settings.embedding_dimensions
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_embedding_hnsw "
+            f"ON embedding USING hnsw ((embedding::halfvec({dims})) halfvec_cosine_ops) "
+            "WITH (m = 16, ef_construction = 128)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_embedding_hnsw")
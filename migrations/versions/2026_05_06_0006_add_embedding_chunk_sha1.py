@@ -0,0 +1,31 @@
+"""Add chunk_sha1 column to embedding table
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-05-06
+
+content_sha1 only lets the worker skip pages whose whole content is
+unchanged. An ordinary edit changes one or two chunks of a page, yet every
+chunk was re-embedded. Storing the SHA1 of each chunk's text lets the worker
+reuse the stored vector for every chunk whose text it already embedded with
+the current model. Nullable; legacy rows simply never match.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE embedding ADD COLUMN IF NOT EXISTS chunk_sha1 VARCHAR(40)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE embedding DROP COLUMN IF EXISTS chunk_sha1")
@@ -0,0 +1,55 @@
+"""Store embedding vectors as halfvec
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-05-06
+
+Vectors were stored as full-precision `vector` and only cast to `halfvec`
+for the HNSW index (migration 0005). At 3072 dimensions that is 12 KB per
+row on disk, in WAL and on the wire for every insert. Storing `halfvec`
+directly halves all of it; search already ranked on half precision, so
+results are unchanged.
+
+The HNSW index is rebuilt on the plain column. ALTER COLUMN TYPE rewrites
+the table under an exclusive lock, so run this in a maintenance window on
+large installs.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from mw_mcp_server.config import settings
+
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dims = settings.embedding_dimensions
+    op.execute("DROP INDEX IF EXISTS idx_embedding_hnsw")
+    op.execute(
+        f"ALTER TABLE embedding ALTER COLUMN embedding TYPE halfvec({dims}) "
+        f"USING embedding::halfvec({dims})"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_embedding_hnsw "
+        "ON embedding USING hnsw (embedding halfvec_cosine_ops) "
+        "WITH (m = 16, ef_construction = 128)"
+    )
+
+
+def downgrade() -> None:
+    dims = settings.embedding_dimensions
+    op.execute("DROP INDEX IF EXISTS idx_embedding_hnsw")
+    op.execute(
+        f"ALTER TABLE embedding ALTER COLUMN embedding TYPE vector({dims}) "
+        f"USING embedding::vector({dims})"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_embedding_hnsw "
+        f"ON embedding USING hnsw ((embedding::halfvec({dims})) halfvec_cosine_ops) "
+        "WITH (m = 16, ef_construction = 128)"
+    )
@@ -0,0 +1,98 @@
+"""Add trigger-maintained embedding_page_summary table
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-05-07
+
+/embeddings/stats grouped every chunk row of a wiki by page_title on each
+call, so its cost grew with the corpus rather than the page count. This
+adds a per-page rollup (chunk count, latest last_modified and rev_id) kept
+current by statement-level triggers on embedding.
+
+The triggers recompute only the pages touched by the statement, from the
+transition table, so a page replace (DELETE + INSERT) costs two small
+indexed aggregates. The upsert keeps concurrent writers to one page safe.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS embedding_page_summary (
+            wiki_id VARCHAR(64) NOT NULL,
+            page_title TEXT NOT NULL,
+            chunk_count INTEGER NOT NULL,
+            last_modified TIMESTAMP WITHOUT TIME ZONE,
+            rev_id BIGINT,
+            PRIMARY KEY (wiki_id, page_title)
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_embedding_page_summary()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            DELETE FROM embedding_page_summary s
+            USING (SELECT DISTINCT wiki_id, page_title FROM changed_rows) a
+            WHERE s.wiki_id = a.wiki_id
+              AND s.page_title = a.page_title
+              AND NOT EXISTS (
+                  SELECT 1 FROM embedding e
+                  WHERE e.wiki_id = a.wiki_id AND e.page_title = a.page_title
+              );
+
+            INSERT INTO embedding_page_summary
+                (wiki_id, page_title, chunk_count, last_modified, rev_id)
+            SELECT e.wiki_id, e.page_title, count(*), max(e.last_modified), max(e.rev_id)
+            FROM embedding e
+            JOIN (SELECT DISTINCT wiki_id, page_title FROM changed_rows) a
+              ON e.wiki_id = a.wiki_id AND e.page_title = a.page_title
+            GROUP BY e.wiki_id, e.page_title
+            ON CONFLICT (wiki_id, page_title) DO UPDATE SET
+                chunk_count = EXCLUDED.chunk_count,
+                last_modified = EXCLUDED.last_modified,
+                rev_id = EXCLUDED.rev_id;
+
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for event, table in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+        name = f"trg_embedding_summary_{event.lower()}"
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON embedding")
+        op.execute(
+            f"CREATE TRIGGER {name} AFTER {event} ON embedding "
+            f"REFERENCING {table} TABLE AS changed_rows "
+            "FOR EACH STATEMENT EXECUTE FUNCTION refresh_embedding_page_summary()"
+        )
+    op.execute(
+        """
+        INSERT INTO embedding_page_summary
+            (wiki_id, page_title, chunk_count, last_modified, rev_id)
+        SELECT wiki_id, page_title, count(*), max(last_modified), max(rev_id)
+        FROM embedding
+        GROUP BY wiki_id, page_title
+        ON CONFLICT (wiki_id, page_title) DO UPDATE SET
+            chunk_count = EXCLUDED.chunk_count,
+            last_modified = EXCLUDED.last_modified,
+            rev_id = EXCLUDED.rev_id
+        """
+    )
+
+
+def downgrade() -> None:
+    for event in ("insert", "update", "delete"):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_embedding_summary_{event} ON embedding")
+    op.execute("DROP FUNCTION IF EXISTS refresh_embedding_page_summary()")
+    op.execute("DROP TABLE IF EXISTS embedding_page_summary")
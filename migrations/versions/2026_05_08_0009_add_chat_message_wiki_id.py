@@ -0,0 +1,49 @@
+"""Denormalize wiki_id onto chat_message
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-05-08
+
+The usage stats query counted messages per wiki by joining every message in
+the window to chat_session just to read its wiki_id. Storing wiki_id on the
+message itself (it never changes for a session) and indexing
+(wiki_id, created_at) turns that into a join-free, index-only count.
+
+Existing rows are backfilled from their session before the column becomes
+NOT NULL. The index is built CONCURRENTLY, outside the transaction, so chat
+writes are not blocked while it builds.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE chat_message ADD COLUMN IF NOT EXISTS wiki_id VARCHAR(64)")
+    op.execute(
+        """
+        UPDATE chat_message AS m
+        SET wiki_id = s.wiki_id
+        FROM chat_session AS s
+        WHERE m.session_id = s.session_id AND m.wiki_id IS NULL
+        """
+    )
+    op.execute("ALTER TABLE chat_message ALTER COLUMN wiki_id SET NOT NULL")
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_message_wiki_created "
+            "ON chat_message (wiki_id, created_at)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_message_wiki_created")
+    op.execute("ALTER TABLE chat_message DROP COLUMN IF EXISTS wiki_id")
@@ -0,0 +1,45 @@
+"""Add covering indexes for the usage stats aggregations
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-05-08
+
+/stats/usage filters token_usage by usage_date and chat_session by
+created_at, then groups by wiki_id. Neither column was indexed, so both
+aggregations read the whole heap. These indexes lead with the date filter
+and carry every column the aggregation reads, allowing index-only scans
+of just the requested window.
+
+(chat_message is covered by idx_message_wiki_created from 0009; embedding
+counts come from embedding_page_summary since 0008.)
+
+Built CONCURRENTLY so the rate limiter and chat writes are not blocked.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_usage_date_wiki "
+            "ON token_usage (usage_date, wiki_id) "
+            "INCLUDE (total_tokens, prompt_tokens, completion_tokens, request_count, user_id)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_session_created_wiki "
+            "ON chat_session (created_at, wiki_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_session_created_wiki")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_usage_date_wiki")
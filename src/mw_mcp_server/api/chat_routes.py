@@ -30,13 +30,27 @@ Security Model
 from __future__ import annotations
 
 import asyncio
-import json
+import functools
+import hashlib
+import inspect
 import logging
 import time
-from typing import Annotated, Any, Awaitable, Dict, List, Optional, Protocol, Tuple
-from uuid import UUID
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+)
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -45,10 +59,10 @@ from sqlalchemy.orm import selectinload
 from ..auth.models import UserContext
 from ..auth.security import require_scopes
 from ..config import settings
-from ..db import ChatMessage, ChatSession, VectorStore
+from ..db import AsyncSessionLocal, ChatMessage, ChatSession, VectorStore
 from ..db.rate_limiter import RateLimiter
 from ..embeddings.embedder import Embedder
-from ..llm.client import LLMClient
+from ..llm.client import ChatResult, LLMClient
 from ..prompts import CHAT_SYSTEM_PROMPT, EDITOR_SYSTEM_PROMPT
 from ..tools.base import dispatch_tool_call
 from ..tools.definitions import TOOL_DEFINITIONS
@@ -70,17 +84,30 @@ router = APIRouter(prefix="/chat", tags=["chat"])
 NS_CATEGORY = 14
 NS_PROPERTY = 102
 
+# Stored and returned when the model ends a turn without any text (e.g. a
+# content-filtered reply), since an empty assistant message fails validation.
+_EMPTY_ANSWER_FALLBACK = "The assistant did not return an answer. Please try again."
+
 # In-process TTL cache for schema context. Schema only changes when embeddings
 # are added/deleted (via the background worker). 60s of staleness is acceptable
 # and saves 2-3 DB queries per chat turn.
 _SCHEMA_CACHE_TTL_SECONDS = 60.0
-# Bound the cache so a long-running process with many distinct
-# (wiki_id, allowed_namespaces) combos can't grow it unboundedly. When full,
+# The rendered text only depends on whether the user may see categories and
+# properties, so entries are keyed on (wiki_id, can_see_cats, can_see_props)
+# rather than the full namespace list.
+# Bound the cache so a long-running process with many wikis can't grow it
+# unboundedly. When full,
 # the oldest entry is evicted; ordering is by insertion order via dict.
 # Sized so total resident schema text stays well under 10 MB even with
 # schema_cap at its upper bound (~2000 elements × ~30 chars × 2 kinds).
 _SCHEMA_CACHE_MAX_ENTRIES = 512
-_schema_cache: Dict[Tuple[str, Optional[Tuple[int, ...]]], Tuple[float, str]] = {}
+_schema_cache: Dict[Tuple[str, bool, bool], Tuple[float, str]] = {}
+# Single-flight locks: concurrent misses for the same key wait for the first
+# request to fill the cache instead of all hitting the database.
+_schema_cache_locks: Dict[Tuple[str, bool, bool], asyncio.Lock] = {}
+
+# In-flight session-less /chat requests, keyed by _inflight_chat_key().
+_inflight_chats: Dict[bytes, "asyncio.Future[ChatResponse]"] = {}
 
 
 # ---------------------------------------------------------------------
@@ -108,6 +135,54 @@ def _to_llm_messages(messages: List[Any]) -> List[Dict[str, str]]:
     ]
 
 
+def _drop_replayed_messages(
+    history: List[Dict[str, str]],
+    incoming: List[ChatMessageModel],
+) -> List[ChatMessageModel]:
+    """Return the request messages that don't repeat the end of the stored history.
+
+    A client that resends the whole conversation alongside a ``session_id``
+    would otherwise have every earlier turn stored, and sent to the LLM, twice.
+    Only a leading run of ``incoming`` that exactly matches the history tail is
+    dropped, so a user legitimately repeating themselves is unaffected.
+    """
+    for overlap in range(min(len(history), len(incoming)), 0, -1):
+        tail = history[-overlap:]
+        if all(
+            h["role"] == m.role and h["content"] == m.content
+            for h, m in zip(tail, incoming)
+        ):
+            return incoming[overlap:]
+    return incoming
+
+
+def _new_turn_messages(
+    history: List[Dict[str, str]],
+    incoming: List[ChatMessageModel],
+) -> List[ChatMessageModel]:
+    """Return the messages this turn adds, rejecting a request that adds none.
+
+    A request that only replays the stored conversation would otherwise call
+    the LLM again and store a second assistant reply to the same message.
+    """
+    new_messages = _drop_replayed_messages(history, incoming)
+    if not new_messages:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The request contains no messages beyond the stored conversation.",
+        )
+    return new_messages
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialize a tool payload compactly; unknown types fall back to str().
+
+    Compact UTF-8 output (no separator padding or \\u escapes) also keeps
+    tool results shorter in LLM tokens than ``json.dumps`` defaults.
+    """
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
 def _append_tool_result(
     loop_messages: List[Dict[str, Any]],
     call_id: str,
@@ -118,11 +193,117 @@ def _append_tool_result(
         {
             "role": "tool",
             "tool_call_id": call_id,
-            "content": json.dumps(tool_output, default=str),
+            "content": _json_dumps(tool_output),
         }
     )
 
 
+def _parse_tool_args(
+    func_name: str,
+    func_args_str: str,
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, str]]]:
+    """Parse a tool call's JSON arguments.
+
+    Returns ``(args, None)`` on success, or ``(None, error_output)`` where
+    ``error_output`` is the tool result to report back to the LLM.
+    """
+    try:
+        parsed_args = orjson.loads(func_args_str)
+    except orjson.JSONDecodeError:
+        logger.warning("Tool %s sent invalid JSON args: %r", func_name, func_args_str)
+        return None, {"error": "Invalid JSON arguments for tool call."}
+
+    if not isinstance(parsed_args, dict):
+        return None, {"error": "Tool arguments must be a JSON object."}
+
+    return parsed_args, None
+
+
+async def _execute_tool_call(
+    func_name: str,
+    parsed_args: Dict[str, Any],
+    user: UserContext,
+    vector_store: Any,
+    embedder: Embedder,
+) -> Tuple[Any, bool]:
+    """Dispatch one tool call, converting failures into an error result.
+
+    Returns ``(tool_output, ok)``; never raises for tool errors so that
+    concurrent calls can be gathered without one failure cancelling the rest.
+    """
+    try:
+        tool_output = await dispatch_tool_call(
+            func_name,
+            parsed_args,
+            user,
+            vector_store=vector_store,
+            embedder=embedder,
+        )
+    except Exception as exc:
+        logger.exception("Tool %s execution failed", func_name)
+        return {"error": f"Tool execution failed: {type(exc).__name__}"}, False
+    return tool_output, True
+
+
+class _ToolCallMemo:
+    """Per-request memo of tool results keyed by tool name and arguments.
+
+    Models often repeat an identical read within one turn or across loop
+    iterations (the same page, the same query). Repeats share the first
+    call's result instead of dispatching again. Scoped to a single request
+    because results are permission-filtered for the calling user. Failed
+    calls are forgotten so a later retry runs for real.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Tuple[str, bytes], "asyncio.Task[Tuple[Any, bool]]"] = {}
+
+    async def run(
+        self,
+        func_name: str,
+        parsed_args: Dict[str, Any],
+        user: UserContext,
+        vector_store: Any,
+        embedder: Embedder,
+    ) -> Tuple[Any, bool]:
+        key = (func_name, orjson.dumps(parsed_args, option=orjson.OPT_SORT_KEYS))
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                _execute_tool_call(func_name, parsed_args, user, vector_store, embedder)
+            )
+            self._calls[key] = task
+        tool_output, ok = await task
+        if not ok:
+            self._calls.pop(key, None)
+        return tool_output, ok
+
+
+class _SerializedVectorStore:
+    """Proxy that serializes a VectorStore's async methods behind one lock.
+
+    An AsyncSession must not run two operations at once. Wrapping the store
+    lets concurrently dispatched tools share it safely: their DB queries run
+    one at a time while everything else they do still overlaps.
+    """
+
+    def __init__(self, inner: VectorStore) -> None:
+        self._inner = inner
+        self._lock = asyncio.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._inner, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def locked(*args: Any, **kwargs: Any) -> Any:
+            async with self._lock:
+                return await attr(*args, **kwargs)
+
+        return locked
+
+
 async def _load_user_session(
     session: AsyncSession,
     session_id: str,
@@ -152,6 +333,81 @@ async def _load_user_session(
     return result.scalar_one_or_none()
 
 
+# The driver returns a fresh string per row; mapping senders onto these
+# constants keeps one shared object per role across every loaded history.
+_CANONICAL_ROLES: Dict[str, str] = {
+    role: role for role in ("system", "user", "assistant", "tool")
+}
+
+
+async def _load_history(session: AsyncSession, session_id: UUID) -> List[Dict[str, str]]:
+    """Load a session's messages directly in LLM message shape.
+
+    Selects only sender and content, so history is never materialized as ORM
+    objects (or carries the metadata JSON) just to be converted into dicts.
+    Rows from one turn share a ``created_at`` (the transaction timestamp), so
+    ``message_id`` breaks ties to keep insertion order.
+    """
+    result = await session.execute(
+        select(ChatMessage.sender, ChatMessage.content)
+        .where(ChatMessage.session_id == session_id)
+        .order_by(ChatMessage.created_at, ChatMessage.message_id)
+    )
+    return [
+        {"role": _CANONICAL_ROLES.get(sender, sender), "content": content}
+        for sender, content in result
+    ]
+
+
+def _new_chat_session(session: AsyncSession, user: UserContext) -> ChatSession:
+    """Stage a new ChatSession for the user.
+
+    The UUID is generated client-side so the session ID is known immediately;
+    the INSERT is deferred to the request's commit rather than paying for a
+    separate flush round-trip up front.
+    """
+    db_session = ChatSession(
+        session_id=uuid4(),
+        wiki_id=user.wiki_id,
+        owner_user_id=user.user_id,
+    )
+    session.add(db_session)
+    return db_session
+
+
+def _persist_turn(
+    session: AsyncSession,
+    db_session: ChatSession,
+    user_messages: List[ChatMessageModel],
+    final_answer: str,
+    metadata: Dict[str, Any],
+) -> None:
+    """Stage the request messages and the assistant reply in one batch."""
+    rows = [
+        ChatMessage(
+            session_id=db_session.session_id,
+            wiki_id=db_session.wiki_id,
+            sender=msg.role,
+            content=msg.content,
+        )
+        for msg in user_messages
+    ]
+    rows.append(
+        ChatMessage(
+            session_id=db_session.session_id,
+            wiki_id=db_session.wiki_id,
+            sender="assistant",
+            content=final_answer or _EMPTY_ANSWER_FALLBACK,
+            metadata_=metadata,
+        )
+    )
+    session.add_all(rows)
+
+    if not db_session.title and user_messages:
+        first = user_messages[0].content
+        db_session.title = first[:100] + ("..." if len(first) > 100 else "")
+
+
 async def _get_schema_context(
     vector_store: VectorStore,
     wiki_id: str,
@@ -162,33 +418,74 @@ async def _get_schema_context(
     Only includes categories/properties the user has namespace access to.
     Cached in-process for ``_SCHEMA_CACHE_TTL_SECONDS``.
     """
-    cache_key = (wiki_id, tuple(sorted(allowed_namespaces)) if allowed_namespaces else None)
+    fetch_cats = allowed_namespaces is None or NS_CATEGORY in allowed_namespaces
+    fetch_props = allowed_namespaces is None or NS_PROPERTY in allowed_namespaces
+    cache_key = (wiki_id, fetch_cats, fetch_props)
+
     cached = _schema_cache.get(cache_key)
-    now = time.monotonic()
-    if cached and now - cached[0] < _SCHEMA_CACHE_TTL_SECONDS:
+    if cached and time.monotonic() - cached[0] < _SCHEMA_CACHE_TTL_SECONDS:
         return cached[1]
 
-    fetch_cats = allowed_namespaces is None or NS_CATEGORY in allowed_namespaces
-    fetch_props = allowed_namespaces is None or NS_PROPERTY in allowed_namespaces
+    lock = _schema_cache_locks.setdefault(cache_key, asyncio.Lock())
+    async with lock:
+        # Another request may have filled the entry while we waited.
+        cached = _schema_cache.get(cache_key)
+        now = time.monotonic()
+        if cached and now - cached[0] < _SCHEMA_CACHE_TTL_SECONDS:
+            return cached[1]
+
+        rendered = await _build_schema_context(
+            vector_store, wiki_id, fetch_cats, fetch_props
+        )
 
-    awaitables: List[Awaitable[Any]] = [vector_store.get_embedding_last_modified(wiki_id)]
-    if fetch_cats:
-        awaitables.append(vector_store.get_pages_by_namespace(wiki_id, NS_CATEGORY))
-    if fetch_props:
-        awaitables.append(vector_store.get_pages_by_namespace(wiki_id, NS_PROPERTY))
+        _schema_cache.pop(cache_key, None)
+        if len(_schema_cache) >= _SCHEMA_CACHE_MAX_ENTRIES:
+            # Evict the oldest entry; dicts preserve insertion order in 3.7+.
+            oldest = next(iter(_schema_cache))
+            _schema_cache.pop(oldest, None)
+            _schema_cache_locks.pop(oldest, None)
+        _schema_cache[cache_key] = (now, rendered)
+        return rendered
+
+
+def _prompt_cache_key(wiki_id: str, context: str) -> str:
+    """Group requests that share a system prompt for provider-side prompt caching."""
+    return f"mw-mcp:{wiki_id}:{context}"
+
+
+@functools.lru_cache(maxsize=64)
+def _compose_system_prompt(context: str, schema_context: str) -> str:
+    """Return the full system prompt for a chat context and schema block.
+
+    Memoized so repeated turns reuse one prompt string instead of
+    concatenating several KB per request. ``schema_context`` comes from the
+    schema cache, so the same string object is passed in and its hash is
+    computed once.
+    """
+    base_prompt = EDITOR_SYSTEM_PROMPT if context == "editor" else CHAT_SYSTEM_PROMPT
+    return base_prompt + schema_context
 
-    results = await asyncio.gather(*awaitables)
-    latest_ts = results[0]
-    idx = 1
-    cats: List[str] = results[idx] if fetch_cats else []
-    if fetch_cats:
-        idx += 1
-    props: List[str] = results[idx] if fetch_props else []
+
+async def _build_schema_context(
+    vector_store: VectorStore,
+    wiki_id: str,
+    fetch_cats: bool,
+    fetch_props: bool,
+) -> str:
+    """Query the vector store and render the schema block (uncached)."""
+    # Sequential on purpose: these share the request's AsyncSession, which
+    # cannot run concurrent operations (and a single connection would
+    # serialize them anyway).
+    latest_ts = await vector_store.get_embedding_last_modified(wiki_id)
+    cats: List[str] = (
+        await vector_store.get_pages_by_namespace(wiki_id, NS_CATEGORY) if fetch_cats else []
+    )
+    props: List[str] = (
+        await vector_store.get_pages_by_namespace(wiki_id, NS_PROPERTY) if fetch_props else []
+    )
 
     cap = settings.schema_cap
     parts = [f"\n\n[KNOWN SCHEMA ELEMENTS (truncated to first {cap} per kind)]\n"]
-    if latest_ts:
-        parts.append(f"Index last updated: {latest_ts.strftime('%Y-%m-%d %H:%M UTC')}\n")
     parts.append(f"Categories (~{len(cats)}): " + ", ".join(cats[:cap]))
     if len(cats) > cap:
         parts.append("...")
@@ -196,15 +493,14 @@ async def _get_schema_context(
     parts.append(f"Properties (~{len(props)}): " + ", ".join(props[:cap]))
     if len(props) > cap:
         parts.append("...")
-    parts.append("\n[END SCHEMA CONTEXT]\n\n")
+    parts.append("\n")
+    # Last, because it changes on every re-embed: everything above stays a
+    # byte-identical prompt prefix that the provider can serve from cache.
+    if latest_ts:
+        parts.append(f"Index last updated: {latest_ts.strftime('%Y-%m-%d %H:%M UTC')}\n")
+    parts.append("[END SCHEMA CONTEXT]\n\n")
 
-    rendered = "".join(parts)
-    if len(_schema_cache) >= _SCHEMA_CACHE_MAX_ENTRIES:
-        # Evict the oldest entry; dicts preserve insertion order in 3.7+.
-        oldest = next(iter(_schema_cache))
-        _schema_cache.pop(oldest, None)
-    _schema_cache[cache_key] = (now, rendered)
-    return rendered
+    return "".join(parts)
 
 
 # ---------------------------------------------------------------------
@@ -226,6 +522,7 @@ async def chat(
     embedder: Annotated[Embedder, Depends(get_embedder)],
     session: Annotated[AsyncSession, Depends(get_db_session)],
     rate_limiter: Annotated[RateLimiter, Depends(get_rate_limiter)],
+    background_tasks: BackgroundTasks,
 ) -> ChatResponse:
     """
     Core conversational endpoint for MediaWiki-assisted LLM interactions.
@@ -257,28 +554,54 @@ async def chat(
             ),
         )
 
+    async def run_turn() -> ChatResponse:
+        return await _chat_turn(
+            req, user, llm, vector_store, embedder, session, background_tasks
+        )
+
+    if req.session_id:
+        return await run_turn()
+
+    # Without a session there is no hidden state, so an identical request
+    # from the same user (a double submit or client retry) can share the
+    # result of the one already in flight. _chat_turn commits before
+    # returning, so followers never receive an uncommitted session_id.
+    return await _single_flight_chat(_inflight_chat_key(user, req), run_turn)
+
+
+async def _chat_turn(
+    req: ChatRequest,
+    user: UserContext,
+    llm: LLMClient,
+    vector_store: VectorStore,
+    embedder: Embedder,
+    session: AsyncSession,
+    background_tasks: BackgroundTasks,
+) -> ChatResponse:
+    """Run one /chat turn: load context, run the tool loop, persist, respond."""
     db_session: Optional[ChatSession] = None
     history_llm: List[Dict[str, str]] = []
 
     if req.session_id:
-        db_session = await _load_user_session(
-            session, req.session_id, user, with_messages=True
-        )
+        db_session = await _load_user_session(session, req.session_id, user)
         if db_session:
-            history_llm = _to_llm_messages(db_session.messages)
+            history_llm = await _load_history(session, db_session.session_id)
+    new_messages = _new_turn_messages(history_llm, req.messages)
 
     if not db_session:
-        db_session = ChatSession(wiki_id=user.wiki_id, owner_user_id=user.user_id)
-        session.add(db_session)
-        await session.flush()
+        db_session = _new_chat_session(session, user)
 
-    full_context = history_llm + _to_llm_messages(req.messages)
+    # Built once; the tool loop appends to this same list in place.
+    full_context = history_llm
+    full_context.extend(_to_llm_messages(new_messages))
 
-    base_prompt = EDITOR_SYSTEM_PROMPT if req.context == "editor" else CHAT_SYSTEM_PROMPT
+    # Served from the in-process cache without a query on a hit. A miss runs on
+    # this request's session: a second pooled connection taken while this one
+    # is held can exhaust the pool under concurrent chats.
     schema_context = await _get_schema_context(
         vector_store, user.wiki_id, allowed_namespaces=user.allowed_namespaces
     )
-    system_prompt = base_prompt + schema_context
+    system_prompt = _compose_system_prompt(req.context, schema_context)
 
     final_answer, used_tools_log, total_prompt_tokens, total_completion_tokens = (
         await _run_tool_loop(
@@ -287,45 +610,38 @@ async def chat(
             vector_store=vector_store,
             embedder=embedder,
             system_prompt=system_prompt,
-            initial_messages=full_context,
+            messages=full_context,
+            prompt_cache_key=_prompt_cache_key(user.wiki_id, req.context),
         )
     )
 
-    await rate_limiter.record_usage(
-        wiki_id=user.wiki_id,
-        user_id=user.user_id,
-        prompt_tokens=total_prompt_tokens,
-        completion_tokens=total_completion_tokens,
-    )
-
-    for msg in req.messages:
-        session.add(
-            ChatMessage(
-                session_id=db_session.session_id,
-                sender=msg.role,
-                content=msg.content,
-            )
-        )
-
-    session.add(
-        ChatMessage(
-            session_id=db_session.session_id,
-            sender="assistant",
-            content=final_answer,
-            metadata_={
-                "tools_used": [t["name"] for t in used_tools_log] if used_tools_log else None,
-                "tokens": {
-                    "prompt": total_prompt_tokens,
-                    "completion": total_completion_tokens,
-                    "total": total_prompt_tokens + total_completion_tokens,
-                },
+    _persist_turn(
+        session,
+        db_session,
+        new_messages,
+        final_answer,
+        {
+            "tools_used": [t["name"] for t in used_tools_log] if used_tools_log else None,
+            "tokens": {
+                "prompt": total_prompt_tokens,
+                "completion": total_completion_tokens,
+                "total": total_prompt_tokens + total_completion_tokens,
             },
-        )
+        },
+    )
+    # Commit now rather than when the session dependency closes, which only
+    # happens after background tasks: the turn is durable before the response
+    # is sent, and this connection is back in the pool before the usage task
+    # below checks out its own.
+    await session.commit()
+
+    # The usage upsert runs after the response is sent.
+    background_tasks.add_task(
+        _record_usage_after_response,
+        user,
+        total_prompt_tokens,
+        total_completion_tokens,
     )
-
-    if not db_session.title and req.messages:
-        first_msg = req.messages[0].content
-        db_session.title = first_msg[:100] + ("..." if len(first_msg) > 100 else "")
 
     return ChatResponse(
         messages=req.messages + [ChatMessageModel(role="assistant", content=final_answer)],
@@ -334,6 +650,91 @@ async def chat(
     )
 
 
+async def _record_usage_after_response(
+    user: UserContext,
+    prompt_tokens: int,
+    completion_tokens: int,
+) -> None:
+    """Record a turn's token usage from a background task.
+
+    Runs on its own session and commits it, so the upsert neither depends on
+    when the request's session dependency closes nor can discard the turn's
+    messages if it fails.
+    """
+    try:
+        async with AsyncSessionLocal() as usage_session:
+            rate_limiter = RateLimiter(usage_session)
+            usage_status = await rate_limiter.record_usage(
+                wiki_id=user.wiki_id,
+                user_id=user.user_id,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+            )
+            await usage_session.commit()
+        rate_limiter.remember_usage(user.wiki_id, user.user_id, usage_status)
+    except Exception:
+        logger.exception("Failed to record token usage for %s", user.username)
+
+
+def _inflight_chat_key(user: UserContext, req: ChatRequest) -> bytes:
+    """Identify a session-less chat request for single-flight coalescing.
+
+    Includes the user, not just the wiki: tool results are filtered by the
+    caller's permissions, so answers must never be shared across users.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{user.wiki_id}\0{user.user_id}\0".encode("utf-8"))
+    digest.update(req.model_dump_json().encode("utf-8"))
+    return digest.digest()
+
+
+async def _single_flight_chat(
+    key: bytes,
+    run: Callable[[], Awaitable[ChatResponse]],
+) -> ChatResponse:
+    """Run ``run`` unless an identical request is in flight; then share its result."""
+    inflight = _inflight_chats.get(key)
+    if inflight is not None:
+        return await asyncio.shield(inflight)
+
+    future: asyncio.Future[ChatResponse] = asyncio.get_running_loop().create_future()
+    _inflight_chats[key] = future
+    try:
+        response = await run()
+    except asyncio.CancelledError:
+        # The followers were not cancelled themselves; fail them with a
+        # retryable error rather than propagating this request's cancellation.
+        future.set_exception(
+            HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="An identical request in progress was cancelled; please retry.",
+            )
+        )
+        future.exception()
+        raise
+    except Exception as exc:
+        future.set_exception(exc)
+        future.exception()  # Mark retrieved when nobody else was waiting.
+        raise
+    finally:
+        del _inflight_chats[key]
+    future.set_result(response)
+    return response
+
+
+def _token_budget_exhausted(prompt_tokens: int, completion_tokens: int) -> bool:
+    """Return True once a turn has spent its tool-loop token budget."""
+    budget = settings.tool_loop_token_budget
+    if prompt_tokens + completion_tokens < budget:
+        return False
+    logger.info(
+        "Tool loop used %d tokens (budget %d); requesting a final answer",
+        prompt_tokens + completion_tokens,
+        budget,
+    )
+    return True
+
+
 async def _run_tool_loop(
     *,
     llm: LLMClient,
@@ -341,19 +742,29 @@ async def _run_tool_loop(
     vector_store: VectorStore,
     embedder: Embedder,
     system_prompt: str,
-    initial_messages: List[Dict[str, Any]],
+    messages: List[Dict[str, Any]],
+    prompt_cache_key: Optional[str] = None,
 ) -> tuple[str, List[Dict[str, Any]], int, int]:
-    """Run the LLM tool loop and return (final_answer, tool_log, prompt_tokens, completion_tokens)."""
+    """Run the LLM tool loop and return (final_answer, tool_log, prompt_tokens, completion_tokens).
+
+    ``messages`` is extended in place with the assistant and tool turns.
+    """
     max_loops = settings.max_tool_loops
-    loop_messages: List[Dict[str, Any]] = list(initial_messages)
+    loop_messages = messages
     used_tools_log: List[Dict[str, Any]] = []
     prompt_tokens = 0
     completion_tokens = 0
     final_answer: Optional[str] = None
+    tool_memo = _ToolCallMemo()
 
     for loop_count in range(max_loops):
         try:
-            chat_result = await llm.chat(system_prompt, loop_messages, tools=TOOL_DEFINITIONS)
+            chat_result = await llm.chat(
+                system_prompt,
+                loop_messages,
+                tools=TOOL_DEFINITIONS,
+                prompt_cache_key=prompt_cache_key,
+            )
         except Exception as exc:
             logger.exception("LLM call failed at iteration %d", loop_count)
             raise HTTPException(
@@ -371,48 +782,50 @@ async def _run_tool_loop(
             final_answer = response_msg.get("content") or ""
             break
 
-        for tc in tool_calls:
+        # Tool calls within one turn are independent, so run them concurrently.
+        # They share the request's DB session, which must only be used by one
+        # query at a time; the serializing proxy overlaps their network I/O
+        # (MediaWiki, embeddings) while keeping DB access one-at-a-time.
+        tool_store = _SerializedVectorStore(vector_store) if len(tool_calls) > 1 else vector_store
+
+        async def run_call(tc: Dict[str, Any]) -> Any:
             func_name = tc["function"]["name"]
-            func_args_str = tc["function"]["arguments"]
-            call_id = tc["id"]
+            parsed_args, error_output = _parse_tool_args(func_name, tc["function"]["arguments"])
+            if error_output is not None:
+                return error_output
+            tool_output, _ok = await tool_memo.run(
+                func_name, parsed_args, user, tool_store, embedder
+            )
+            return tool_output
 
-            tool_log_entry: Dict[str, Any] = {"name": func_name, "args": func_args_str}
-            used_tools_log.append(tool_log_entry)
+        outputs = await asyncio.gather(*(run_call(tc) for tc in tool_calls))
 
-            try:
-                parsed_args = json.loads(func_args_str)
-            except json.JSONDecodeError:
-                logger.warning("Tool %s sent invalid JSON args: %r", func_name, func_args_str)
-                tool_output: Any = {"error": "Invalid JSON arguments for tool call."}
-                tool_log_entry["result"] = tool_output
-                _append_tool_result(loop_messages, call_id, tool_output)
-                continue
-
-            if not isinstance(parsed_args, dict):
-                tool_output = {"error": "Tool arguments must be a JSON object."}
-                tool_log_entry["result"] = tool_output
-                _append_tool_result(loop_messages, call_id, tool_output)
-                continue
+        for tc, tool_output in zip(tool_calls, outputs):
+            used_tools_log.append(
+                {
+                    "name": tc["function"]["name"],
+                    "args": tc["function"]["arguments"],
+                    "result": tool_output,
+                }
+            )
+            _append_tool_result(loop_messages, tc["id"], tool_output)
 
-            try:
-                tool_output = await dispatch_tool_call(
-                    func_name,
-                    parsed_args,
-                    user,
-                    vector_store=vector_store,
-                    embedder=embedder,
-                )
-            except Exception as exc:
-                logger.exception("Tool %s execution failed", func_name)
-                tool_output = {"error": f"Tool execution failed: {type(exc).__name__}"}
-
-            tool_log_entry["result"] = tool_output
-            _append_tool_result(loop_messages, call_id, tool_output)
-    else:
-        # Loop exhausted without a tool-free assistant turn — force one final LLM call
-        # without tools so we get a user-facing answer.
+        if _token_budget_exhausted(prompt_tokens, completion_tokens):
+            break
+
+    if final_answer is None:
+        # Loop exhausted (iterations or token budget) without a tool-free assistant
+        # turn — force one final LLM call with tool use disabled so we get a
+        # user-facing answer. The definitions are still sent so the request
+        # shares the cached prompt prefix.
         try:
-            chat_result = await llm.chat(system_prompt, loop_messages, tools=None)
+            chat_result = await llm.chat(
+                system_prompt,
+                loop_messages,
+                tools=TOOL_DEFINITIONS,
+                prompt_cache_key=prompt_cache_key,
+                tool_choice="none",
+            )
             prompt_tokens += chat_result.usage.prompt_tokens
             completion_tokens += chat_result.usage.completion_tokens
             final_answer = chat_result.message.get("content") or ""
@@ -424,7 +837,7 @@ async def _run_tool_loop(
                 "Please try again or rephrase your question."
             )
 
-    return final_answer or "", used_tools_log, prompt_tokens, completion_tokens
+    return final_answer or _EMPTY_ANSWER_FALLBACK, used_tools_log, prompt_tokens, completion_tokens
 
 
 # ---------------------------------------------------------------------
@@ -438,13 +851,13 @@ _TOOL_PREVIEW_MAX_BYTES = 4096
 
 def _sse(event_type: str, payload: Dict[str, Any]) -> bytes:
     """Encode a payload as an SSE frame: ``event: <type>\\ndata: <json>\\n\\n``."""
-    body = json.dumps(payload, default=str)
-    return f"event: {event_type}\ndata: {body}\n\n".encode("utf-8")
+    body = orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return b"event: " + event_type.encode("utf-8") + b"\ndata: " + body + b"\n\n"
 
 
 def _truncate_for_preview(value: Any) -> Any:
     """Shrink a tool result to a UI-friendly preview, keeping JSON shape."""
-    serialized = json.dumps(value, default=str)
+    serialized = _json_dumps(value)
     if len(serialized) <= _TOOL_PREVIEW_MAX_BYTES:
         return value
     return {
@@ -453,6 +866,101 @@ def _truncate_for_preview(value: Any) -> Any:
     }
 
 
+async def _stream_llm_turn(
+    llm: LLMClient,
+    system_prompt: str,
+    messages: List[Dict[str, Any]],
+    tools: Optional[List[Dict[str, Any]]],
+    iteration: int,
+    out: Dict[str, ChatResult],
+    prompt_cache_key: Optional[str] = None,
+    tool_choice: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """Run one streamed LLM call, yielding ``assistant_delta`` SSE frames.
+
+    The assembled ``ChatResult`` is stored in ``out["result"]`` once the
+    provider finishes the turn.
+    """
+    async for item in llm.chat_stream(
+        system_prompt,
+        messages,
+        tools=tools,
+        prompt_cache_key=prompt_cache_key,
+        tool_choice=tool_choice,
+    ):
+        if isinstance(item, ChatResult):
+            out["result"] = item
+        else:
+            yield _sse("assistant_delta", {"content": item, "iteration": iteration})
+
+
+async def _stream_tool_calls(
+    tool_calls: List[Dict[str, Any]],
+    user: UserContext,
+    vector_store: VectorStore,
+    embedder: Embedder,
+    iteration: int,
+    outputs: List[Any],
+    tool_memo: _ToolCallMemo,
+) -> AsyncIterator[bytes]:
+    """Run one turn's tool calls concurrently, yielding progress SSE frames.
+
+    A ``tool_start`` frame is sent for every call up front and a
+    ``tool_result`` frame as each one finishes. Once all are done,
+    ``outputs`` holds the results in ``tool_calls`` order.
+    """
+    parsed = [
+        _parse_tool_args(tc["function"]["name"], tc["function"]["arguments"])
+        for tc in tool_calls
+    ]
+    for tc, (parsed_args, _error) in zip(tool_calls, parsed):
+        yield _sse(
+            "tool_start",
+            {
+                "call_id": tc["id"],
+                "name": tc["function"]["name"],
+                "args": parsed_args or {},
+                "iteration": iteration,
+            },
+        )
+
+    # Same DB-session constraint as in _run_tool_loop.
+    tool_store = _SerializedVectorStore(vector_store) if len(tool_calls) > 1 else vector_store
+
+    async def run_call(index: int) -> Tuple[int, Any, bool, int]:
+        parsed_args, error_output = parsed[index]
+        if error_output is not None:
+            return index, error_output, False, 0
+        started = time.monotonic()
+        tool_output, ok = await tool_memo.run(
+            tool_calls[index]["function"]["name"], parsed_args, user, tool_store, embedder
+        )
+        return index, tool_output, ok, int((time.monotonic() - started) * 1000)
+
+    tasks = [asyncio.create_task(run_call(i)) for i in range(len(tool_calls))]
+    results: List[Any] = [None] * len(tool_calls)
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, tool_output, ok, elapsed_ms = await next_done
+            results[index] = tool_output
+            yield _sse(
+                "tool_result",
+                {
+                    "call_id": tool_calls[index]["id"],
+                    "name": tool_calls[index]["function"]["name"],
+                    "ok": ok,
+                    "result_preview": _truncate_for_preview(tool_output),
+                    "elapsed_ms": elapsed_ms,
+                },
+            )
+    finally:
+        # Client went away mid-turn: don't leave tools running.
+        for task in tasks:
+            task.cancel()
+
+    outputs.extend(results)
+
+
 @router.post(
     "/stream",
     summary="Streaming chat with incremental tool-step events (SSE)",
@@ -472,6 +980,8 @@ async def chat_stream(
     Event schema (each frame is ``event: <type>\\ndata: <json>\\n\\n``):
 
     - ``session`` — first event; payload ``{"session_id", "created"}``.
+    - ``assistant_delta`` — payload ``{"content", "iteration"}``; incremental
+      assistant text as the model generates it.
     - ``tool_start`` — payload ``{"call_id", "name", "args", "iteration"}``.
     - ``tool_result`` — payload ``{"call_id", "name", "ok", "result_preview", "elapsed_ms"}``.
     - ``assistant_message`` — payload ``{"content", "iteration", "is_final"}``
@@ -502,34 +1012,36 @@ async def chat_stream(
     created = False
 
     if req.session_id:
-        db_session = await _load_user_session(
-            session, req.session_id, user, with_messages=True
-        )
+        db_session = await _load_user_session(session, req.session_id, user)
         if db_session:
-            history_llm = _to_llm_messages(db_session.messages)
+            history_llm = await _load_history(session, db_session.session_id)
+    new_messages = _new_turn_messages(history_llm, req.messages)
 
     if not db_session:
-        db_session = ChatSession(wiki_id=user.wiki_id, owner_user_id=user.user_id)
-        session.add(db_session)
-        await session.flush()
+        db_session = _new_chat_session(session, user)
         created = True
 
-    full_context = history_llm + _to_llm_messages(req.messages)
-    base_prompt = EDITOR_SYSTEM_PROMPT if req.context == "editor" else CHAT_SYSTEM_PROMPT
+    # Built once; the tool loop appends to this same list in place.
+    full_context = history_llm
+    full_context.extend(_to_llm_messages(new_messages))
     schema_context = await _get_schema_context(
         vector_store, user.wiki_id, allowed_namespaces=user.allowed_namespaces
     )
-    system_prompt = base_prompt + schema_context
+    system_prompt = _compose_system_prompt(req.context, schema_context)
+    prompt_cache_key = _prompt_cache_key(user.wiki_id, req.context)
 
     session_id_str = str(db_session.session_id)
 
     async def event_generator():
-        loop_messages: List[Dict[str, Any]] = list(full_context)
+        loop_messages = full_context
         used_tools_log: List[Dict[str, Any]] = []
         prompt_tokens = 0
         completion_tokens = 0
         final_answer: str = ""
+        tool_memo = _ToolCallMemo()
         max_loops = settings.max_tool_loops
+        answered = False
+        wrap_up_iteration = 0
 
         yield _sse("session", {"session_id": session_id_str, "created": created})
 
@@ -539,10 +1051,19 @@ async def chat_stream(
                     logger.info("Client disconnected before LLM iteration %d", loop_count)
                     return
 
+                turn: Dict[str, ChatResult] = {}
                 try:
-                    chat_result = await llm.chat(
-                        system_prompt, loop_messages, tools=TOOL_DEFINITIONS
-                    )
+                    async for frame in _stream_llm_turn(
+                        llm,
+                        system_prompt,
+                        loop_messages,
+                        TOOL_DEFINITIONS,
+                        loop_count,
+                        turn,
+                        prompt_cache_key,
+                    ):
+                        yield frame
+                    chat_result = turn["result"]
                 except Exception:
                     logger.exception("LLM call failed at iteration %d", loop_count)
                     yield _sse(
@@ -572,99 +1093,50 @@ async def chat_stream(
 
                 if is_final:
                     final_answer = content
+                    answered = True
                     break
 
-                for tc in tool_calls:
-                    if await request.is_disconnected():
-                        logger.info("Client disconnected mid-tool")
-                        return
-
-                    func_name = tc["function"]["name"]
-                    func_args_str = tc["function"]["arguments"]
-                    call_id = tc["id"]
-
-                    tool_log_entry: Dict[str, Any] = {
-                        "name": func_name,
-                        "args": func_args_str,
-                    }
-                    used_tools_log.append(tool_log_entry)
-
-                    try:
-                        parsed_args = json.loads(func_args_str)
-                    except json.JSONDecodeError:
-                        parsed_args = None
-
-                    if not isinstance(parsed_args, dict):
-                        msg = (
-                            "Invalid JSON arguments for tool call."
-                            if parsed_args is None
-                            else "Tool arguments must be a JSON object."
-                        )
-                        tool_output: Any = {"error": msg}
-                        tool_log_entry["result"] = tool_output
-                        _append_tool_result(loop_messages, call_id, tool_output)
-                        yield _sse(
-                            "tool_start",
-                            {
-                                "call_id": call_id,
-                                "name": func_name,
-                                "args": {},
-                                "iteration": loop_count,
-                            },
-                        )
-                        yield _sse(
-                            "tool_result",
-                            {
-                                "call_id": call_id,
-                                "name": func_name,
-                                "ok": False,
-                                "result_preview": tool_output,
-                                "elapsed_ms": 0,
-                            },
-                        )
-                        continue
+                if await request.is_disconnected():
+                    logger.info("Client disconnected before tool calls")
+                    return
 
-                    yield _sse(
-                        "tool_start",
-                        {
-                            "call_id": call_id,
-                            "name": func_name,
-                            "args": parsed_args,
-                            "iteration": loop_count,
-                        },
-                    )
-                    started = time.monotonic()
-                    ok = True
-                    try:
-                        tool_output = await dispatch_tool_call(
-                            func_name,
-                            parsed_args,
-                            user,
-                            vector_store=vector_store,
-                            embedder=embedder,
-                        )
-                    except Exception as exc:
-                        logger.exception("Tool %s execution failed", func_name)
-                        tool_output = {"error": f"Tool execution failed: {type(exc).__name__}"}
-                        ok = False
-
-                    elapsed_ms = int((time.monotonic() - started) * 1000)
-                    tool_log_entry["result"] = tool_output
-                    _append_tool_result(loop_messages, call_id, tool_output)
-                    yield _sse(
-                        "tool_result",
+                outputs: List[Any] = []
+                async for frame in _stream_tool_calls(
+                    tool_calls, user, vector_store, embedder, loop_count, outputs, tool_memo
+                ):
+                    yield frame
+
+                for tc, tool_output in zip(tool_calls, outputs):
+                    used_tools_log.append(
                         {
-                            "call_id": call_id,
-                            "name": func_name,
-                            "ok": ok,
-                            "result_preview": _truncate_for_preview(tool_output),
-                            "elapsed_ms": elapsed_ms,
-                        },
+                            "name": tc["function"]["name"],
+                            "args": tc["function"]["arguments"],
+                            "result": tool_output,
+                        }
                     )
-            else:
-                # Loop exhausted — force a tool-free wrap-up call.
+                    _append_tool_result(loop_messages, tc["id"], tool_output)
+
+                wrap_up_iteration = loop_count + 1
+                if _token_budget_exhausted(prompt_tokens, completion_tokens):
+                    break
+
+            if not answered:
+                # Loop exhausted (iterations or token budget) — force a wrap-up
+                # call with tool use disabled.
                 try:
-                    chat_result = await llm.chat(system_prompt, loop_messages, tools=None)
+                    turn = {}
+                    async for frame in _stream_llm_turn(
+                        llm,
+                        system_prompt,
+                        loop_messages,
+                        TOOL_DEFINITIONS,
+                        wrap_up_iteration,
+                        turn,
+                        prompt_cache_key,
+                        tool_choice="none",
+                    ):
+                        yield frame
+                    chat_result = turn["result"]
                     prompt_tokens += chat_result.usage.prompt_tokens
                     completion_tokens += chat_result.usage.completion_tokens
                     final_answer = chat_result.message.get("content") or ""
@@ -672,7 +1144,7 @@ async def chat_stream(
                         "assistant_message",
                         {
                             "content": final_answer,
-                            "iteration": max_loops,
+                            "iteration": wrap_up_iteration,
                             "is_final": True,
                         },
                     )
@@ -687,7 +1159,7 @@ async def chat_stream(
                         "assistant_message",
                         {
                             "content": final_answer,
-                            "iteration": max_loops,
+                            "iteration": wrap_up_iteration,
                             "is_final": True,
                         },
                     )
@@ -700,33 +1172,21 @@ async def chat_stream(
                     prompt_tokens=prompt_tokens,
                     completion_tokens=completion_tokens,
                 )
-                for m in req.messages:
-                    session.add(
-                        ChatMessage(
-                            session_id=db_session.session_id,
-                            sender=m.role,
-                            content=m.content,
-                        )
-                    )
-                session.add(
-                    ChatMessage(
-                        session_id=db_session.session_id,
-                        sender="assistant",
-                        content=final_answer,
-                        metadata_={
-                            "tools_used": [t["name"] for t in used_tools_log] or None,
-                            "tokens": {
-                                "prompt": prompt_tokens,
-                                "completion": completion_tokens,
-                                "total": prompt_tokens + completion_tokens,
-                            },
-                            "streamed": True,
+                _persist_turn(
+                    session,
+                    db_session,
+                    new_messages,
+                    final_answer,
+                    {
+                        "tools_used": [t["name"] for t in used_tools_log] or None,
+                        "tokens": {
+                            "prompt": prompt_tokens,
+                            "completion": completion_tokens,
+                            "total": prompt_tokens + completion_tokens,
                         },
-                    )
+                        "streamed": True,
+                    },
                 )
-                if not db_session.title and req.messages:
-                    first = req.messages[0].content
-                    db_session.title = first[:100] + ("..." if len(first) > 100 else "")
             except Exception:
                 logger.exception("Failed to persist streamed chat session")
 
@@ -7,12 +7,15 @@ This module defines reusable dependencies for routes, including:
 - Vector store (PostgreSQL + pgvector)
 - Embedder singleton
 - Rate limiter
+- Single-pass JSON request bodies
 """
 
 from functools import lru_cache
-from typing import Annotated, AsyncGenerator
+from typing import Annotated, Any, AsyncGenerator, Awaitable, Callable, Dict, Type, TypeVar
 
-from fastapi import Depends
+from fastapi import Depends, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..llm.client import LLMClient
@@ -20,6 +23,8 @@ from ..db import get_async_session, VectorStore
 from ..db.rate_limiter import RateLimiter
 from ..embeddings.embedder import Embedder
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
 
 @lru_cache
 def get_llm_client() -> LLMClient:
@@ -60,3 +65,37 @@ def get_embedder() -> Embedder:
     """Return a singleton embedder instance."""
     return Embedder()
 
+
+def json_body(model: Type[ModelT]) -> Callable[[Request], Awaitable[ModelT]]:
+    """
+    Build a dependency that validates the raw request body as ``model``.
+
+    FastAPI decodes JSON bodies with ``json.loads`` and then validates the
+    resulting dict; ``model_validate_json`` parses and validates the bytes
+    in one pass, which matters for large bodies such as full page content.
+    Errors are raised as ``RequestValidationError`` so clients still get
+    the usual 422 response. Pair with :func:`json_body_openapi` on the route
+    to keep the request schema documented.
+    """
+
+    async def dependency(request: Request) -> ModelT:
+        body = await request.body()
+        try:
+            return model.model_validate_json(body)
+        except ValidationError as exc:
+            errors = exc.errors(include_url=False)
+            for error in errors:
+                error["loc"] = ("body", *error["loc"])
+            raise RequestValidationError(errors, body=body) from exc
+
+    return dependency
+
+
+def json_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Return ``openapi_extra`` documenting ``model`` as the JSON request body."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
@@ -13,8 +13,9 @@ Uses PostgreSQL + pgvector for storage and similarity search.
 """
 
 from fastapi import APIRouter, Depends
-from typing import Annotated
+from typing import Annotated, Dict, Tuple
 from datetime import datetime
+import time
 
 
 from .models import (
@@ -23,7 +24,7 @@ from .models import (
     EmbeddingStatsResponse,
     OperationResult,
 )
-from .dependencies import get_vector_store
+from .dependencies import get_vector_store, json_body, json_body_openapi
 from ..auth.security import require_scopes
 from ..auth.models import UserContext
 from ..db import VectorStore
@@ -33,6 +34,14 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/embeddings", tags=["embeddings"])
 
+# Stats aggregate over every embedding row of a wiki and are polled by the
+# extension's dashboard, which does not need sub-second freshness. Entries
+# are keyed on wiki_id and dropped when a page is deleted through this API;
+# pages written by the embedding worker show up within the TTL.
+_STATS_CACHE_TTL_SECONDS = 5.0
+_STATS_CACHE_MAX_ENTRIES = 256
+_stats_cache: Dict[str, Tuple[float, EmbeddingStatsResponse]] = {}
+
 
 # ---------------------------------------------------------------------
 # Routes
@@ -49,19 +58,38 @@ async def get_embedding_stats(
 ) -> EmbeddingStatsResponse:
     """
     Return current embedding index statistics for the user's wiki.
+    Cached in-process for ``_STATS_CACHE_TTL_SECONDS``.
     """
+    cached = _stats_cache.get(user.wiki_id)
+    if cached and time.monotonic() - cached[0] < _STATS_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    # get_stats builds every field from typed query results; validating the
+    # (potentially very large) page maps again would only copy them.
     stats = await vector_store.get_stats(user.wiki_id)
-    return EmbeddingStatsResponse(**stats)
+    response = EmbeddingStatsResponse.model_construct(**stats)
+
+    _stats_cache.pop(user.wiki_id, None)
+    if len(_stats_cache) >= _STATS_CACHE_MAX_ENTRIES:
+        # Evict the oldest entry; dicts preserve insertion order.
+        _stats_cache.pop(next(iter(_stats_cache)), None)
+    _stats_cache[user.wiki_id] = (time.monotonic(), response)
+    return response
 
 
 @router.post(
     "/page",
     summary="Create or update a page embedding",
     response_model=OperationResult,
+    openapi_extra=json_body_openapi(EmbeddingUpdatePageRequest),
 )
 async def update_page_embedding(
-    req: EmbeddingUpdatePageRequest,
+    # Authenticate before reading the body, so unauthenticated callers get a
+    # 401 rather than a 422 describing the request schema.
     user: Annotated[UserContext, Depends(require_scopes("embeddings"))],
+    req: Annotated[
+        EmbeddingUpdatePageRequest, Depends(json_body(EmbeddingUpdatePageRequest))
+    ],
 ) -> OperationResult:
     """
     Enqueue a job to create or update embeddings for a wiki page.
@@ -95,8 +123,9 @@ async def update_page_embedding(
         # Enqueue
         qsize = await embedding_queue.enqueue(job)
 
-        # Return immediate success
-        return OperationResult(
+        # Return immediate success. Server-built and known-valid, so skip
+        # re-validating it on every page save.
+        return OperationResult.model_construct(
             status="queued",
             count=0,
             details={"queue_size": qsize}
@@ -121,8 +150,10 @@ async def delete_page_embedding(
     """
     count = await vector_store.delete_page(user.wiki_id, req.title)
     await vector_store.commit()
+    _stats_cache.pop(user.wiki_id, None)
 
-    return OperationResult(
+    return OperationResult.model_construct(
         status="deleted",
-        count=count
+        count=count,
+        details=None,
     )
@@ -15,13 +15,15 @@ Design Goals
 
 from __future__ import annotations
 
-from typing import List, Optional, Dict, Any, Literal
+from typing import Annotated, List, Optional, Dict, Any, Literal
 from pydantic import BaseModel, Field, ConfigDict
 
 
 # ---------------------------------------------------------------------
 # Tool Output Contracts (Authoritative)
 # ---------------------------------------------------------------------
+# Output models are only ever built by the server, so they carry plain
+# types without value constraints. Request models keep theirs.
 
 class ToolSearchResult(BaseModel):
     """
@@ -31,9 +33,9 @@ class ToolSearchResult(BaseModel):
         - LLM tool responses
         - API search routes
     """
-    title: str = Field(..., min_length=1)
+    title: str
     section_id: Optional[str] = None
-    score: float = Field(..., ge=0.0)
+    score: float
 
     model_config = ConfigDict(extra="forbid")
 
@@ -44,7 +46,7 @@ class OperationResult(BaseModel):
     Used for create/update/delete-style endpoints.
     """
     status: Literal["updated", "deleted", "created", "ok", "queued"]
-    count: Optional[int] = Field(default=None, ge=0)
+    count: Optional[int] = None
     details: Optional[Dict[str, Any]] = None
 
     model_config = ConfigDict(extra="forbid")
@@ -102,13 +104,25 @@ class SearchRequest(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+class SearchBatchRequest(BaseModel):
+    """
+    Several search queries answered in one request.
+    """
+    queries: List[Annotated[str, Field(min_length=1, max_length=10_000)]] = Field(
+        ..., min_length=1, max_length=20
+    )
+    k: int = Field(default=5, ge=1, le=100)
+
+    model_config = ConfigDict(extra="forbid")
+
+
 class SearchResult(BaseModel):
     """
     Individual search match.
     """
-    title: str = Field(..., min_length=1)
+    title: str
     section_id: Optional[str] = None
-    score: float = Field(..., ge=0.0)
+    score: float
 
     model_config = ConfigDict(extra="forbid")
 
@@ -139,12 +153,17 @@ class SMWQueryResponse(BaseModel):
 # Embedding Models
 # ---------------------------------------------------------------------
 
+# MediaWiki's default $wgMaxArticleSize is 2048 KiB, and a page never has
+# more characters than bytes.
+MAX_PAGE_CONTENT_CHARS = 2048 * 1024
+
+
 class EmbeddingUpdatePageRequest(BaseModel):
     """
     Request to (re)index a wiki page for embedding search.
     """
     title: str = Field(..., min_length=1)
-    content: str = Field(..., min_length=1)
+    content: str = Field(..., min_length=1, max_length=MAX_PAGE_CONTENT_CHARS)
     namespace: int = Field(default=0, ge=0)
     last_modified: Optional[str] = None
     rev_id: Optional[int] = Field(
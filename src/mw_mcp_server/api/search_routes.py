@@ -8,18 +8,27 @@ direct user queries.
 """
 
 from fastapi import APIRouter, Depends, status
-from typing import List, Annotated
+from typing import Dict, List, Annotated, Tuple
+import time
 
-from .models import SearchRequest, SearchResult
+from .models import SearchBatchRequest, SearchRequest, SearchResult
 from ..auth.security import require_scopes
 from ..auth.models import UserContext
 from ..db import VectorStore
 from ..embeddings.embedder import Embedder
 from .dependencies import get_vector_store, get_embedder
-from ..tools.search_tools import vector_search
+from ..tools.search_tools import vector_search, vector_search_batch
 
 router = APIRouter(prefix="/search", tags=["search"])
 
+# Identical searches repeat while a user works through a topic. Results are
+# permission-filtered per user, so the key includes the username and the
+# user's readable namespaces; index updates show up within the TTL.
+_SEARCH_CACHE_TTL_SECONDS = 30.0
+_SEARCH_CACHE_MAX_ENTRIES = 1024
+_SearchCacheKey = Tuple[str, str, Tuple[int, ...], int, str]
+_search_cache: Dict[_SearchCacheKey, Tuple[float, List[SearchResult]]] = {}
+
 
 @router.post(
     "/",
@@ -46,11 +55,25 @@ async def search(
     user : UserContext
         Authenticated user context derived from JWT.
 
+    Repeated searches by the same user are served from an in-process cache
+    for ``_SEARCH_CACHE_TTL_SECONDS``.
+
     Returns
     -------
     List[SearchResult]
         Ranked list of matching results.
     """
+    cache_key = (
+        user.wiki_id,
+        user.username,
+        tuple(user.allowed_namespaces),
+        req.k,
+        req.query,
+    )
+    cached = _search_cache.get(cache_key)
+    if cached and time.monotonic() - cached[0] < _SEARCH_CACHE_TTL_SECONDS:
+        return cached[1]
+
     results = await vector_search(
         query=req.query,
         user=user,
@@ -59,7 +82,53 @@ async def search(
         k=req.k,
     )
 
-    return [
-        SearchResult(title=r.title, score=r.score)
+    # Results were built from typed DB rows by vector_search; skip a second
+    # validation pass per row.
+    response = [
+        SearchResult.model_construct(title=r.title, score=r.score)
         for r in results
     ]
+
+    _search_cache.pop(cache_key, None)
+    if len(_search_cache) >= _SEARCH_CACHE_MAX_ENTRIES:
+        # Evict the oldest entry; dicts preserve insertion order.
+        _search_cache.pop(next(iter(_search_cache)), None)
+    _search_cache[cache_key] = (time.monotonic(), response)
+    return response
+
+
+@router.post(
+    "/batch",
+    response_model=List[List[SearchResult]],
+    summary="Run several semantic searches at once",
+    status_code=status.HTTP_200_OK,
+)
+async def search_batch(
+    req: SearchBatchRequest,
+    user: Annotated[UserContext, Depends(require_scopes("search"))],
+    vector_store: Annotated[VectorStore, Depends(get_vector_store)],
+    embedder: Annotated[Embedder, Depends(get_embedder)],
+) -> List[List[SearchResult]]:
+    """
+    Perform several vector searches in one call.
+
+    Uncached queries are embedded in a single request, the searches share
+    one database round trip and one permission check.
+
+    Returns
+    -------
+    List[List[SearchResult]]
+        One ranked result list per query, in request order.
+    """
+    batches = await vector_search_batch(
+        queries=req.queries,
+        user=user,
+        vector_store=vector_store,
+        embedder=embedder,
+        k=req.k,
+    )
+
+    return [
+        [SearchResult.model_construct(title=r.title, score=r.score) for r in results]
+        for results in batches
+    ]
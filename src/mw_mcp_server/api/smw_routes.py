@@ -12,7 +12,8 @@ Security Notes
   enforces its own constraints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, Response, status
 from typing import Annotated, Dict, Any
 
 from .models import SMWQueryRequest, SMWQueryResponse
@@ -25,14 +26,14 @@ router = APIRouter(prefix="/smw-query", tags=["smw"])
 
 @router.post(
     "/",
-    response_model=SMWQueryResponse,
+    responses={status.HTTP_200_OK: {"model": SMWQueryResponse}},
     summary="Execute a Semantic MediaWiki ASK query",
     status_code=status.HTTP_200_OK,
 )
 async def smw_query(
     req: SMWQueryRequest,
     user: Annotated[UserContext, Depends(require_scopes("smw_query"))],
-) -> SMWQueryResponse:
+) -> Response:
     """
     Execute an SMW ASK query through the MediaWiki API.
 
@@ -45,22 +46,18 @@ async def smw_query(
 
     Returns
     -------
-    SMWQueryResponse
-        Raw SMW query results.
+    Response
+        JSON body shaped like ``SMWQueryResponse``. The raw result can be
+        large and is passed through untouched, so it is encoded directly
+        rather than wrapped in a model and re-validated.
 
-    Raises
-    ------
-    HTTPException
-        - 500 if the tool fails or returns invalid data.
+    Tool failures propagate to the global exception handler (500).
     """
-    # Global exception handler captures any tool failures
+    # tool_run_smw_ask always returns a dict; non-dict SMW output is wrapped
+    # as {"result": ...} at the tool boundary.
     result: Dict[str, Any] = await tool_run_smw_ask(req.ask, user)
 
-    # Validate that result is at least a dict-like object
-    if not isinstance(result, dict):
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Invalid SMW query result returned by backend.",
-        )
-
-    return SMWQueryResponse(raw=result)
+    return Response(
+        content=orjson.dumps({"raw": result}, default=str, option=orjson.OPT_NON_STR_KEYS),
+        media_type="application/json",
+    )
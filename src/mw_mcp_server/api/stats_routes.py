@@ -20,21 +20,32 @@ Metrics Tracked
 """
 
 import hmac
+import logging
+import time
 from datetime import date, datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Header, status
 from fastapi.responses import HTMLResponse
-from sqlalchemy import func, select
+from sqlalchemy import func, select, union
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, ConfigDict
 
 from ..config import settings
 from ..db import get_async_session
-from ..db.models import TokenUsage, ChatSession, ChatMessage, Embedding
+from ..db.models import TokenUsage, ChatSession, ChatMessage, EmbeddingPageSummary
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
+# The dashboard polls /stats/usage with a handful of (period, days)
+# combinations, while the aggregates move on a minute scale. Serve repeats
+# from memory for a minute instead of re-scanning the usage tables.
+_USAGE_CACHE_TTL_SECONDS = 60.0
+_USAGE_CACHE_MAX_ENTRIES = 64
+_usage_cache: Dict[Tuple[str, int, date], Tuple[float, "GlobalStats"]] = {}
+
 
 # ---------------------------------------------------------------------
 # Security Dependency
@@ -109,13 +120,22 @@ async def get_usage_stats(
         Aggregation period (currently effectively validates window).
     days : int
         Number of days to look back.
+
+    Results are cached in-process for ``_USAGE_CACHE_TTL_SECONDS``.
     """
-    start_date = date.today() - timedelta(days=days)
     end_date = date.today()
-    
-    # 1. Token Usage Aggregation
-    #    Group by wiki_id
-    token_query = (
+    cache_key = (period, days, end_date)
+    cached = _usage_cache.get(cache_key)
+    if cached and time.monotonic() - cached[0] < _USAGE_CACHE_TTL_SECONDS:
+        logger.debug("Usage stats cache hit for %s", cache_key)
+        return cached[1]
+
+    start_date = end_date - timedelta(days=days)
+    start_time = datetime.combine(start_date, datetime.min.time())
+
+    # One statement instead of four round trips: each metric is a CTE
+    # grouped by wiki_id, outer-joined onto the set of wikis seen in any.
+    token_cte = (
         select(
             TokenUsage.wiki_id,
             func.sum(TokenUsage.total_tokens).label("total_tokens"),
@@ -126,82 +146,90 @@ async def get_usage_stats(
         )
         .where(TokenUsage.usage_date >= start_date)
         .group_by(TokenUsage.wiki_id)
+        .cte("token_stats")
     )
-    token_result = await db.execute(token_query)
-    token_map = {
-        row.wiki_id: {
-            "total_tokens": row.total_tokens or 0,
-            "prompt_tokens": row.prompt_tokens or 0,
-            "completion_tokens": row.completion_tokens or 0,
-            "request_count": row.request_count or 0,
-            "active_users": row.active_users or 0
-        }
-        for row in token_result
-    }
 
-    # 2. Session Count
-    session_query = (
+    session_cte = (
         select(
             ChatSession.wiki_id,
-            func.count(ChatSession.session_id).label("session_count")
+            func.count(ChatSession.session_id).label("session_count"),
         )
-        .where(ChatSession.created_at >= datetime.combine(start_date, datetime.min.time()))
+        .where(ChatSession.created_at >= start_time)
         .group_by(ChatSession.wiki_id)
+        .cte("session_stats")
     )
-    session_result = await db.execute(session_query)
-    session_map = {row.wiki_id: row.session_count for row in session_result}
 
-    # 3. Message Count
-    #    Need to join session to get wiki_id
-    message_query = (
+    message_cte = (
         select(
-            ChatSession.wiki_id,
-            func.count(ChatMessage.message_id).label("message_count")
+            ChatMessage.wiki_id,
+            func.count(ChatMessage.message_id).label("message_count"),
         )
-        .join(ChatMessage.session)
-        .where(ChatMessage.created_at >= datetime.combine(start_date, datetime.min.time()))
-        .group_by(ChatSession.wiki_id)
+        .where(ChatMessage.created_at >= start_time)
+        .group_by(ChatMessage.wiki_id)
+        .cte("message_stats")
     )
-    message_result = await db.execute(message_query)
-    message_map = {row.wiki_id: row.message_count for row in message_result}
-    
-    # 4. Embedding Count (Snapshot - Current Total)
-    embedding_query = (
+
+    # Current snapshot, read from the trigger-maintained per-page summary
+    # rather than counting every embedding row.
+    embedding_cte = (
         select(
-            Embedding.wiki_id,
-            func.count(Embedding.id).label("embedding_count")
+            EmbeddingPageSummary.wiki_id,
+            func.sum(EmbeddingPageSummary.chunk_count).label("embedding_count"),
         )
-        .group_by(Embedding.wiki_id)
+        .group_by(EmbeddingPageSummary.wiki_id)
+        .cte("embedding_stats")
     )
-    embedding_result = await db.execute(embedding_query)
-    embedding_map = {row.wiki_id: row.embedding_count for row in embedding_result}
 
-    # Merge all data
-    all_wikis = set(token_map.keys()) | set(session_map.keys()) | set(message_map.keys()) | set(embedding_map.keys())
-    
-    tenant_stats = []
-    for wiki_id in sorted(all_wikis):
-        t_stats = token_map.get(wiki_id, {})
-        stats = TenantStats(
-            wiki_id=wiki_id,
-            total_tokens=t_stats.get("total_tokens", 0),
-            prompt_tokens=t_stats.get("prompt_tokens", 0),
-            completion_tokens=t_stats.get("completion_tokens", 0),
-            request_count=t_stats.get("request_count", 0),
-            active_users=t_stats.get("active_users", 0),
-            session_count=session_map.get(wiki_id, 0),
-            message_count=message_map.get(wiki_id, 0),
-            embedding_count=embedding_map.get(wiki_id, 0),
+    metric_ctes = (token_cte, session_cte, message_cte, embedding_cte)
+    wikis = union(*(select(cte.c.wiki_id) for cte in metric_ctes)).cte("wikis")
+
+    query = select(
+        wikis.c.wiki_id,
+        func.coalesce(token_cte.c.total_tokens, 0).label("total_tokens"),
+        func.coalesce(token_cte.c.prompt_tokens, 0).label("prompt_tokens"),
+        func.coalesce(token_cte.c.completion_tokens, 0).label("completion_tokens"),
+        func.coalesce(token_cte.c.request_count, 0).label("request_count"),
+        func.coalesce(token_cte.c.active_users, 0).label("active_users"),
+        func.coalesce(session_cte.c.session_count, 0).label("session_count"),
+        func.coalesce(message_cte.c.message_count, 0).label("message_count"),
+        func.coalesce(embedding_cte.c.embedding_count, 0).label("embedding_count"),
+    ).select_from(wikis)
+    for cte in metric_ctes:
+        query = query.outerjoin(cte, cte.c.wiki_id == wikis.c.wiki_id)
+    query = query.order_by(wikis.c.wiki_id)
+
+    # Every column is a COALESCEd integer aggregate, so the rows need no
+    # validation on the way into the response model.
+    result = await db.execute(query)
+    tenant_stats = [
+        TenantStats.model_construct(
+            wiki_id=row.wiki_id,
+            total_tokens=row.total_tokens,
+            prompt_tokens=row.prompt_tokens,
+            completion_tokens=row.completion_tokens,
+            request_count=row.request_count,
+            active_users=row.active_users,
+            session_count=row.session_count,
+            message_count=row.message_count,
+            embedding_count=row.embedding_count,
         )
-        tenant_stats.append(stats)
+        for row in result
+    ]
 
-    return GlobalStats(
+    response = GlobalStats(
         period=period,
         start_date=start_date,
         end_date=end_date,
         tenants=tenant_stats
     )
 
+    _usage_cache.pop(cache_key, None)
+    if len(_usage_cache) >= _USAGE_CACHE_MAX_ENTRIES:
+        # Evict the oldest entry; dicts preserve insertion order.
+        _usage_cache.pop(next(iter(_usage_cache)), None)
+    _usage_cache[cache_key] = (time.monotonic(), response)
+    return response
+
 
 # ---------------------------------------------------------------------
 # Dashboard UI
@@ -16,11 +16,21 @@ from __future__ import annotations
 
 import jwt
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from ..config import settings
 
 
+# Every outbound MediaWiki call needs a token, and the claims only differ by
+# wiki, scopes and time. Tokens are reused until half their TTL has elapsed,
+# so a cached token always has at least TTL/2 of validity left when sent.
+# Keyed on the secret and algorithm too, so a config change never serves a
+# token signed with stale settings.
+_TOKEN_CACHE_MAX_ENTRIES = 256
+_TokenCacheKey = Tuple[Optional[str], str, str, Tuple[str, ...]]
+_token_cache: Dict[_TokenCacheKey, Tuple[int, str]] = {}
+
+
 # ---------------------------------------------------------------------
 # Exceptions
 # ---------------------------------------------------------------------
@@ -75,6 +85,7 @@ def create_mcp_to_mw_jwt(scopes: List[str], wiki_id: Optional[str] = None) -> st
     -------
     str
         Encoded JWT suitable for use in Authorization: Bearer <token> header.
+        Repeated calls reuse the same token until half its TTL has passed.
 
     Raises
     ------
@@ -83,18 +94,6 @@ def create_mcp_to_mw_jwt(scopes: List[str], wiki_id: Optional[str] = None) -> st
     """
     _validate_jwt_config()
 
-    now = _get_current_timestamp()
-
-    # Construct payload with required claims.
-    payload: Dict[str, Any] = {
-        "iss": "mw-mcp-server",
-        "aud": "MWAssistant",           # Must match the MW extension's expected audience
-        "iat": now,                    # Issued at
-        "exp": now + settings.jwt_ttl_seconds, # Short TTL for safety
-        "scope": scopes,               # Scope-based capabilities
-        # NOTE: Additional claims like jti could be added for replay protection
-    }
-    
     # Select signing secret
     secret = None
     if wiki_id and wiki_id in settings.wiki_creds:
@@ -108,6 +107,22 @@ def create_mcp_to_mw_jwt(scopes: List[str], wiki_id: Optional[str] = None) -> st
     # Signing key and algorithm
     algo = settings.jwt_algo
 
+    now = _get_current_timestamp()
+    cache_key = (wiki_id, secret, algo, tuple(scopes))
+    cached = _token_cache.get(cache_key)
+    if cached and now < cached[0]:
+        return cached[1]
+
+    # Construct payload with required claims.
+    payload: Dict[str, Any] = {
+        "iss": "mw-mcp-server",
+        "aud": "MWAssistant",           # Must match the MW extension's expected audience
+        "iat": now,                    # Issued at
+        "exp": now + settings.jwt_ttl_seconds, # Short TTL for safety
+        "scope": scopes,               # Scope-based capabilities
+        # NOTE: Additional claims like jti could be added for replay protection
+    }
+
     try:
         token = jwt.encode(payload, secret, algorithm=algo)
     except Exception as exc:
@@ -115,4 +130,9 @@ def create_mcp_to_mw_jwt(scopes: List[str], wiki_id: Optional[str] = None) -> st
             f"Failed to generate JWT: {type(exc).__name__}: {str(exc)}"
         ) from exc
 
+    _token_cache.pop(cache_key, None)
+    if len(_token_cache) >= _TOKEN_CACHE_MAX_ENTRIES:
+        # Evict the oldest entry; dicts preserve insertion order.
+        _token_cache.pop(next(iter(_token_cache)), None)
+    _token_cache[cache_key] = (now + settings.jwt_ttl_seconds // 2, token)
     return token
@@ -16,8 +16,11 @@ Security Model
 
 from __future__ import annotations
 
+import hashlib
+import time
 import jwt
-from typing import Callable
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -33,6 +36,43 @@ from .models import UserContext
 security = HTTPBearer(auto_error=True)
 
 
+# ---------------------------------------------------------------------
+# Verified-token cache
+# ---------------------------------------------------------------------
+
+# The MW extension reuses a token for its whole lifetime, so every request
+# after the first would otherwise repeat the decode, HMAC check and claim
+# validation. Successful verifications are cached by a digest of the raw
+# token (the token itself is never stored) until the token's own `exp`,
+# capped at _VERIFIED_TOKEN_MAX_TTL_SECONDS. Failures are never cached.
+_VERIFIED_TOKEN_MAX_TTL_SECONDS = 300
+_VERIFIED_TOKEN_CACHE_MAX_ENTRIES = 10_000
+_verified_token_cache: Dict[bytes, Tuple[float, UserContext]] = {}
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+def _get_cached_user(cache_key: bytes) -> UserContext | None:
+    cached = _verified_token_cache.get(cache_key)
+    if cached is None:
+        return None
+    expires_at, user = cached
+    if time.time() >= expires_at:
+        _verified_token_cache.pop(cache_key, None)
+        return None
+    return user
+
+
+def _cache_verified_user(cache_key: bytes, exp: float, user: UserContext) -> None:
+    expires_at = min(float(exp), time.time() + _VERIFIED_TOKEN_MAX_TTL_SECONDS)
+    if len(_verified_token_cache) >= _VERIFIED_TOKEN_CACHE_MAX_ENTRIES:
+        # Evict the oldest entry; dicts preserve insertion order.
+        _verified_token_cache.pop(next(iter(_verified_token_cache)), None)
+    _verified_token_cache[cache_key] = (expires_at, user)
+
+
 # ---------------------------------------------------------------------
 # Exceptions
 # ---------------------------------------------------------------------
@@ -120,6 +160,9 @@ def verify_mw_to_mcp_jwt(
       - roles: list of MW user groups
       - scope: list of granted operations
 
+    Successful verifications are cached until the token expires (see
+    ``_verified_token_cache``).
+
     Returns
     -------
     UserContext
@@ -129,6 +172,11 @@ def verify_mw_to_mcp_jwt(
     HTTPException(401) for invalid or expired tokens.
     """
     token = creds.credentials
+    cache_key = _token_cache_key(token)
+
+    cached_user = _get_cached_user(cache_key)
+    if cached_user is not None:
+        return cached_user
 
     # -------------------------------------------------------------
     # Decode Token
@@ -211,7 +259,7 @@ def verify_mw_to_mcp_jwt(
 
     api_url = payload.get("api_url")
 
-    return UserContext(
+    user = UserContext(
         username=username,
         user_id=user_id,
         wiki_id=wiki_id,
@@ -222,15 +270,23 @@ def verify_mw_to_mcp_jwt(
         api_url=api_url,
     )
 
+    _cache_verified_user(cache_key, payload["exp"], user)
+    return user
+
 
 # ---------------------------------------------------------------------
 # Scope enforcement helper
 # ---------------------------------------------------------------------
 
+@lru_cache(maxsize=None)
 def require_scopes(*required_scopes: str) -> Callable:
     """
     Create a FastAPI dependency that enforces scope-based access control.
 
+    Cached per scope tuple, so every route requiring the same scopes shares
+    one dependency callable and FastAPI's per-request dependency cache can
+    resolve it once even when several sub-dependencies ask for it.
+
     Example:
         @router.post("/chat")
         async def chat(user = Depends(require_scopes("chat_completion"))):
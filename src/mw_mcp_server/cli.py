@@ -3,13 +3,16 @@ CLI commands for mw-mcp-server maintenance tasks.
 
 Usage:
     python -m mw_mcp_server.cli cleanup-sessions
+    python -m mw_mcp_server.cli bulk-load-start
+    python -m mw_mcp_server.cli bulk-load-end
 """
 
 import asyncio
 import logging
 import sys
 
-from .db import AsyncSessionLocal
+from .db import AsyncSessionLocal, async_engine
+from .db.bulk_load import build_hnsw_index, drop_hnsw_index
 from .db.cleanup import delete_expired_sessions
 
 logging.basicConfig(
@@ -25,16 +28,32 @@ async def _cleanup_sessions() -> None:
         print(f"Cleanup complete: {count} expired sessions deleted.")
 
 
+async def _bulk_load_start() -> None:
+    await drop_hnsw_index(async_engine)
+    await async_engine.dispose()
+    print("HNSW index dropped. Run bulk-load-end once the backfill has finished.")
+
+
+async def _bulk_load_end() -> None:
+    await build_hnsw_index(async_engine)
+    await async_engine.dispose()
+    print("HNSW index rebuilt.")
+
+
 def main() -> None:
     if len(sys.argv) < 2:
         print("Usage: python -m mw_mcp_server.cli <command>")
-        print("Commands: cleanup-sessions")
+        print("Commands: cleanup-sessions, bulk-load-start, bulk-load-end")
         sys.exit(1)
 
     command = sys.argv[1]
 
     if command == "cleanup-sessions":
         asyncio.run(_cleanup_sessions())
+    elif command == "bulk-load-start":
+        asyncio.run(_bulk_load_start())
+    elif command == "bulk-load-end":
+        asyncio.run(_bulk_load_end())
     else:
         print(f"Unknown command: {command}")
         sys.exit(1)
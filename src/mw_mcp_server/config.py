@@ -150,6 +150,18 @@ class Settings(BaseSettings):
         description="Maximum number of tool call iterations in the LLM chat loop.",
     )
 
+    tool_loop_token_budget: int = Field(
+        default=250_000,
+        ge=1_000,
+        le=10_000_000,
+        description=(
+            "Cumulative prompt + completion tokens one chat turn may spend in the "
+            "tool loop. Once exceeded, the loop stops calling tools and asks the "
+            "LLM for a final answer, since every extra iteration re-sends the "
+            "whole growing context."
+        ),
+    )
+
     schema_cap: int = Field(
         default=300,
         ge=10,
@@ -180,6 +192,65 @@ class Settings(BaseSettings):
         description="Overlap between text chunks for embedding.",
     )
 
+    hnsw_ef_search: int = Field(
+        default=100,
+        ge=10,
+        le=1000,
+        description=(
+            "Size of the HNSW candidate list used by vector search. Higher values "
+            "trade query latency for recall."
+        ),
+    )
+
+    hnsw_build_maintenance_work_mem: str = Field(
+        default="1GB",
+        pattern=r"^\d+\s*(kB|MB|GB)$",
+        description=(
+            "maintenance_work_mem used when rebuilding the HNSW index after a "
+            "bulk load (cli bulk-load-end)."
+        ),
+    )
+
+    hnsw_build_parallel_workers: int = Field(
+        default=4,
+        ge=0,
+        le=64,
+        description=(
+            "max_parallel_maintenance_workers used when rebuilding the HNSW "
+            "index after a bulk load."
+        ),
+    )
+
+    embedding_concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description=(
+            "Maximum number of embedding batch requests in flight at once. "
+            "Keep this low enough to stay within the provider's rate limits."
+        ),
+    )
+
+    embedding_batch_max_texts: int = Field(
+        default=64,
+        ge=1,
+        le=2048,
+        description=(
+            "Embedding workers' pending texts are sent together once this many "
+            "have accumulated, without waiting for embedding_batch_max_wait_ms."
+        ),
+    )
+
+    embedding_batch_max_wait_ms: int = Field(
+        default=10,
+        ge=0,
+        le=1000,
+        description=(
+            "How long an embedding worker's texts may wait for other workers' "
+            "texts to share one embedding API call."
+        ),
+    )
+
     # ------------------------------------------------------------------
     # Database Pool Configuration
     # ------------------------------------------------------------------
@@ -198,6 +269,21 @@ class Settings(BaseSettings):
         description="SQLAlchemy maximum connection pool overflow.",
     )
 
+    # ------------------------------------------------------------------
+    # Request Limits
+    # ------------------------------------------------------------------
+
+    max_request_body_bytes: int = Field(
+        default=16 * 1024 * 1024,
+        ge=64 * 1024,
+        le=512 * 1024 * 1024,
+        description=(
+            "Requests declaring a larger Content-Length are rejected with 413 "
+            "before the body is read. Leaves room for a maximum-size wiki page "
+            "with JSON escaping."
+        ),
+    )
+
     # ------------------------------------------------------------------
     # Logging
     # ------------------------------------------------------------------
@@ -214,6 +300,16 @@ class Settings(BaseSettings):
         description="Maximum number of pending embedding jobs in the queue.",
     )
 
+    embedding_workers: int = Field(
+        default=2,
+        ge=1,
+        le=16,
+        description=(
+            "Number of background workers consuming the embedding queue. "
+            "Jobs for the same page are always processed one at a time."
+        ),
+    )
+
 
     # ------------------------------------------------------------------
     # Namespace Access Control
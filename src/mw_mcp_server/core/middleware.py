@@ -1,8 +1,10 @@
 """
-Request Tracing Middleware
+Request Middleware
 
-Extracts or generates a unique request ID for each request and injects
-it into log records and response headers for distributed tracing.
+- Request tracing: extracts or generates a unique request ID for each
+  request and injects it into log records and response headers.
+- Body size limit: rejects requests whose body is too large, up front when
+  Content-Length declares it and otherwise as soon as it is read.
 """
 
 import logging
@@ -10,8 +12,9 @@ import uuid
 from contextvars import ContextVar
 
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.requests import ClientDisconnect, Request
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Context variable for the current request ID, accessible anywhere in the call stack
 request_id_var: ContextVar[str] = ContextVar("request_id", default="")
@@ -38,3 +41,73 @@ class RequestIDLogFilter(logging.Filter):
     def filter(self, record: logging.LogRecord) -> bool:
         record.request_id = request_id_var.get("")
         return True
+
+
+class BodySizeLimitMiddleware:
+    """Reject requests whose body exceeds ``max_bytes`` with 413.
+
+    Plain ASGI so oversized uploads are refused before the body is buffered
+    or parsed. A declared Content-Length is checked up front; bodies sent
+    without one (e.g. chunked) are counted as the app reads them, and the
+    app sees a client disconnect once the limit is crossed.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_bytes:
+                    await self._reject(scope, receive, send)
+                    return
+                break
+
+        received = 0
+        response_started = False
+        rejected = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    if not response_started:
+                        rejected = True
+                        await self._reject(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if rejected:
+                # The 413 has already answered this request.
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except ClientDisconnect:
+            # Raised by the app's body read after the simulated disconnect.
+            if not rejected:
+                raise
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            status_code=413,
+            content={
+                "error": "request_too_large",
+                "detail": f"Request body exceeds {self.max_bytes} bytes.",
+            },
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,65 @@
+"""
+Bulk Load Support
+
+Drops and rebuilds the HNSW index on embedding vectors around large
+backfills. Maintaining the graph on every insert makes an initial load many
+times slower than loading first and indexing once afterwards.
+
+The index is shared by every wiki, and while it is absent vector search
+falls back to an exact scan. These are operator tasks, run from the CLI.
+"""
+
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..config import settings
+
+logger = logging.getLogger("mcp.bulk_load")
+
+# Must stay identical to the definition in migration 0007.
+HNSW_INDEX_NAME = "idx_embedding_hnsw"
+
+_CREATE_INDEX_SQL = (
+    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {HNSW_INDEX_NAME} "
+    "ON embedding USING hnsw (embedding halfvec_cosine_ops) "
+    "WITH (m = 16, ef_construction = 128)"
+)
+
+
+async def drop_hnsw_index(engine: AsyncEngine) -> None:
+    """Drop the HNSW index before a bulk load."""
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {HNSW_INDEX_NAME}"))
+    logger.info("Dropped %s for bulk load", HNSW_INDEX_NAME)
+
+
+async def build_hnsw_index(engine: AsyncEngine) -> None:
+    """
+    (Re)build the HNSW index after a bulk load.
+
+    Uses the configured build memory and parallel workers for this
+    connection only; a graph that fits in maintenance_work_mem builds
+    far faster than one spilled to disk. If the build fails it can leave an
+    INVALID index behind; drop it again before retrying.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(
+            text(
+                "SELECT set_config('maintenance_work_mem', :mem, false), "
+                "set_config('max_parallel_maintenance_workers', :workers, false)"
+            ),
+            {
+                "mem": settings.hnsw_build_maintenance_work_mem,
+                "workers": str(settings.hnsw_build_parallel_workers),
+            },
+        )
+        try:
+            await conn.execute(text(_CREATE_INDEX_SQL))
+        finally:
+            await conn.execute(text("RESET maintenance_work_mem"))
+            await conn.execute(text("RESET max_parallel_maintenance_workers"))
+    logger.info("Built %s", HNSW_INDEX_NAME)
@@ -28,7 +28,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC
 from ..config import settings
 
 
@@ -70,9 +70,15 @@ class Embedding(Base):
         String(128), nullable=True,
         comment="Model used to generate this embedding (e.g. text-embedding-3-large)",
     )
+    chunk_sha1: Mapped[Optional[str]] = mapped_column(
+        String(40), nullable=True,
+        comment="SHA1 of this chunk's text. Lets the worker reuse the stored vector "
+                "for chunks an edit left unchanged instead of re-embedding them.",
+    )
 
-    # pgvector column - dimensions configured via settings.embedding_dimensions
-    embedding = Column(Vector(settings.embedding_dimensions), nullable=False)
+    # pgvector column - dimensions configured via settings.embedding_dimensions.
+    # Stored at half precision (see migration 0007).
+    embedding = Column(HALFVEC(settings.embedding_dimensions), nullable=False)
 
     __table_args__ = (
         Index("idx_embedding_wiki_page", "wiki_id", "page_title"),
@@ -80,6 +86,23 @@ class Embedding(Base):
     )
 
 
+class EmbeddingPageSummary(Base):
+    """
+    Per-page rollup of the embedding table.
+
+    Maintained by statement-level triggers on ``embedding`` (migration 0008),
+    so index statistics read one row per page instead of aggregating every
+    chunk. Never written by the application.
+    """
+    __tablename__ = "embedding_page_summary"
+
+    wiki_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    page_title: Mapped[str] = mapped_column(Text, primary_key=True)
+    chunk_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_modified: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    rev_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+
+
 # ---------------------------------------------------------------------
 # Chat Session Model
 # ---------------------------------------------------------------------
@@ -111,16 +134,19 @@ class ChatSession(Base):
     title: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
-    # Relationship to messages
+    # Relationship to messages. passive_deletes lets the FK's ON DELETE CASCADE
+    # remove messages, instead of the ORM loading every message to delete it.
     messages: Mapped[List["ChatMessage"]] = relationship(
         "ChatMessage",
         back_populates="session",
         cascade="all, delete-orphan",
-        order_by="ChatMessage.created_at",
+        passive_deletes=True,
+        order_by="[ChatMessage.created_at, ChatMessage.message_id]",
     )
 
     __table_args__ = (
         Index("idx_session_owner", "wiki_id", "owner_user_id"),
+        Index("idx_session_created_wiki", "created_at", "wiki_id"),
     )
 
 
@@ -140,6 +166,8 @@ class ChatMessage(Base):
         ForeignKey("chat_session.session_id", ondelete="CASCADE"),
         nullable=False,
     )
+    # Copied from the session so per-wiki message stats need no join.
+    wiki_id: Mapped[str] = mapped_column(String(64), nullable=False)
     sender: Mapped[str] = mapped_column(String(16), nullable=False)  # user | assistant | tool
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
@@ -158,6 +186,7 @@ class ChatMessage(Base):
 
     __table_args__ = (
         Index("idx_message_session", "session_id", "created_at"),
+        Index("idx_message_wiki_created", "wiki_id", "created_at"),
     )
 
 
@@ -186,5 +215,14 @@ class TokenUsage(Base):
     __table_args__ = (
         UniqueConstraint("wiki_id", "user_id", "usage_date", name="uq_usage_user_date"),
         Index("idx_usage_lookup", "wiki_id", "user_id", "usage_date"),
+        # Covering index for the /stats/usage window aggregation.
+        Index(
+            "idx_usage_date_wiki",
+            "usage_date",
+            "wiki_id",
+            postgresql_include=[
+                "total_tokens", "prompt_tokens", "completion_tokens", "request_count", "user_id",
+            ],
+        ),
     )
 
@@ -7,8 +7,9 @@ Tracks usage in PostgreSQL and enforces limits per user per wiki.
 
 from __future__ import annotations
 
+import time
 from datetime import date, datetime, timedelta, timezone
-from typing import NamedTuple
+from typing import Dict, NamedTuple, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -28,6 +29,28 @@ class UsageStatus(NamedTuple):
     reset_time: datetime
 
 
+# Process-local cache of each user's daily totals, fed by check_limit reads and
+# by committed record_usage totals (see RateLimiter.remember_usage). It lets
+# check_limit skip the SELECT on the request hot path:
+#   - an over-limit entry is served until the day rolls over, since usage only
+#     grows within a day;
+#   - an under-limit entry is served for _USAGE_CACHE_TTL_SECONDS, which bounds
+#     how much usage recorded by *other* server processes can go unseen.
+# The quota is already soft (checked before a turn, recorded after it), so this
+# widens the possible overshoot by at most the requests of one TTL window.
+_USAGE_CACHE_TTL_SECONDS = 30.0
+_USAGE_CACHE_MAX_ENTRIES = 10_000
+_usage_cache: Dict[Tuple[str, int, date], Tuple[float, int, int]] = {}
+
+
+def _remember_usage(key: Tuple[str, int, date], tokens_used: int, requests_today: int) -> None:
+    _usage_cache.pop(key, None)
+    if len(_usage_cache) >= _USAGE_CACHE_MAX_ENTRIES:
+        # Evict the least recently written entry; dicts preserve insertion order.
+        _usage_cache.pop(next(iter(_usage_cache)), None)
+    _usage_cache[key] = (time.monotonic(), tokens_used, requests_today)
+
+
 class RateLimiter:
     """
     Token-based rate limiter using PostgreSQL for persistence.
@@ -69,6 +92,14 @@ class RateLimiter:
             Current usage status including remaining tokens.
         """
         today = date.today()
+        key = (wiki_id, user_id, today)
+
+        cached = _usage_cache.get(key)
+        if cached is not None and (
+            cached[1] >= self._daily_limit
+            or time.monotonic() - cached[0] < _USAGE_CACHE_TTL_SECONDS
+        ):
+            return self._status(today, cached[1], cached[2])
 
         result = await self._session.execute(
             select(TokenUsage).where(
@@ -81,22 +112,23 @@ class RateLimiter:
 
         tokens_used = usage.total_tokens if usage else 0
         requests_today = usage.request_count if usage else 0
-        tokens_remaining = max(0, self._daily_limit - tokens_used)
-        is_limited = tokens_used >= self._daily_limit
+        _remember_usage(key, tokens_used, requests_today)
+
+        return self._status(today, tokens_used, requests_today)
 
-        # Reset time is midnight UTC of the next day
+    def _status(self, today: date, tokens_used: int, requests_today: int) -> UsageStatus:
+        """Build a UsageStatus; the quota resets at midnight UTC of the next day."""
         tomorrow = datetime.combine(
             today + timedelta(days=1),
             datetime.min.time(),
             tzinfo=timezone.utc,
         )
-
         return UsageStatus(
             tokens_used=tokens_used,
-            tokens_remaining=tokens_remaining,
+            tokens_remaining=max(0, self._daily_limit - tokens_used),
             limit=self._daily_limit,
             requests_today=requests_today,
-            is_limited=is_limited,
+            is_limited=tokens_used >= self._daily_limit,
             reset_time=tomorrow,
         )
 
@@ -156,20 +188,28 @@ class RateLimiter:
 
         result = await self._session.execute(stmt)
         tokens_used, requests_today = result.one()
+        # The RETURNING totals are not durable until the caller commits, and a
+        # rollback would leave them pinned in the cache; drop the stale entry
+        # instead and let the caller cache the totals via remember_usage.
+        _usage_cache.pop((wiki_id, user_id, today), None)
 
-        tomorrow = datetime.combine(
-            today + timedelta(days=1),
-            datetime.min.time(),
-            tzinfo=timezone.utc,
-        )
-        return UsageStatus(
-            tokens_used=tokens_used,
-            tokens_remaining=max(0, self._daily_limit - tokens_used),
-            limit=self._daily_limit,
-            requests_today=requests_today,
-            is_limited=tokens_used >= self._daily_limit,
-            reset_time=tomorrow,
-        )
+        return self._status(today, tokens_used, requests_today)
+
+    def remember_usage(self, wiki_id: str, user_id: int, status: UsageStatus) -> None:
+        """
+        Cache totals returned by record_usage once they have been committed.
+
+        Parameters
+        ----------
+        wiki_id : str
+            Tenant wiki identifier.
+        user_id : int
+            MediaWiki user ID.
+        status : UsageStatus
+            Status returned by record_usage.
+        """
+        usage_date = (status.reset_time - timedelta(days=1)).date()
+        _remember_usage((wiki_id, user_id, usage_date), status.tokens_used, status.requests_today)
 
     async def get_usage_history(
         self,
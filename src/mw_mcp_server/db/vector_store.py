@@ -7,13 +7,80 @@ Replaces the previous FAISS-based implementation.
 
 from __future__ import annotations
 
-from typing import List, NamedTuple, Tuple, Optional
+import asyncio
+import io
+from typing import Any, Dict, List, NamedTuple, Tuple, Optional
 from datetime import datetime
 
-from sqlalchemy import select, delete, update, func
+from sqlalchemy import Select, select, delete, insert, update, func, literal, text, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .models import Embedding
+from ..config import settings
+from .models import Embedding, EmbeddingPageSummary
+
+
+# Pages with at least this many chunks are written with COPY instead of an
+# INSERT per row; below it, the extra COPY round trip is not worth it.
+COPY_MIN_ROWS = 8
+
+_COPY_COLUMNS = (
+    "wiki_id",
+    "page_title",
+    "section_id",
+    "namespace",
+    "last_modified",
+    "rev_id",
+    "content_sha1",
+    "embedding_model",
+    "chunk_sha1",
+    "embedding",
+)
+
+# asyncpg allows at most 32767 bind parameters per statement.
+_INSERT_ROWS_PER_STATEMENT = 32767 // len(_COPY_COLUMNS)
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_field(value: Any) -> str:
+    """Render one value in PostgreSQL COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, str):
+        return value.translate(_COPY_ESCAPES)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _encode_copy_rows(
+    wiki_id: str,
+    page_titles: List[str],
+    section_ids: List[Optional[str]],
+    namespaces: List[int],
+    embeddings: List[List[float]],
+    shared: List[Any],
+    chunk_sha1s: List[Optional[str]],
+) -> bytes:
+    """Render rows as a COPY text-format payload in ``_COPY_COLUMNS`` order."""
+    shared_fields = [_copy_field(value) for value in shared]
+    wiki_field = _copy_field(wiki_id)
+    lines = []
+    for title, section, ns, emb, chunk_sha1 in zip(
+        page_titles, section_ids, namespaces, embeddings, chunk_sha1s
+    ):
+        vector = "[" + ",".join(map(str, emb)) + "]"
+        fields = [wiki_field, _copy_field(title), _copy_field(section), str(ns)]
+        lines.append("\t".join([*fields, *shared_fields, _copy_field(chunk_sha1), vector]))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _ranked_hits(rows: List[Any]) -> List[Tuple[str, Optional[str], int, float]]:
+    # relaxed_order may return slightly out-of-order rows; re-sort the
+    # (small) result set so callers still see best-first ordering.
+    hits = [(row.page_title, row.section_id, row.namespace, row.score) for row in rows]
+    hits.sort(key=lambda hit: hit[3], reverse=True)
+    return hits
 
 
 class PageSyncState(NamedTuple):
@@ -58,6 +125,7 @@ class VectorStore:
         rev_id: Optional[int] = None,
         content_sha1: Optional[str] = None,
         embedding_model: Optional[str] = None,
+        chunk_sha1s: Optional[List[Optional[str]]] = None,
     ) -> int:
         """
         Add document embeddings to the store.
@@ -80,6 +148,8 @@ class VectorStore:
             MediaWiki revision ID this content was taken from.
         embedding_model : Optional[str]
             Name of the model used to generate these embeddings.
+        chunk_sha1s : Optional[List[Optional[str]]]
+            SHA1 of each chunk's text, matching the embeddings.
 
         Returns
         -------
@@ -89,25 +159,127 @@ class VectorStore:
         if not embeddings:
             return 0
 
-        for i, (title, section, ns, emb) in enumerate(
-            zip(page_titles, section_ids, namespaces, embeddings)
-        ):
-            embedding_record = Embedding(
-                wiki_id=wiki_id,
-                page_title=title,
-                section_id=section,
-                namespace=ns,
-                last_modified=last_modified,
-                rev_id=rev_id,
-                content_sha1=content_sha1,
-                embedding=emb,
-                embedding_model=embedding_model,
+        if chunk_sha1s is None:
+            chunk_sha1s = [None] * len(embeddings)
+
+        # Multi-row INSERT ... VALUES statements instead of an ORM object per
+        # row: no identity map bookkeeping and, for any realistic page, a
+        # single statement and round trip.
+        rows = [
+            {
+                "wiki_id": wiki_id,
+                "page_title": title,
+                "section_id": section,
+                "namespace": ns,
+                "last_modified": last_modified,
+                "rev_id": rev_id,
+                "content_sha1": content_sha1,
+                "embedding": emb,
+                "embedding_model": embedding_model,
+                "chunk_sha1": chunk_sha1,
+            }
+            for title, section, ns, emb, chunk_sha1 in zip(
+                page_titles, section_ids, namespaces, embeddings, chunk_sha1s
             )
-            self._session.add(embedding_record)
+        ]
+        for start in range(0, len(rows), _INSERT_ROWS_PER_STATEMENT):
+            batch = rows[start:start + _INSERT_ROWS_PER_STATEMENT]
+            await self._session.execute(insert(Embedding).values(batch))
+        return len(embeddings)
+
+    async def copy_documents(
+        self,
+        wiki_id: str,
+        page_titles: List[str],
+        section_ids: List[Optional[str]],
+        namespaces: List[int],
+        embeddings: List[List[float]],
+        last_modified: Optional[datetime] = None,
+        rev_id: Optional[int] = None,
+        content_sha1: Optional[str] = None,
+        embedding_model: Optional[str] = None,
+        chunk_sha1s: Optional[List[Optional[str]]] = None,
+    ) -> int:
+        """
+        Bulk-load document embeddings with ``COPY ... FROM STDIN``.
 
-        await self._session.flush()
+        Same contract as :meth:`add_documents`, but streams every row in one
+        COPY on the session's connection (and therefore its transaction)
+        instead of one INSERT per row. Vectors are sent in pgvector's text
+        form, so no binary codec needs to be registered on the connection.
+        """
+        if not embeddings:
+            return 0
+
+        if chunk_sha1s is None:
+            chunk_sha1s = [None] * len(embeddings)
+
+        # Rendering thousands of floats per row as text is pure CPU work;
+        # do it off the event loop.
+        data = await asyncio.to_thread(
+            _encode_copy_rows,
+            wiki_id,
+            page_titles,
+            section_ids,
+            namespaces,
+            embeddings,
+            [last_modified, rev_id, content_sha1, embedding_model],
+            chunk_sha1s,
+        )
+
+        conn = await self._session.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_to_table(
+            Embedding.__tablename__,
+            source=io.BytesIO(data),
+            columns=list(_COPY_COLUMNS),
+        )
         return len(embeddings)
 
+    async def replace_page(
+        self,
+        wiki_id: str,
+        page_title: str,
+        section_ids: List[Optional[str]],
+        namespace: int,
+        embeddings: List[List[float]],
+        last_modified: Optional[datetime] = None,
+        rev_id: Optional[int] = None,
+        content_sha1: Optional[str] = None,
+        embedding_model: Optional[str] = None,
+        chunk_sha1s: Optional[List[Optional[str]]] = None,
+    ) -> int:
+        """
+        Replace all embeddings of one page within the current transaction.
+
+        Deletes the page's rows and writes the new ones (with COPY for pages
+        of ``COPY_MIN_ROWS`` chunks or more), so after the caller commits,
+        readers see either the old page or the new one, never a gap. An
+        empty ``embeddings`` list just removes the page.
+
+        Returns the number of embeddings written.
+        """
+        await self.delete_page(wiki_id, page_title)
+        if not embeddings:
+            return 0
+
+        if len(embeddings) >= COPY_MIN_ROWS:
+            write_documents = self.copy_documents
+        else:
+            write_documents = self.add_documents
+        return await write_documents(
+            wiki_id=wiki_id,
+            page_titles=[page_title] * len(embeddings),
+            section_ids=section_ids,
+            namespaces=[namespace] * len(embeddings),
+            embeddings=embeddings,
+            last_modified=last_modified,
+            rev_id=rev_id,
+            content_sha1=content_sha1,
+            embedding_model=embedding_model,
+            chunk_sha1s=chunk_sha1s,
+        )
+
     async def get_page_sync_state(
         self,
         wiki_id: str,
@@ -139,6 +311,28 @@ class VectorStore:
             embedding_model=row.embedding_model,
         )
 
+    async def get_chunk_vectors(
+        self,
+        wiki_id: str,
+        page_title: str,
+        embedding_model: str,
+    ) -> Dict[str, List[float]]:
+        """
+        Return the stored vectors of *page_title*'s chunks keyed by chunk_sha1.
+
+        Only rows embedded with *embedding_model* are returned, so a model
+        change never mixes vectors from two embedding spaces in one page.
+        """
+        stmt = (
+            select(Embedding.chunk_sha1, Embedding.embedding)
+            .where(Embedding.wiki_id == wiki_id)
+            .where(Embedding.page_title == page_title)
+            .where(Embedding.embedding_model == embedding_model)
+            .where(Embedding.chunk_sha1.isnot(None))
+        )
+        result = await self._session.execute(stmt)
+        return {row.chunk_sha1: row.embedding for row in result.all()}
+
     async def touch_page_sync_metadata(
         self,
         wiki_id: str,
@@ -208,9 +402,59 @@ class VectorStore:
         List[Tuple[str, Optional[str], int, float]]
             List of (page_title, section_id, namespace, score) tuples.
         """
-        # Build the cosine similarity query using pgvector's <=> operator
+        stmt = self._search_stmt(wiki_id, query_embedding, k, namespace_filter)
+        await self._set_search_options()
+        result = await self._session.execute(stmt)
+        return _ranked_hits(result.all())
+
+    async def search_batch(
+        self,
+        wiki_id: str,
+        query_embeddings: List[List[float]],
+        k: int = 5,
+        namespace_filter: Optional[List[int]] = None,
+    ) -> List[List[Tuple[str, Optional[str], int, float]]]:
+        """
+        Run several similarity searches in one database round trip.
+
+        Each query becomes its own index-ordered, limited SELECT, and the
+        branches are combined with UNION ALL, so every branch still uses the
+        HNSW index.
+
+        Returns
+        -------
+        List[List[Tuple[str, Optional[str], int, float]]]
+            One hit list per query embedding, in input order, each shaped
+            like the result of :meth:`search`.
+        """
+        if not query_embeddings:
+            return []
+
+        branches = [
+            self._search_stmt(wiki_id, embedding, k, namespace_filter).add_columns(
+                literal(index).label("query_index")
+            )
+            for index, embedding in enumerate(query_embeddings)
+        ]
+        await self._set_search_options()
+        result = await self._session.execute(union_all(*branches))
+
+        rows_by_query: List[List[Any]] = [[] for _ in query_embeddings]
+        for row in result.all():
+            rows_by_query[row.query_index].append(row)
+        return [_ranked_hits(rows) for rows in rows_by_query]
+
+    @staticmethod
+    def _search_stmt(
+        wiki_id: str,
+        query_embedding: List[float],
+        k: int,
+        namespace_filter: Optional[List[int]],
+    ) -> Select:
+        # The column is halfvec and idx_embedding_hnsw indexes it directly
+        # (see migration 0007), so plain cosine ordering uses the index.
         cosine_distance = Embedding.embedding.cosine_distance(query_embedding)
-        
+
         stmt = (
             select(
                 Embedding.page_title,
@@ -225,11 +469,19 @@ class VectorStore:
 
         if namespace_filter:
             stmt = stmt.where(Embedding.namespace.in_(namespace_filter))
-
-        result = await self._session.execute(stmt)
-        rows = result.all()
-
-        return [(row.page_title, row.section_id, row.namespace, row.score) for row in rows]
+        return stmt
+
+    async def _set_search_options(self) -> None:
+        # The tenant/namespace filters are applied after the index scan, so
+        # let pgvector keep scanning until k rows survive them instead of
+        # stopping at ef_search candidates. Both settings are transaction-local.
+        await self._session.execute(
+            text(
+                "SELECT set_config('hnsw.ef_search', :ef_search, true), "
+                "set_config('hnsw.iterative_scan', 'relaxed_order', true)"
+            ),
+            {"ef_search": str(settings.hnsw_ef_search)},
+        )
 
     async def get_pages_by_namespace(
         self,
@@ -275,26 +527,17 @@ class VectorStore:
         """
         Return statistics about the vector store for a wiki.
         """
-        # Total vectors
-        total_stmt = select(func.count()).select_from(Embedding).where(
-            Embedding.wiki_id == wiki_id
-        )
-        total_result = await self._session.execute(total_stmt)
-        total_vectors = total_result.scalar() or 0
-
-        # Unique pages with their latest timestamp and rev_id. Group by title
-        # so multi-chunk pages collapse into one row.
-        pages_stmt = (
-            select(
-                Embedding.page_title,
-                func.max(Embedding.last_modified),
-                func.max(Embedding.rev_id),
-            )
-            .where(Embedding.wiki_id == wiki_id)
-            .group_by(Embedding.page_title)
-        )
+        # One row per page from the trigger-maintained rollup (migration
+        # 0008) instead of grouping every chunk row of the wiki.
+        pages_stmt = select(
+            EmbeddingPageSummary.page_title,
+            EmbeddingPageSummary.last_modified,
+            EmbeddingPageSummary.rev_id,
+            EmbeddingPageSummary.chunk_count,
+        ).where(EmbeddingPageSummary.wiki_id == wiki_id)
         pages_result = await self._session.execute(pages_stmt)
 
+        total_vectors = 0
         embedded_pages = []
         page_timestamps = {}
         page_revisions = {}
@@ -303,6 +546,7 @@ class VectorStore:
             title = row[0]
             last_mod = row[1]
             rev_id = row[2]
+            total_vectors += row[3]
             embedded_pages.append(title)
             if last_mod:
                 # Return MediaWiki-compatible format: YYYYMMDDHHMMSS
@@ -343,3 +587,4 @@ class VectorStore:
             embeddings=embeddings,
             last_modified=last_modified,
         )
+
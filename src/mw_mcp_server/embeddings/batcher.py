@@ -0,0 +1,102 @@
+"""
+Embedding Micro-Batcher
+
+Coalesces embed() calls made by concurrent embedding workers into shared
+requests to the embedding API.
+
+Each worker usually embeds one page of a handful of chunks, which leaves
+most of the provider's batch dimension unused. The batcher holds submitted
+texts for at most ``max_wait`` seconds (or until ``max_texts`` are pending),
+embeds them in one ``Embedder.embed`` call and hands every caller back its
+own slice of the result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import List, Optional, Sequence, Set, Tuple
+
+from ..config import settings
+from .embedder import Embedder
+
+logger = logging.getLogger(__name__)
+
+_Pending = Tuple[Sequence[str], "asyncio.Future[List[List[float]]]"]
+
+
+class EmbeddingBatcher:
+    """
+    Drop-in ``embed()`` front end that merges concurrent calls.
+
+    Errors from the shared request are raised in every caller whose texts
+    were part of it.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        max_texts: Optional[int] = None,
+        max_wait: Optional[float] = None,
+    ) -> None:
+        self._embedder = embedder
+        self._max_texts = max_texts or settings.embedding_batch_max_texts
+        self._max_wait = (
+            max_wait if max_wait is not None else settings.embedding_batch_max_wait_ms / 1000
+        )
+        self._pending: List[_Pending] = []
+        self._pending_texts = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed ``texts``, possibly together with other callers' texts."""
+        if not texts:
+            return []
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[List[List[float]]] = loop.create_future()
+        self._pending.append((texts, future))
+        self._pending_texts += len(texts)
+
+        if self._pending_texts >= self._max_texts:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_texts = self._pending, [], 0
+        task = asyncio.create_task(self._run(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _run(self, batch: List[_Pending]) -> None:
+        # Concurrent pages often share boilerplate chunks (template output,
+        # navigation blocks); send each distinct text once.
+        unique_texts = list(dict.fromkeys(text for texts, _ in batch for text in texts))
+        try:
+            vectors = await self._embedder.embed(unique_texts)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        if len(batch) > 1:
+            logger.debug(
+                "Embedded %d texts for %d callers in one call", len(unique_texts), len(batch)
+            )
+
+        by_text = dict(zip(unique_texts, vectors))
+        for texts, future in batch:
+            if not future.done():
+                future.set_result([by_text[text] for text in texts])
@@ -9,30 +9,55 @@ OpenAI embeddings API (or any compatible provider). It is responsible for:
 - Strict response validation
 - Deterministic output semantics for downstream tools (FAISS, search, etc.)
 
-The class is stateless and safe to reuse across requests.
+The class is safe to reuse across requests. Its only state is a bounded,
+in-process LRU cache of query embeddings (see ``embed_query``); cache hits
+return the stored float32 values, so they can differ from a fresh API
+response in the low-order digits.
 """
 
 from __future__ import annotations
 
-from typing import List, Sequence, Optional
+from array import array
+from typing import Dict, List, Sequence, Optional
+import asyncio
+import base64
+import binascii
 import logging
+import sys
 import httpx
+import orjson
 
 from ..config import settings
 
 logger = logging.getLogger("mcp.embedder")
 
+# Search queries from the chat tool loop and the search route repeat often.
+# Vectors are kept as float32 arrays (~6 KiB each at 1536 dims) rather than
+# lists of boxed floats; stored embeddings are halfvec, so nothing is lost.
+_QUERY_CACHE_MAX_ENTRIES = 1024
+
 
 class EmbeddingError(RuntimeError):
     """Raised when embedding generation fails."""
 
 
+def _is_retryable(exc: httpx.HTTPError) -> bool:
+    """Return True for transient failures: transport errors, 429 and 5xx."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
 class Embedder:
     """
     Asynchronous embedding generator for batches of text.
 
-    This class performs no caching and assumes the caller handles
-    higher-level caching or persistent index management.
+    ``embed_query`` / ``embed_queries`` keep an in-process LRU cache of query
+    embeddings, keyed by the exact query text and bounded to
+    ``_QUERY_CACHE_MAX_ENTRIES`` (1024) entries; hits return the stored
+    float32 values. ``embed()`` is uncached: document embeddings are
+    persisted by the caller in the vector index instead.
     """
 
     def __init__(
@@ -41,6 +66,9 @@ class Embedder:
         model: Optional[str] = None,
         base_url: str = "https://api.openai.com/v1/embeddings",
         timeout: float = 60.0,
+        max_concurrency: Optional[int] = None,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
     ) -> None:
         """
         Initialize an Embedder.
@@ -58,18 +86,37 @@ class Embedder:
 
         timeout : float
             HTTP timeout for each request.
+
+        max_concurrency : Optional[int]
+            Maximum number of batch requests in flight at once.
+            Defaults to settings.embedding_concurrency.
+
+        max_retries : int
+            Retries per batch for rate-limit (429), 5xx and transport errors.
+
+        backoff_base : float
+            Initial backoff delay in seconds; doubled on every retry.
         """
         self.api_key = api_key or settings.openai_api_key.get_secret_value()
         self.model = model or settings.embedding_model
         self.base_url = base_url
         self.timeout = timeout
+        self.max_concurrency = max_concurrency or settings.embedding_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
         self._client: Optional[httpx.AsyncClient] = None
+        self._query_cache: Dict[str, array] = {}
 
     def _get_http_client(self) -> httpx.AsyncClient:
-        """Lazily create a long-lived AsyncClient for connection pooling."""
+        """Lazily create a long-lived AsyncClient for connection pooling.
+
+        HTTP/2 (negotiated via ALPN, falling back to HTTP/1.1) multiplexes
+        concurrent requests over one warm TLS connection.
+        """
         if self._client is None:
             self._client = httpx.AsyncClient(
                 timeout=self.timeout,
+                http2=True,
                 limits=httpx.Limits(
                     max_connections=50,
                     max_keepalive_connections=10,
@@ -91,6 +138,7 @@ class Embedder:
         self,
         texts: Sequence[str],
         batch_size: int = 20,
+        max_batch_chars: int = 200_000,
     ) -> List[List[float]]:
         """
         Generate embeddings for a sequence of input texts.
@@ -102,6 +150,13 @@ class Embedder:
 
         batch_size : int
             Maximum batch size per request. Helps avoid API token/size limits.
+            Batches are sent concurrently (bounded by ``max_concurrency``)
+            and the results are returned in input order.
+
+        max_batch_chars : int
+            Soft cap on the total characters per request. Texts are grouped
+            by length, so a batch of short chunks is not held up behind one
+            near the token limit and request sizes stay even.
 
         Returns
         -------
@@ -116,25 +171,121 @@ class Embedder:
         if not texts:
             return []
 
-        all_embeddings: List[List[float]] = []
-        headers = {"Authorization": f"Bearer {self.api_key}"}
-        client = self._get_http_client()
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        batches: List[List[int]] = []
+        batch_chars = 0
+        for index in sorted(range(len(texts)), key=lambda i: len(texts[i])):
+            length = len(texts[index])
+            if (
+                not batches
+                or len(batches[-1]) >= batch_size
+                or (batches[-1] and batch_chars + length > max_batch_chars)
+            ):
+                batches.append([])
+                batch_chars = 0
+            batches[-1].append(index)
+            batch_chars += length
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(batch: List[int]) -> List[List[float]]:
+            async with semaphore:
+                return await self._embed_batch([texts[i] for i in batch], headers)
+
+        results = await asyncio.gather(
+            *(run(batch) for batch in batches), return_exceptions=True
+        )
+
+        all_embeddings: List[List[float]] = [[] for _ in texts]
+        for batch, result in zip(batches, results):
+            if isinstance(result, BaseException):
+                raise result
+            for index, embedding in zip(batch, result):
+                all_embeddings[index] = embedding
+
+        return all_embeddings
+
+    async def embed_query(self, query: str) -> List[float]:
+        """Embed a single search query; see :meth:`embed_queries`."""
+        (vector,) = await self.embed_queries([query])
+        return vector
+
+    async def embed_queries(self, queries: Sequence[str]) -> List[List[float]]:
+        """
+        Embed search queries, reusing recently seen ones.
+
+        Queries missing from the cache are embedded together in one
+        ``embed`` call. Embeddings are deterministic for a given model, so
+        cached vectors never go stale; the least recently used entry is
+        evicted once ``_QUERY_CACHE_MAX_ENTRIES`` is reached.
+        """
+        vectors: Dict[str, List[float]] = {}
+        for query in queries:
+            cached = self._query_cache.pop(query, None)
+            if cached is not None:
+                self._query_cache[query] = cached
+                vectors[query] = cached.tolist()
+
+        missing = list(dict.fromkeys(q for q in queries if q not in vectors))
+        if missing:
+            for query, vector in zip(missing, await self.embed(missing)):
+                if len(self._query_cache) >= _QUERY_CACHE_MAX_ENTRIES:
+                    self._query_cache.pop(next(iter(self._query_cache)), None)
+                self._query_cache[query] = array("f", vector)
+                vectors[query] = vector
+
+        return [vectors[query] for query in queries]
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
 
-        for start in range(0, len(texts), batch_size):
-            batch = list(texts[start : start + batch_size])
-            payload = {
+    async def _embed_batch(
+        self,
+        batch: List[str],
+        headers: dict,
+    ) -> List[List[float]]:
+        """
+        Embed a single batch, retrying rate-limit and server errors with
+        exponential backoff.
+        """
+        client = self._get_http_client()
+        # Ask for base64-packed float32 vectors: ~4x smaller on the wire than
+        # JSON number arrays and decoded with a single buffer copy instead of
+        # parsing thousands of decimal literals per vector.
+        # Encoded once up front: retries resend the same bytes.
+        body = orjson.dumps(
+            {
                 "model": self.model,
                 "input": batch,
+                "encoding_format": "base64",
             }
+        )
 
+        for attempt in range(self.max_retries + 1):
             try:
                 response = await client.post(
                     self.base_url,
-                    json=payload,
+                    content=body,
                     headers=headers,
                 )
                 response.raise_for_status()
             except httpx.HTTPError as exc:
+                if attempt < self.max_retries and _is_retryable(exc):
+                    delay = self.backoff_base * (2 ** attempt)
+                    logger.warning(
+                        "Embedding request failed (%s), retrying in %.1fs "
+                        "(attempt %d/%d)",
+                        type(exc).__name__,
+                        delay,
+                        attempt + 1,
+                        self.max_retries,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+
                 logger.error(
                     "Embedding request failed (%s): batch size=%d, error=%s",
                     type(exc).__name__,
@@ -145,14 +296,14 @@ class Embedder:
                     f"Embedding generation failed: {type(exc).__name__}"
                 ) from exc
 
-            embeddings = self._extract_embeddings(response.json())
-            all_embeddings.extend(embeddings)
-
-        return all_embeddings
+            try:
+                data = orjson.loads(response.content)
+            except orjson.JSONDecodeError as exc:
+                raise EmbeddingError("Embedding API returned non-JSON response.") from exc
+            return self._extract_embeddings(data)
 
-    # ------------------------------------------------------------------
-    # Internal helpers
-    # ------------------------------------------------------------------
+        # Unreachable: the final attempt either returns or raises.
+        raise EmbeddingError("Embedding generation failed: retries exhausted")
 
     @staticmethod
     def _extract_embeddings(data: dict) -> List[List[float]]:
@@ -162,6 +313,10 @@ class Embedder:
         OpenAI returns:
             { "data": [ {"embedding": [...]}, ... ] }
 
+        where each embedding is either a list of floats or, when requested
+        with ``encoding_format="base64"``, a base64 string of little-endian
+        float32 values.
+
         Raises
         ------
         EmbeddingError
@@ -183,6 +338,10 @@ class Embedder:
                 )
 
             emb = record["embedding"]
+            if isinstance(emb, str):
+                embeddings.append(_decode_base64_vector(emb, index))
+                continue
+
             if not isinstance(emb, list) or not all(
                 isinstance(x, (float, int)) for x in emb
             ):
@@ -193,3 +352,24 @@ class Embedder:
             embeddings.append([float(x) for x in emb])
 
         return embeddings
+
+
+def _decode_base64_vector(encoded: str, index: int) -> List[float]:
+    """Decode a base64 string of little-endian float32 values."""
+    try:
+        raw = base64.b64decode(encoded, validate=True)
+    except (binascii.Error, ValueError) as exc:
+        raise EmbeddingError(
+            f"Invalid embedding vector at index {index}: bad base64 payload."
+        ) from exc
+
+    if len(raw) % 4:
+        raise EmbeddingError(
+            f"Invalid embedding vector at index {index}: truncated float32 buffer."
+        )
+
+    values = array("f")
+    values.frombytes(raw)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tolist()
@@ -4,22 +4,23 @@ Async queue for managing background embedding tasks.
 import asyncio
 import hashlib
 import logging
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
 
 from ..config import settings
 from ..db import VectorStore, AsyncSessionLocal, Embedding
+from .batcher import EmbeddingBatcher
 from .embedder import Embedder
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from .splitter import TextSplitter
 from sqlalchemy import select
 
 logger = logging.getLogger(__name__)
 
-text_splitter = RecursiveCharacterTextSplitter(
+text_splitter = TextSplitter(
     chunk_size=settings.chunk_size,
     chunk_overlap=settings.chunk_overlap,
-    length_function=len,
     separators=["\n\n", "\n", ".", " ", ""],
 )
 
@@ -37,31 +38,46 @@ class EmbeddingJob:
     request_id: str = "unknown"
 
 class EmbeddingQueue:
-    """Singleton queue for holding embedding jobs."""
+    """Singleton queue for holding embedding jobs.
+
+    Jobs are coalesced per page: enqueueing a page that is still waiting
+    replaces its pending job in place, so a burst of saves to one page is
+    embedded once, from the newest content, at the original queue position.
+    """
     def __init__(self, maxsize: int | None = None):
         effective_size = maxsize if maxsize is not None else settings.embedding_queue_max_size
-        self._queue: asyncio.Queue[EmbeddingJob] = asyncio.Queue(maxsize=effective_size)
+        self._queue: asyncio.Queue[Tuple[str, str]] = asyncio.Queue(maxsize=effective_size)
+        self._pending: Dict[Tuple[str, str], EmbeddingJob] = {}
 
     async def enqueue(self, job: EmbeddingJob) -> int:
         """Add a job to the queue. Returns current queue size.
 
+        If the page already has a pending job, that job is replaced.
         If the queue is full, the oldest job is evicted to make room.
         """
+        key = (job.wiki_id, job.title)
+        if key in self._pending:
+            self._pending[key] = job
+            qsize = self._queue.qsize()
+            logger.info(f"Job coalesced: {job.title} (Queue size: {qsize})")
+            return qsize
+
         if self._queue.full():
             try:
-                evicted = self._queue.get_nowait()
+                evicted = self._pending.pop(self._queue.get_nowait())
                 logger.warning(f"Queue full ({self._queue.maxsize}), evicted oldest job: {evicted.title}")
                 self._queue.task_done()
             except asyncio.QueueEmpty:
                 pass  # Shouldn't happen if full() was True, but be safe
 
-        await self._queue.put(job)
+        self._pending[key] = job
+        await self._queue.put(key)
         qsize = self._queue.qsize()
         logger.info(f"Job enqueued: {job.title} (Queue size: {qsize})")
         return qsize
 
     async def get_next_job(self) -> EmbeddingJob:
-        return await self._queue.get()
+        return self._pending.pop(await self._queue.get())
 
     def task_done(self):
         self._queue.task_done()
@@ -70,16 +86,47 @@ class EmbeddingQueue:
 embedding_queue = EmbeddingQueue()
 
 
-async def process_embeddings_worker_task():
+# Per-page locks so that concurrent workers never interleave the
+# delete + insert of two jobs for the same page. Entries are reference
+# counted and dropped once no worker holds or waits on them.
+_page_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+_page_lock_users: Dict[Tuple[str, str], int] = {}
+
+
+@asynccontextmanager
+async def _page_lock(wiki_id: str, title: str) -> AsyncIterator[None]:
+    key = (wiki_id, title)
+    lock = _page_locks.get(key)
+    if lock is None:
+        lock = _page_locks[key] = asyncio.Lock()
+    _page_lock_users[key] = _page_lock_users.get(key, 0) + 1
+    try:
+        async with lock:
+            yield
+    finally:
+        _page_lock_users[key] -= 1
+        if not _page_lock_users[key]:
+            del _page_lock_users[key]
+            del _page_locks[key]
+
+
+async def process_embeddings_worker_task(
+    embedder: Optional[Embedder] = None,
+    batcher: Optional[EmbeddingBatcher] = None,
+):
     """
     Background worker that consumes jobs from the queue and manages the embedding process.
+
+    Several workers may run concurrently (see ``settings.embedding_workers``)
+    so that fetching, embedding and writing for different pages overlap.
+    Pass a shared ``embedder`` to let them reuse one connection pool, and a
+    shared ``batcher`` to merge their chunks into common embedding calls.
     """
     logger.info("Embedding worker started.")
-    
-    # Instantiate Embedder once (if it holds connections)
-    # or create per loop if needed. Here we assume one is fine.
+
     # Note: VectorStore needs a DB session, so we must create a new session per job.
-    embedder = Embedder()
+    if batcher is None:
+        batcher = EmbeddingBatcher(embedder or Embedder())
 
     while True:
         try:
@@ -91,7 +138,8 @@ async def process_embeddings_worker_task():
         cancelled = False
         try:
             logger.info(f"Processing embedding job: {job.title} ({job.wiki_id})")
-            await _process_single_job(job, embedder)
+            async with _page_lock(job.wiki_id, job.title):
+                await _process_single_job(job, batcher)
             logger.info(f"Finished embedding job: {job.title}")
         except asyncio.CancelledError:
             logger.info("Embedding worker cancelled mid-job.")
@@ -135,7 +183,40 @@ async def _check_embedding_model_mismatch(session, wiki_id: str) -> None:
     _mismatch_checked.add(wiki_id)
 
 
-async def _process_single_job(job: EmbeddingJob, embedder: Embedder):
+async def _embed_unique(embedder: EmbeddingBatcher, chunks: List[str]) -> List[List[float]]:
+    """
+    Embed ``chunks``, sending each distinct text to the API only once.
+
+    Pages often repeat boilerplate (template output, navigation blocks), and
+    identical text always yields the same vector, so duplicates reuse it.
+    """
+    unique_chunks = list(dict.fromkeys(chunks))
+    unique_embeddings = await embedder.embed(unique_chunks)
+    if len(unique_chunks) == len(chunks):
+        return unique_embeddings
+    by_text = dict(zip(unique_chunks, unique_embeddings))
+    return [by_text[chunk] for chunk in chunks]
+
+
+async def _embed_changed_chunks(
+    embedder: EmbeddingBatcher,
+    chunks: List[str],
+    chunk_sha1s: List[str],
+    stored: Dict[str, List[float]],
+) -> List[List[float]]:
+    """
+    Embed ``chunks``, reusing ``stored`` vectors (keyed by chunk SHA1) for
+    chunks whose text was already embedded, e.g. the untouched parts of an
+    edited page.
+    """
+    missing = [chunk for chunk, sha1 in zip(chunks, chunk_sha1s) if sha1 not in stored]
+    if not missing:
+        return [stored[sha1] for sha1 in chunk_sha1s]
+    fresh = iter(await _embed_unique(embedder, missing))
+    return [stored[sha1] if sha1 in stored else next(fresh) for sha1 in chunk_sha1s]
+
+
+async def _process_single_job(job: EmbeddingJob, embedder: EmbeddingBatcher):
     """
     Execute the embedding logic for a single job inside a dedicated DB session.
     """
@@ -170,32 +251,45 @@ async def _process_single_job(job: EmbeddingJob, embedder: Embedder):
                 )
                 return
 
-            # 1. Chunk Content
-            text_chunks = text_splitter.split_text(job.content)
-
-            # 2. Delete Existing Page Embeddings
-            await vector_store.delete_page(job.wiki_id, job.title)
-
-            # Exit if empty content
-            if not text_chunks:
-                logger.warning(f"No content chunks for {job.title}, skipped.")
-                return
+            # 1. Chunk Content. Splitting a large page is pure-Python CPU
+            # work; run it in a thread so chat requests served by the same
+            # event loop are not stalled behind it.
+            text_chunks = await asyncio.to_thread(text_splitter.split_text, job.content)
+
+            # 2. Collect vectors of chunks an edit left unchanged.
+            chunk_sha1s = [
+                hashlib.sha1(chunk.encode("utf-8")).hexdigest() for chunk in text_chunks
+            ]
+            stored = (
+                await vector_store.get_chunk_vectors(
+                    job.wiki_id, job.title, settings.embedding_model
+                )
+                if existing is not None and text_chunks
+                else {}
+            )
 
-            # 3. Embed
-            embeddings = await embedder.embed(text_chunks)
+            # 3. Embed. Nothing has been written yet, so the page keeps its
+            # old vectors while the embedding API call is in flight.
+            if text_chunks:
+                embeddings = await _embed_changed_chunks(
+                    embedder, text_chunks, chunk_sha1s, stored
+                )
+            else:
+                logger.warning(f"No content chunks for {job.title}; removing its embeddings.")
+                embeddings = []
 
-            # 4. Add to Index
-            section_ids = [f"chunk_{i}" for i in range(len(text_chunks))]
-            await vector_store.add_documents(
+            # 4. Swap the page's rows (delete + insert) in one transaction.
+            await vector_store.replace_page(
                 wiki_id=job.wiki_id,
-                page_titles=[job.title] * len(text_chunks),
-                section_ids=section_ids,
-                namespaces=[job.namespace] * len(text_chunks),
+                page_title=job.title,
+                section_ids=[f"chunk_{i}" for i in range(len(text_chunks))],
+                namespace=job.namespace,
                 embeddings=embeddings,
                 last_modified=job.last_modified,
                 rev_id=job.rev_id,
                 content_sha1=content_sha1,
                 embedding_model=settings.embedding_model,
+                chunk_sha1s=chunk_sha1s,
             )
 
             await vector_store.commit()
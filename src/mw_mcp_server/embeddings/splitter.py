@@ -0,0 +1,104 @@
+"""
+Text Splitter
+
+Splits page text into overlapping chunks for embedding.
+
+Produces the same chunks as LangChain's ``RecursiveCharacterTextSplitter``
+with its default options (separators kept at the start of the following
+piece, whitespace stripped), so stored chunk hashes stay valid. Separator
+patterns are compiled once and windows are packed with a deque instead of
+repeatedly re-slicing a list.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Deque, List, Optional, Sequence
+
+
+class TextSplitter:
+    """Recursive character splitter with fixed separators."""
+
+    def __init__(
+        self,
+        chunk_size: int,
+        chunk_overlap: int,
+        separators: Sequence[str] = ("\n\n", "\n", ".", " ", ""),
+    ) -> None:
+        if chunk_overlap > chunk_size:
+            raise ValueError(
+                f"chunk_overlap ({chunk_overlap}) must not exceed chunk_size ({chunk_size})."
+            )
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self._separators = list(separators)
+        self._patterns = {
+            sep: re.compile(f"({re.escape(sep)})") for sep in self._separators if sep
+        }
+
+    def split_text(self, text: str) -> List[str]:
+        """Split ``text`` into chunks of at most ``chunk_size`` characters where possible."""
+        return self._split(text, 0)
+
+    def _split(self, text: str, first: int) -> List[str]:
+        separators = self._separators
+        separator = separators[-1]
+        next_first = len(separators)
+        for i in range(first, len(separators)):
+            if separators[i] == "" or separators[i] in text:
+                separator = separators[i]
+                next_first = i + 1
+                break
+
+        chunks: List[str] = []
+        pending: List[str] = []
+        for piece in self._pieces(text, separator):
+            if len(piece) < self.chunk_size:
+                pending.append(piece)
+                continue
+            if pending:
+                chunks.extend(self._merge(pending))
+                pending = []
+            if separator == "" or next_first >= len(separators):
+                chunks.append(piece)
+            else:
+                chunks.extend(self._split(piece, next_first))
+        if pending:
+            chunks.extend(self._merge(pending))
+        return chunks
+
+    def _pieces(self, text: str, separator: str) -> List[str]:
+        """Split on ``separator``, keeping it at the start of the following piece."""
+        if not separator:
+            return list(text)
+        parts = self._patterns[separator].split(text)
+        pieces = [parts[0]]
+        pieces.extend(parts[i] + parts[i + 1] for i in range(1, len(parts) - 1, 2))
+        return [p for p in pieces if p]
+
+    def _merge(self, pieces: List[str]) -> List[str]:
+        """Greedily pack pieces into windows, carrying up to ``chunk_overlap`` over."""
+        size, overlap = self.chunk_size, self.chunk_overlap
+        chunks: List[str] = []
+        window: Deque[str] = deque()
+        total = 0
+        for piece in pieces:
+            length = len(piece)
+            if total + length > size and window:
+                chunk = _join(window)
+                if chunk is not None:
+                    chunks.append(chunk)
+                while total > overlap or (total + length > size and total > 0):
+                    total -= len(window.popleft())
+            window.append(piece)
+            total += length
+        chunk = _join(window)
+        if chunk is not None:
+            chunks.append(chunk)
+        return chunks
+
+
+def _join(pieces: Deque[str]) -> Optional[str]:
+    text = "".join(pieces).strip()
+    return text or None
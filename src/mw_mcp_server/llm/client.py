@@ -21,8 +21,9 @@ Design Goals
 
 from __future__ import annotations
 
-from typing import List, Dict, Any, Optional, NamedTuple
+from typing import AsyncIterator, List, Dict, Any, Optional, NamedTuple, Tuple, Union
 import httpx
+import orjson
 
 from ..config import settings
 
@@ -88,14 +89,21 @@ class LLMClient:
         self.base_url = base_url or "https://api.openai.com/v1"
         self.timeout = timeout
         self._client: Optional[httpx.AsyncClient] = None
+        # (tools list, encoded JSON) for the most recently sent tool list.
+        self._tools_json: Optional[Tuple[List[Dict[str, Any]], bytes]] = None
 
         self._validate_config()
 
     def _get_http_client(self) -> httpx.AsyncClient:
-        """Lazily create a long-lived AsyncClient for connection pooling."""
+        """Lazily create a long-lived AsyncClient for connection pooling.
+
+        HTTP/2 (negotiated via ALPN, falling back to HTTP/1.1) multiplexes
+        concurrent requests over one warm TLS connection.
+        """
         if self._client is None:
             self._client = httpx.AsyncClient(
                 timeout=self.timeout,
+                http2=True,
                 limits=httpx.Limits(
                     max_connections=100,
                     max_keepalive_connections=20,
@@ -126,21 +134,64 @@ class LLMClient:
         self,
         system_prompt: str,
         messages: List[Dict[str, Any]],
-        tools: Optional[List[Dict[str, Any]]],
         temperature: float,
+        prompt_cache_key: Optional[str] = None,
+        tool_choice: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Construct a chat completion request payload."""
+        """Construct a chat completion request payload (tools are added by ``_encode_body``)."""
         payload: Dict[str, Any] = {
             "model": self.model,
             "messages": [{"role": "system", "content": system_prompt}] + messages,
             "temperature": temperature,
         }
 
-        if tools:
-            payload["tools"] = tools
+        if tool_choice:
+            payload["tool_choice"] = tool_choice
+
+        if prompt_cache_key:
+            payload["prompt_cache_key"] = prompt_cache_key
 
         return payload
 
+    def _encode_tools(self, tools: List[Dict[str, Any]]) -> bytes:
+        """Return the JSON encoding of ``tools``, reusing it across calls.
+
+        Every turn of the tool loop sends the same definitions list, so it is
+        encoded once and cached by identity. Tool definition lists are treated
+        as immutable once passed in.
+        """
+        cached = self._tools_json
+        if cached is None or cached[0] is not tools:
+            cached = (tools, orjson.dumps(tools))
+            self._tools_json = cached
+        return cached[1]
+
+    def _encode_body(
+        self,
+        payload: Dict[str, Any],
+        tools: Optional[List[Dict[str, Any]]],
+    ) -> bytes:
+        """Serialize a request payload, splicing in the pre-encoded tools."""
+        body = orjson.dumps(payload)
+        if not tools:
+            return body
+        return b"".join((body[:-1], b',"tools":', self._encode_tools(tools), b"}"))
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+    @staticmethod
+    def _parse_usage(usage_data: Optional[Dict[str, Any]]) -> TokenUsage:
+        usage_data = usage_data or {}
+        return TokenUsage(
+            prompt_tokens=usage_data.get("prompt_tokens", 0),
+            completion_tokens=usage_data.get("completion_tokens", 0),
+            total_tokens=usage_data.get("total_tokens", 0),
+        )
+
     # -----------------------------------------------------------------
     # Public API
     # -----------------------------------------------------------------
@@ -151,6 +202,8 @@ class LLMClient:
         messages: List[Dict[str, Any]],
         tools: Optional[List[Dict[str, Any]]] = None,
         temperature: float = 0.2,
+        prompt_cache_key: Optional[str] = None,
+        tool_choice: Optional[str] = None,
     ) -> ChatResult:
         """
         Execute a chat completion request.
@@ -169,6 +222,16 @@ class LLMClient:
         temperature : float
             Sampling temperature.
 
+        prompt_cache_key : Optional[str]
+            Routing hint for the provider's automatic prompt caching. Requests
+            that share a long prompt prefix (same wiki, same system prompt)
+            should pass the same key so they land on the same cache.
+
+        tool_choice : Optional[str]
+            OpenAI ``tool_choice`` value, e.g. ``"none"`` to send the tool
+            definitions (keeping the cached prompt prefix intact) while
+            forbidding further tool calls.
+
         Returns
         -------
         ChatResult
@@ -182,17 +245,16 @@ class LLMClient:
         LLMTransportError
         LLMResponseError
         """
-        payload = self._build_payload(system_prompt, messages, tools, temperature)
-
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+        payload = self._build_payload(
+            system_prompt, messages, temperature, prompt_cache_key, tool_choice
+        )
 
         url = f"{self.base_url}/chat/completions"
 
         try:
-            response = await self._get_http_client().post(url, json=payload, headers=headers)
+            response = await self._get_http_client().post(
+                url, content=self._encode_body(payload, tools), headers=self._headers()
+            )
             response.raise_for_status()
         except httpx.HTTPError as exc:
             raise LLMTransportError(
@@ -200,7 +262,7 @@ class LLMClient:
             ) from exc
 
         try:
-            data = response.json()
+            data = orjson.loads(response.content)
         except Exception as exc:
             raise LLMResponseError("Failed to parse LLM JSON response.") from exc
 
@@ -220,13 +282,108 @@ class LLMClient:
         if "role" not in message:
             raise LLMResponseError("LLM response missing 'role' field.")
 
-        # Extract token usage from response
-        usage_data = data.get("usage", {})
-        usage = TokenUsage(
-            prompt_tokens=usage_data.get("prompt_tokens", 0),
-            completion_tokens=usage_data.get("completion_tokens", 0),
-            total_tokens=usage_data.get("total_tokens", 0),
+        return ChatResult(message=message, usage=self._parse_usage(data.get("usage")))
+
+    async def chat_stream(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.2,
+        prompt_cache_key: Optional[str] = None,
+        tool_choice: Optional[str] = None,
+    ) -> AsyncIterator[Union[str, ChatResult]]:
+        """
+        Execute a streaming chat completion request.
+
+        Yields assistant content deltas (``str``) as they arrive, then a
+        single final ``ChatResult`` whose message is assembled from the
+        stream (content plus any tool calls) in the same shape ``chat()``
+        returns, so callers can append it to the conversation unchanged.
+
+        Raises
+        ------
+        LLMTransportError
+        LLMResponseError
+        """
+        payload = self._build_payload(
+            system_prompt, messages, temperature, prompt_cache_key, tool_choice
         )
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
 
-        return ChatResult(message=message, usage=usage)
+        url = f"{self.base_url}/chat/completions"
+
+        content_parts: List[str] = []
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+        usage = TokenUsage(0, 0, 0)
+
+        try:
+            async with self._get_http_client().stream(
+                "POST", url, content=self._encode_body(payload, tools), headers=self._headers()
+            ) as response:
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data_str = line[5:].strip()
+                    if data_str == "[DONE]":
+                        break
+
+                    try:
+                        chunk = orjson.loads(data_str)
+                    except orjson.JSONDecodeError as exc:
+                        raise LLMResponseError(
+                            "Failed to parse LLM stream chunk."
+                        ) from exc
+
+                    if chunk.get("usage"):
+                        usage = self._parse_usage(chunk["usage"])
+
+                    for choice in chunk.get("choices") or []:
+                        delta = choice.get("delta") or {}
+
+                        text = delta.get("content")
+                        if text:
+                            content_parts.append(text)
+                            yield text
+
+                        for tc_delta in delta.get("tool_calls") or []:
+                            _merge_tool_call_delta(tool_calls, tc_delta)
+        except httpx.HTTPError as exc:
+            raise LLMTransportError(
+                f"LLM transport failure: {type(exc).__name__}"
+            ) from exc
+
+        message: Dict[str, Any] = {
+            "role": "assistant",
+            "content": "".join(content_parts) or None,
+        }
+        if tool_calls:
+            message["tool_calls"] = [tool_calls[i] for i in sorted(tool_calls)]
+
+        yield ChatResult(message=message, usage=usage)
 
+
+def _merge_tool_call_delta(
+    tool_calls: Dict[int, Dict[str, Any]],
+    tc_delta: Dict[str, Any],
+) -> None:
+    """Fold one streamed tool-call fragment into the accumulated calls.
+
+    The first fragment for an index carries ``id`` and the function name;
+    later fragments append pieces of the JSON ``arguments`` string.
+    """
+    index = tc_delta.get("index", 0)
+    call = tool_calls.setdefault(
+        index,
+        {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+    )
+    if tc_delta.get("id"):
+        call["id"] = tc_delta["id"]
+    function = tc_delta.get("function") or {}
+    if function.get("name"):
+        call["function"]["name"] += function["name"]
+    if function.get("arguments"):
+        call["function"]["arguments"] += function["arguments"]
@@ -30,9 +30,11 @@ from sqlalchemy import text
 from .api.dependencies import get_embedder, get_llm_client
 from .config import settings
 from .core.errors import unhandled_exception_handler
-from .core.middleware import RequestIDLogFilter, RequestIDMiddleware
+from .core.middleware import BodySizeLimitMiddleware, RequestIDLogFilter, RequestIDMiddleware
 from .db import Base, async_engine
+from .embeddings.batcher import EmbeddingBatcher
 from .embeddings.queue import process_embeddings_worker_task
+from .tools.wiki_tools import mw_client
 
 from .api import (
     chat_routes,
@@ -120,23 +122,33 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.error(f"Database initialization failed: {e}")
         raise
 
-    worker_task = asyncio.create_task(process_embeddings_worker_task())
-    logger.info("Background embedding worker started")
+    # Build the shared clients at boot instead of on the first request. The
+    # embedding workers reuse the request-path embedder and its connection
+    # pool; concurrency is bounded per embed() call, not per instance. They
+    # also share one batcher so concurrent pages go out in common API calls.
+    get_llm_client()
+    embedder = get_embedder()
+    batcher = EmbeddingBatcher(embedder)
+    worker_tasks = [
+        asyncio.create_task(process_embeddings_worker_task(embedder, batcher))
+        for _ in range(settings.embedding_workers)
+    ]
+    logger.info("Started %d background embedding worker(s)", len(worker_tasks))
 
     yield  # Application runs here
 
     # ---- Shutdown ----
     logger.info("Shutting down mw-mcp-server")
 
-    worker_task.cancel()
-    try:
-        await worker_task
-    except asyncio.CancelledError:
-        logger.info("Background embedding worker cancelled cleanly")
+    for task in worker_tasks:
+        task.cancel()
+    await asyncio.gather(*worker_tasks, return_exceptions=True)
+    logger.info("Background embedding workers cancelled cleanly")
 
     # Close long-lived HTTP clients on the cached singletons.
     await get_llm_client().aclose()
     await get_embedder().aclose()
+    await mw_client.aclose()
 
     await async_engine.dispose()
     logger.info("Database connections closed")
@@ -170,9 +182,10 @@ def create_app() -> FastAPI:
     )
 
     # --------------------------------------------------------------
-    # Middleware (order matters: first added = outermost)
+    # Middleware (order matters: last added = outermost)
     # --------------------------------------------------------------
 
+    app.add_middleware(BodySizeLimitMiddleware, max_bytes=settings.max_request_body_bytes)
     app.add_middleware(RequestIDMiddleware)
 
     # --------------------------------------------------------------
@@ -52,16 +52,14 @@ async def _semantic_namespace_suggestions(
     if not query:
         return []
     try:
-        embeddings = await embedder.embed([query])
+        query_embedding = await embedder.embed_query(query)
     except Exception:
         # Embedder failures shouldn't break the primary tool path.
         return []
-    if not embeddings:
-        return []
 
     raw = await vector_store.search(
         wiki_id=wiki_id,
-        query_embedding=embeddings[0],
+        query_embedding=query_embedding,
         k=k * SEMANTIC_OVERQUERY_MULTIPLIER,
         namespace_filter=[namespace],
     )
@@ -16,7 +16,7 @@ Responsibilities
 from __future__ import annotations
 
 import logging
-from typing import List, Optional, Any, Dict
+from typing import List, Optional, Any, Dict, Set, Tuple
 
 from ..wiki.api_client import MediaWikiClient
 from .wiki_tools import mw_client
@@ -99,11 +99,7 @@ async def vector_search(
     if not user.allowed_namespaces:
         return []
 
-    embeddings = await embedder.embed([query])
-    if not embeddings:
-        return []
-
-    q_emb = embeddings[0]
+    q_emb = await embedder.embed_query(query)
 
     try:
         raw_results = await vector_store.search(
@@ -120,16 +116,68 @@ async def vector_search(
         return []
 
     candidates = raw_results[:k * PERMISSION_CHECK_MULTIPLIER]
-    titles_to_check = list({title for title, _, _, _ in candidates})
+    access_map = await _check_access({title for title, _, _, _ in candidates}, user, client)
+    return _select_results(candidates, access_map, k)
+
+
+async def vector_search_batch(
+    queries: List[str],
+    user: UserContext,
+    vector_store: VectorStore,
+    embedder: Embedder,
+    k: int = 5,
+    client: Optional[MediaWikiClient] = None,
+) -> List[List[ToolSearchResult]]:
+    """
+    Run several permission-filtered vector searches at once.
+
+    Equivalent to calling :func:`vector_search` per query, but uncached
+    queries are embedded in one request, the searches share one database
+    round trip and all candidate titles go through a single permission
+    check. Returns one result list per query, in input order.
+    """
+    if not user.allowed_namespaces or not queries:
+        return [[] for _ in queries]
+
+    q_embs = await embedder.embed_queries(queries)
+
+    try:
+        raw_batches = await vector_store.search_batch(
+            wiki_id=user.wiki_id,
+            query_embeddings=q_embs,
+            k=k * VECTOR_OVERQUERY_MULTIPLIER,  # Over-query to allow for filtering
+            namespace_filter=user.allowed_namespaces,
+        )
+    except Exception as exc:
+        logger.exception("Vector search failed")
+        raise ValueError(f"Vector search failed: {type(exc).__name__}") from exc
+
+    candidate_batches = [raw[:k * PERMISSION_CHECK_MULTIPLIER] for raw in raw_batches]
+    titles = {title for candidates in candidate_batches for title, _, _, _ in candidates}
+    access_map = await _check_access(titles, user, client)
+    return [_select_results(candidates, access_map, k) for candidates in candidate_batches]
 
+
+async def _check_access(
+    titles: Set[str],
+    user: UserContext,
+    client: Optional[MediaWikiClient],
+) -> Dict[str, bool]:
     try:
-        access_map = await validate_page_access(titles_to_check, user, client)
+        return await validate_page_access(list(titles), user, client)
     except Exception as exc:
         logger.error("Permission validation failed: %s", exc)
         raise ValueError(
             f"Permission validation failed during vector search: {type(exc).__name__}: {exc}"
         ) from exc
 
+
+def _select_results(
+    candidates: List[Tuple[str, Optional[str], int, float]],
+    access_map: Dict[str, bool],
+    k: int,
+) -> List[ToolSearchResult]:
+    """Keep the best readable hit per page, up to ``k`` pages."""
     results: List[ToolSearchResult] = []
     seen_titles: set = set()
 
@@ -141,7 +189,7 @@ async def vector_search(
         seen_titles.add(title)
 
         results.append(
-            ToolSearchResult(
+            ToolSearchResult.model_construct(
                 title=title,
                 section_id=section_id,
                 score=float(score),
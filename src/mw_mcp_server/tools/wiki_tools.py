@@ -15,7 +15,6 @@ Responsibilities
 from __future__ import annotations
 
 from typing import Optional, Dict, Any, Union
-import asyncio
 import re
 
 import logging
@@ -32,6 +31,10 @@ logger = logging.getLogger("mcp.wiki_tools")
 
 _SPECIAL_PRINTOUTS = frozenset({"category", "mainlabel"})
 _REDIRECT_RE = re.compile(r"#REDIRECT\s*\[\[(.+?)\]\]", re.IGNORECASE)
+_ASK_PROP_CONDITION_RE = re.compile(r"\[\[([^:\]]+)::")
+_ASK_CATEGORY_RE = re.compile(r"Category:([^\]|]+)")
+_ASK_PRINTOUT_RE = re.compile(r"\|\?([A-Za-z][^|=\]#]*)")
+_ASK_FORMAT_PARAM_RE = re.compile(r"\|format\s*=\s*\w+")
 
 
 # ---------------------------------------------------------------------
@@ -404,30 +407,23 @@ async def tool_run_smw_ask(
 
     if vector_store:
         # Extract references from the query before hitting the DB
-        prop_conditions = re.findall(r"\[\[([^:\]]+)::", ask_query)
-        cat_conditions = re.findall(r"Category:([^\]|]+)", ask_query)
-        raw_printouts = re.findall(r"\|\?([A-Za-z][^|=\]#]*)", ask_query)
+        prop_conditions = _ASK_PROP_CONDITION_RE.findall(ask_query)
+        cat_conditions = _ASK_CATEGORY_RE.findall(ask_query)
         printout_props = [
-            m.strip() for m in raw_printouts
-            if m.strip().lower() not in _SPECIAL_PRINTOUTS
+            name for name in (m.strip() for m in _ASK_PRINTOUT_RE.findall(ask_query))
+            if name.lower() not in _SPECIAL_PRINTOUTS
         ]
 
         needs_props = bool(prop_conditions or printout_props)
         needs_cats = bool(cat_conditions)
 
-        # Fetch only needed namespaces, concurrently when both are required
+        # Fetch only needed namespaces. Sequential on purpose: both queries use
+        # the request's AsyncSession, which cannot run operations concurrently.
         known_props: set = set()
         known_cats: set = set()
-        if needs_props and needs_cats:
-            props_list, cats_list = await asyncio.gather(
-                vector_store.get_pages_by_namespace(user.wiki_id, NS_PROPERTY),
-                vector_store.get_pages_by_namespace(user.wiki_id, NS_CATEGORY),
-            )
-            known_props = set(props_list)
-            known_cats = set(cats_list)
-        elif needs_props:
+        if needs_props:
             known_props = set(await vector_store.get_pages_by_namespace(user.wiki_id, NS_PROPERTY))
-        elif needs_cats:
+        if needs_cats:
             known_cats = set(await vector_store.get_pages_by_namespace(user.wiki_id, NS_CATEGORY))
 
         # Pre-build lowercase lookup maps once
@@ -463,7 +459,7 @@ async def tool_run_smw_ask(
     # with getText(), so SMW format parameters like "json" produce empty
     # output.  The API already returns structured JSON; the SMW-level
     # format param is both unnecessary and breaks results.
-    clean_query = re.sub(r"\|format\s*=\s*\w+", "", clean_query)
+    clean_query = _ASK_FORMAT_PARAM_RE.sub("", clean_query)
 
     try:
         result = await client.ask(clean_query, user=user)
@@ -17,14 +17,20 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Dict, Any, Optional, List
+import asyncio
 import logging
 import httpx
+import orjson
 
 from ..auth.jwt_utils import create_mcp_to_mw_jwt
 from ..auth.models import UserContext
 
 logger = logging.getLogger("mcp.mediawiki")
 
+# Maximum titles per mwassistant-check-access request (MediaWiki's default
+# multi-value limit for non-bot clients).
+CHECK_ACCESS_BATCH_SIZE = 50
+
 
 # ---------------------------------------------------------------------
 # Data Classes
@@ -92,11 +98,24 @@ class MediaWikiClient:
     async def _get_client(self) -> httpx.AsyncClient:
         """
         Lazily initialize and return an AsyncClient.
+
+        HTTP/2 is negotiated via ALPN on https wikis (falling back to
+        HTTP/1.1), so concurrent tool calls and SMW queries multiplex over
+        one warm TLS connection.
         """
         if self._client is None:
             self._client = httpx.AsyncClient(
                 timeout=self.timeout,
                 follow_redirects=True,
+                http2=True,
+                # Tool calls and batched access checks fan out concurrently
+                # to the same wiki; keep enough warm connections for that
+                # and hold them longer than httpx's 5s default.
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=50,
+                    keepalive_expiry=30.0,
+                ),
             )
         return self._client
 
@@ -182,8 +201,10 @@ class MediaWikiClient:
             ) from exc
 
         try:
-            data = response.json()
-        except ValueError as exc:
+            # Page bodies can be large; orjson parses them several times
+            # faster than the stdlib decoder behind response.json().
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError as exc:
             raise MediaWikiResponseError(
                 "MediaWiki returned non-JSON response."
             ) from exc
@@ -697,21 +718,60 @@ class MediaWikiClient:
         if not titles:
             return {}
 
-        # Join titles with pipe as MW API convention
-        
         username = user.username if isinstance(user, UserContext) else user
         user_id = user.user_id if isinstance(user, UserContext) else None
         api_url = user.api_url if isinstance(user, UserContext) else None
         wiki_id = user.wiki_id if isinstance(user, UserContext) else None
 
+        # MediaWiki caps multi-value parameters at 50 values for normal
+        # clients, and long pipe-joined title lists also push the GET URL
+        # towards server limits. Check in batches and run them concurrently.
+        unique_titles = list(dict.fromkeys(titles))
+        batches = [
+            unique_titles[i:i + CHECK_ACCESS_BATCH_SIZE]
+            for i in range(0, len(unique_titles), CHECK_ACCESS_BATCH_SIZE)
+        ]
+        access_maps = await asyncio.gather(
+            *(
+                self._check_read_access_batch(batch, username, user_id, api_url, wiki_id)
+                for batch in batches
+            )
+        )
+
+        access_map: Dict[str, Any] = {}
+        for batch_map in access_maps:
+            access_map.update(batch_map)
+
+        # With formatversion=2, MW returns actual JSON booleans
+        # Also handle legacy string format ('true'/'false') for backward compatibility
+        def to_bool(val):
+            if isinstance(val, bool):
+                return val
+            if isinstance(val, str):
+                return val.lower() == "true"
+            return False
+
+        return {title: to_bool(access_map.get(title, False)) for title in titles}
+
+    async def _check_read_access_batch(
+        self,
+        titles: List[str],
+        username: Optional[str],
+        user_id: Optional[int],
+        api_url: Optional[str],
+        wiki_id: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        Run one mwassistant-check-access request and return its raw access map.
+        """
         params = {
             "action": "mwassistant-check-access",
-            "titles": "|".join(titles),
+            "titles": "|".join(titles),  # Join titles with pipe as MW API convention
             "username": username,
             "format": "json",
             "formatversion": 2,  # Use formatversion=2 for proper JSON boolean serialization
         }
-        
+
         if user_id:
             params["user_id"] = user_id
 
@@ -719,15 +779,4 @@ class MediaWikiClient:
 
         # The result is nested under 'mwassistant-check-access' key
         result = data.get("mwassistant-check-access", {})
-        access_map = result.get("access", {})
-
-        # With formatversion=2, MW returns actual JSON booleans
-        # Also handle legacy string format ('true'/'false') for backward compatibility
-        def to_bool(val):
-            if isinstance(val, bool):
-                return val
-            if isinstance(val, str):
-                return val.lower() == "true"
-            return False
-
-        return {title: to_bool(access_map.get(title, False)) for title in titles}
+        return result.get("access", {})
@@ -12,6 +12,7 @@ import os
 from unittest.mock import patch
 from fastapi import HTTPException
 
+from mw_mcp_server.auth import security as security_module
 from mw_mcp_server.auth.security import verify_mw_to_mcp_jwt, require_scopes
 from mw_mcp_server.auth.jwt_utils import create_mcp_to_mw_jwt
 
@@ -87,7 +88,9 @@ def mock_settings():
             )
         }
         mock.jwt_algo = TEST_JWT_ALGO
+        security_module._verified_token_cache.clear()
         yield mock
+        security_module._verified_token_cache.clear()
 
 
 @pytest.fixture
@@ -164,6 +167,32 @@ class TestJWTVerification:
         assert "invalid" in excinfo.value.detail.lower() or "malformed" in excinfo.value.detail.lower()
 
 
+    def test_verified_token_is_cached(self, mock_settings):
+        """A second request with the same token should skip re-verification."""
+        token = create_valid_token()
+        first = verify_mw_to_mcp_jwt(MockCredentials(token))
+
+        with patch.object(security_module, "_decode_mw_token") as decode:
+            second = verify_mw_to_mcp_jwt(MockCredentials(token))
+
+        decode.assert_not_called()
+        assert second == first
+
+    def test_expired_cache_entry_is_reverified(self, mock_settings):
+        """A cached entry past its expiry must not be served."""
+        token = create_valid_token()
+        user = verify_mw_to_mcp_jwt(MockCredentials(token))
+        key = security_module._token_cache_key(token)
+        security_module._verified_token_cache[key] = (time.time() - 1, user)
+
+        with patch.object(
+            security_module, "_decode_mw_token", side_effect=jwt.ExpiredSignatureError
+        ):
+            with pytest.raises(HTTPException) as excinfo:
+                verify_mw_to_mcp_jwt(MockCredentials(token))
+        assert excinfo.value.status_code == 401
+
+
 class TestScopeEnforcement:
     """Tests for scope-based access control."""
 
@@ -193,6 +222,11 @@ class TestScopeEnforcement:
         assert result.username == "TestUser"
         assert "search" in result.scopes
 
+    def test_require_scopes_reuses_dependency_per_scope_set(self):
+        """Identical scope requirements share one dependency callable."""
+        assert require_scopes("search") is require_scopes("search")
+        assert require_scopes("search") is not require_scopes("smw_query")
+
 
 class TestMCPToMWJWT:
     """Tests for MCP server issuing JWTs to MediaWiki."""
@@ -213,3 +247,16 @@ class TestMCPToMWJWT:
         assert payload["aud"] == "MWAssistant"
         assert "page_read" in payload["scope"]
         assert payload["exp"] > payload["iat"]
+
+    def test_mcp_to_mw_jwt_reused_until_half_ttl(self, mock_jwt_utils_settings):
+        """Tokens are reused while at least half their TTL remains."""
+        from mw_mcp_server.auth import jwt_utils
+
+        jwt_utils._token_cache.clear()
+        with patch.object(jwt_utils, "_get_current_timestamp", return_value=1_000):
+            first = create_mcp_to_mw_jwt(scopes=["page_read"], wiki_id="test-wiki")
+            assert create_mcp_to_mw_jwt(scopes=["page_read"], wiki_id="test-wiki") == first
+            assert create_mcp_to_mw_jwt(scopes=["smw_query"], wiki_id="test-wiki") != first
+
+        with patch.object(jwt_utils, "_get_current_timestamp", return_value=1_015):
+            assert create_mcp_to_mw_jwt(scopes=["page_read"], wiki_id="test-wiki") != first
@@ -0,0 +1,581 @@
+"""
+Chat Route Helper Tests
+
+Tests for the helpers behind the /chat endpoints that don't need a database.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mw_mcp_server.api import chat_routes
+
+
+@pytest.fixture(autouse=True)
+def _clear_schema_cache():
+    chat_routes._schema_cache.clear()
+    chat_routes._schema_cache_locks.clear()
+    yield
+    chat_routes._schema_cache.clear()
+    chat_routes._schema_cache_locks.clear()
+
+
+def _make_vector_store():
+    store = MagicMock()
+
+    async def slow_pages(wiki_id, namespace):
+        await asyncio.sleep(0)
+        return ["Category:A"] if namespace == chat_routes.NS_CATEGORY else ["Property:P"]
+
+    store.get_embedding_last_modified = AsyncMock(return_value=None)
+    store.get_pages_by_namespace = AsyncMock(side_effect=slow_pages)
+    return store
+
+
+@pytest.mark.asyncio
+async def test_schema_context_concurrent_misses_query_once():
+    store = _make_vector_store()
+
+    results = await asyncio.gather(
+        *(chat_routes._get_schema_context(store, "wiki", None) for _ in range(5))
+    )
+
+    assert len(set(results)) == 1
+    assert store.get_embedding_last_modified.await_count == 1
+    assert store.get_pages_by_namespace.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_schema_context_shared_across_namespace_sets():
+    """Users whose namespaces differ only outside 14/102 share one entry."""
+    store = _make_vector_store()
+
+    first = await chat_routes._get_schema_context(store, "wiki", [0, 14, 102])
+    second = await chat_routes._get_schema_context(store, "wiki", [0, 2, 14, 102])
+
+    assert first == second
+    assert store.get_embedding_last_modified.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_schema_context_hides_properties_without_access():
+    store = _make_vector_store()
+
+    rendered = await chat_routes._get_schema_context(store, "wiki", [0, 14])
+
+    assert "Category:A" in rendered
+    assert "Property:P" not in rendered
+
+
+def test_new_session_has_id_without_flush():
+    from mw_mcp_server.auth.models import UserContext
+
+    db = MagicMock()
+    db.flush = AsyncMock()
+    user = UserContext(username="U", user_id=1, wiki_id="wiki", client_id="MWAssistant")
+
+    chat_session = chat_routes._new_chat_session(db, user)
+
+    assert chat_session.session_id is not None
+    db.add.assert_called_once_with(chat_session)
+    db.flush.assert_not_awaited()
+
+
+def test_persist_turn_stages_all_rows_in_one_batch():
+    from mw_mcp_server.api.models import ChatMessage as ChatMessageModel
+    from mw_mcp_server.db import ChatSession
+
+    db = MagicMock()
+    chat_session = ChatSession(wiki_id="wiki", owner_user_id=1)
+    messages = [ChatMessageModel(role="user", content="x" * 120)]
+
+    chat_routes._persist_turn(db, chat_session, messages, "answer", {"tokens": {}})
+
+    rows = db.add_all.call_args.args[0]
+    assert [r.sender for r in rows] == ["user", "assistant"]
+    assert [r.wiki_id for r in rows] == ["wiki", "wiki"]
+    assert rows[1].metadata_ == {"tokens": {}}
+    assert chat_session.title == "x" * 100 + "..."
+
+
+def _tool_call(call_id, name, args):
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": args}}
+
+
+@pytest.mark.asyncio
+async def test_tool_loop_runs_calls_concurrently_and_keeps_order(monkeypatch):
+    from mw_mcp_server.llm.client import ChatResult, TokenUsage
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_dispatch(name, args, user, vector_store=None, embedder=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"echo": args["q"]}
+
+    monkeypatch.setattr(chat_routes, "dispatch_tool_call", fake_dispatch)
+
+    usage = TokenUsage(1, 1, 2)
+    llm = MagicMock()
+    llm.chat = AsyncMock(
+        side_effect=[
+            ChatResult(
+                message={
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        _tool_call("c1", "t", '{"q": 1}'),
+                        _tool_call("c2", "t", "not json"),
+                        _tool_call("c3", "t", '{"q": 3}'),
+                    ],
+                },
+                usage=usage,
+            ),
+            ChatResult(message={"role": "assistant", "content": "done"}, usage=usage),
+        ]
+    )
+
+    answer, log, prompt_tokens, _ = await chat_routes._run_tool_loop(
+        llm=llm,
+        user=MagicMock(),
+        vector_store=MagicMock(),
+        embedder=MagicMock(),
+        system_prompt="sys",
+        messages=[{"role": "user", "content": "hi"}],
+    )
+
+    assert answer == "done"
+    assert max_in_flight == 2
+    assert [entry["result"] for entry in log] == [
+        {"echo": 1},
+        {"error": "Invalid JSON arguments for tool call."},
+        {"echo": 3},
+    ]
+    messages = llm.chat.await_args_list[1].args[1]
+    assert [m["tool_call_id"] for m in messages if m["role"] == "tool"] == ["c1", "c2", "c3"]
+    assert prompt_tokens == 2
+
+
+@pytest.mark.asyncio
+async def test_serialized_vector_store_runs_one_query_at_a_time():
+    active = 0
+    max_active = 0
+
+    async def query(*args):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0)
+        active -= 1
+        return args
+
+    inner = MagicMock()
+    inner.search = AsyncMock(side_effect=query)
+    store = chat_routes._SerializedVectorStore(inner)
+
+    results = await asyncio.gather(store.search(1), store.search(2))
+
+    assert results == [(1,), (2,)]
+    assert max_active == 1
+
+
+def test_compose_system_prompt_reuses_prompt_object():
+    from mw_mcp_server.prompts import CHAT_SYSTEM_PROMPT, EDITOR_SYSTEM_PROMPT
+
+    schema = "\n[SCHEMA]\n"
+    first = chat_routes._compose_system_prompt("chat", schema)
+
+    assert first == CHAT_SYSTEM_PROMPT + schema
+    assert chat_routes._compose_system_prompt("chat", schema) is first
+    assert chat_routes._compose_system_prompt("editor", schema) == EDITOR_SYSTEM_PROMPT + schema
+
+
+def test_append_tool_result_is_compact_utf8_with_str_fallback():
+    from datetime import date
+
+    messages = []
+    chat_routes._append_tool_result(
+        messages, "c1", {"title": "Zürich", 1: date(2024, 1, 2), "obj": object}
+    )
+
+    content = messages[0]["content"]
+    assert content.startswith('{"title":"Zürich","1":"2024-01-02","obj":"<class')
+    assert messages[0]["tool_call_id"] == "c1"
+
+
+def test_sse_frame_format():
+    frame = chat_routes._sse("done", {"final_content": "é"})
+    assert frame == 'event: done\ndata: {"final_content":"é"}\n\n'.encode("utf-8")
+
+
+def test_drop_replayed_messages_trims_history_overlap():
+    from mw_mcp_server.api.models import ChatMessage as ChatMessageModel
+
+    history = [
+        {"role": "user", "content": "hi"},
+        {"role": "assistant", "content": "hello"},
+    ]
+    replay = [
+        ChatMessageModel(role="user", content="hi"),
+        ChatMessageModel(role="assistant", content="hello"),
+        ChatMessageModel(role="user", content="hi"),
+    ]
+
+    assert chat_routes._drop_replayed_messages(history, replay) == replay[2:]
+    assert chat_routes._drop_replayed_messages(history, replay[2:]) == replay[2:]
+
+
+def test_new_turn_messages_rejects_pure_replay():
+    from fastapi import HTTPException
+
+    from mw_mcp_server.api.models import ChatMessage as ChatMessageModel
+
+    history = [
+        {"role": "user", "content": "hi"},
+        {"role": "assistant", "content": "hello"},
+    ]
+    replay = [
+        ChatMessageModel(role="user", content="hi"),
+        ChatMessageModel(role="assistant", content="hello"),
+    ]
+
+    with pytest.raises(HTTPException) as exc_info:
+        chat_routes._new_turn_messages(history, replay)
+    assert exc_info.value.status_code == 400
+
+
+def test_persist_turn_never_stores_empty_answer():
+    from mw_mcp_server.db import ChatSession
+
+    db = MagicMock()
+    chat_session = ChatSession(wiki_id="wiki", owner_user_id=1, title="t")
+
+    chat_routes._persist_turn(db, chat_session, [], "", {})
+
+    rows = db.add_all.call_args.args[0]
+    assert rows[0].content == chat_routes._EMPTY_ANSWER_FALLBACK
+
+
+@pytest.mark.asyncio
+async def test_stream_tool_calls_reports_as_completed_and_returns_in_order(monkeypatch):
+    import orjson
+
+    async def fake_dispatch(name, args, user, vector_store=None, embedder=None):
+        await asyncio.sleep(args["delay"])
+        return {"echo": args["delay"]}
+
+    monkeypatch.setattr(chat_routes, "dispatch_tool_call", fake_dispatch)
+
+    calls = [
+        _tool_call("slow", "t", '{"delay": 0.02}'),
+        _tool_call("bad", "t", "[]"),
+        _tool_call("fast", "t", '{"delay": 0}'),
+    ]
+    outputs = []
+    frames = [
+        frame
+        async for frame in chat_routes._stream_tool_calls(
+            calls, MagicMock(), MagicMock(), MagicMock(), 0, outputs, chat_routes._ToolCallMemo()
+        )
+    ]
+
+    events = [(f.split(b"\n")[0], orjson.loads(f.split(b"data: ")[1])) for f in frames]
+    assert [e for e, _ in events[:3]] == [b"event: tool_start"] * 3
+    assert [d["call_id"] for _, d in events[3:]] == ["bad", "fast", "slow"]
+    assert outputs == [
+        {"echo": 0.02},
+        {"error": "Tool arguments must be a JSON object."},
+        {"echo": 0},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_load_history_selects_only_role_and_content():
+    from uuid import uuid4
+
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=[("user", "hi"), ("assistant", "hello")])
+
+    history = await chat_routes._load_history(db, uuid4())
+
+    assert history == [
+        {"role": "user", "content": "hi"},
+        {"role": "assistant", "content": "hello"},
+    ]
+    sql = str(db.execute.await_args.args[0])
+    assert "chat_message.metadata" not in sql
+    assert "ORDER BY chat_message.created_at, chat_message.message_id" in sql
+
+
+@pytest.mark.asyncio
+async def test_tool_loop_wrap_up_keeps_tools_but_disables_them(monkeypatch):
+    from mw_mcp_server.llm.client import ChatResult, TokenUsage
+
+    async def fake_dispatch(name, args, user, vector_store=None, embedder=None):
+        return {"ok": True}
+
+    monkeypatch.setattr(chat_routes, "dispatch_tool_call", fake_dispatch)
+    monkeypatch.setattr(chat_routes.settings, "max_tool_loops", 1)
+
+    usage = TokenUsage(1, 1, 2)
+    llm = MagicMock()
+    llm.chat = AsyncMock(
+        side_effect=[
+            ChatResult(
+                message={
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [_tool_call("c1", "t", "{}")],
+                },
+                usage=usage,
+            ),
+            ChatResult(message={"role": "assistant", "content": "summary"}, usage=usage),
+        ]
+    )
+
+    answer, _, _, _ = await chat_routes._run_tool_loop(
+        llm=llm,
+        user=MagicMock(),
+        vector_store=MagicMock(),
+        embedder=MagicMock(),
+        system_prompt="sys",
+        messages=[{"role": "user", "content": "hi"}],
+    )
+
+    assert answer == "summary"
+    wrap_up = llm.chat.await_args_list[1].kwargs
+    assert wrap_up["tools"] is chat_routes.TOOL_DEFINITIONS
+    assert wrap_up["tool_choice"] == "none"
+
+
+@pytest.mark.asyncio
+async def test_tool_loop_stops_calling_tools_once_token_budget_is_spent(monkeypatch):
+    from mw_mcp_server.llm.client import ChatResult, TokenUsage
+
+    async def fake_dispatch(name, args, user, vector_store=None, embedder=None):
+        return {"ok": True}
+
+    monkeypatch.setattr(chat_routes, "dispatch_tool_call", fake_dispatch)
+    monkeypatch.setattr(chat_routes.settings, "max_tool_loops", 10)
+    monkeypatch.setattr(chat_routes.settings, "tool_loop_token_budget", 1_000)
+
+    llm = MagicMock()
+    llm.chat = AsyncMock(
+        side_effect=[
+            ChatResult(
+                message={
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [_tool_call("c1", "t", "{}")],
+                },
+                usage=TokenUsage(900, 200, 1_100),
+            ),
+            ChatResult(
+                message={"role": "assistant", "content": "summary"},
+                usage=TokenUsage(1_000, 10, 1_010),
+            ),
+        ]
+    )
+
+    answer, tool_log, prompt_tokens, _ = await chat_routes._run_tool_loop(
+        llm=llm,
+        user=MagicMock(),
+        vector_store=MagicMock(),
+        embedder=MagicMock(),
+        system_prompt="sys",
+        messages=[{"role": "user", "content": "hi"}],
+    )
+
+    assert answer == "summary"
+    assert len(tool_log) == 1
+    assert prompt_tokens == 1_900
+    assert llm.chat.await_count == 2
+    assert llm.chat.await_args_list[1].kwargs["tool_choice"] == "none"
+
+
+@pytest.mark.asyncio
+async def test_tool_call_memo_reuses_identical_calls_and_retries_failures(monkeypatch):
+    calls = []
+
+    async def fake_dispatch(name, args, user, vector_store=None, embedder=None):
+        calls.append((name, args))
+        await asyncio.sleep(0)
+        if name == "broken":
+            raise RuntimeError("boom")
+        return {"title": args["title"]}
+
+    monkeypatch.setattr(chat_routes, "dispatch_tool_call", fake_dispatch)
+    memo = chat_routes._ToolCallMemo()
+
+    def run(name, args):
+        return memo.run(name, args, MagicMock(), MagicMock(), MagicMock())
+
+    first, second = await asyncio.gather(
+        run("mw_get_page", {"title": "A", "section": 1}),
+        run("mw_get_page", {"section": 1, "title": "A"}),
+    )
+    await run("broken", {})
+    await run("broken", {})
+
+    assert first == second == ({"title": "A"}, True)
+    assert [name for name, _ in calls] == ["mw_get_page", "broken", "broken"]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_chat_shares_result_and_errors():
+    runs = 0
+
+    async def run():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.01)
+        return "response"
+
+    results = await asyncio.gather(*(chat_routes._single_flight_chat(b"k", run) for _ in range(3)))
+
+    assert results == ["response"] * 3
+    assert runs == 1
+    assert chat_routes._inflight_chats == {}
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("llm down")
+
+    outcomes = await asyncio.gather(
+        chat_routes._single_flight_chat(b"k", fail),
+        chat_routes._single_flight_chat(b"k", fail),
+        return_exceptions=True,
+    )
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_chat_leader_cancellation_fails_followers_with_503():
+    from fastapi import HTTPException
+
+    started = asyncio.Event()
+
+    async def run():
+        started.set()
+        await asyncio.sleep(10)
+        return "response"
+
+    leader = asyncio.create_task(chat_routes._single_flight_chat(b"k", run))
+    await started.wait()
+    follower = asyncio.create_task(chat_routes._single_flight_chat(b"k", run))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    with pytest.raises(HTTPException) as exc_info:
+        await follower
+    assert exc_info.value.status_code == 503
+    assert chat_routes._inflight_chats == {}
+
+
+def test_inflight_chat_key_is_per_user():
+    from mw_mcp_server.api.models import ChatRequest
+    from mw_mcp_server.auth.models import UserContext
+
+    req = ChatRequest(messages=[{"role": "user", "content": "hi"}])
+    alice = UserContext(username="A", user_id=1, wiki_id="wiki", client_id="MWAssistant")
+    bob = UserContext(username="B", user_id=2, wiki_id="wiki", client_id="MWAssistant")
+
+    assert chat_routes._inflight_chat_key(alice, req) == chat_routes._inflight_chat_key(alice, req)
+    assert chat_routes._inflight_chat_key(alice, req) != chat_routes._inflight_chat_key(bob, req)
+
+
+@pytest.mark.asyncio
+async def test_load_history_shares_role_strings():
+    from uuid import uuid4
+
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=[("".join(["us", "er"]), "hi")])
+
+    history = await chat_routes._load_history(db, uuid4())
+
+    assert history[0]["role"] is chat_routes._CANONICAL_ROLES["user"]
+
+
+def _usage_session_factory(monkeypatch, limiter):
+    class FakeSession:
+        commit = AsyncMock()
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(chat_routes, "AsyncSessionLocal", FakeSession)
+    monkeypatch.setattr(chat_routes, "RateLimiter", lambda session: limiter)
+    return FakeSession
+
+
+@pytest.mark.asyncio
+async def test_record_usage_after_response_commits_its_own_session(monkeypatch):
+    from mw_mcp_server.auth.models import UserContext
+
+    limiter = MagicMock()
+    limiter.record_usage = AsyncMock(return_value="status")
+    session_cls = _usage_session_factory(monkeypatch, limiter)
+    user = UserContext(username="U", user_id=1, wiki_id="wiki", client_id="MWAssistant")
+
+    await chat_routes._record_usage_after_response(user, 10, 5)
+
+    limiter.record_usage.assert_awaited_once_with(
+        wiki_id="wiki", user_id=1, prompt_tokens=10, completion_tokens=5
+    )
+    session_cls.commit.assert_awaited_once()
+    limiter.remember_usage.assert_called_once_with("wiki", 1, "status")
+
+
+@pytest.mark.asyncio
+async def test_record_usage_after_response_logs_failures(monkeypatch):
+    from mw_mcp_server.auth.models import UserContext
+
+    limiter = MagicMock()
+    limiter.record_usage = AsyncMock(side_effect=RuntimeError("db down"))
+    session_cls = _usage_session_factory(monkeypatch, limiter)
+    user = UserContext(username="U", user_id=1, wiki_id="wiki", client_id="MWAssistant")
+
+    await chat_routes._record_usage_after_response(user, 10, 5)
+
+    session_cls.commit.assert_not_awaited()
+    limiter.remember_usage.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_chat_turn_commits_before_scheduling_usage(monkeypatch):
+    from mw_mcp_server.api.models import ChatRequest
+    from mw_mcp_server.auth.models import UserContext
+
+    events = []
+
+    async def fake_tool_loop(**kwargs):
+        return "answer", [], 10, 5
+
+    async def fake_schema_context(*args, **kwargs):
+        return ""
+
+    monkeypatch.setattr(chat_routes, "_run_tool_loop", fake_tool_loop)
+    monkeypatch.setattr(chat_routes, "_get_schema_context", fake_schema_context)
+
+    db = MagicMock()
+    db.commit = AsyncMock(side_effect=lambda: events.append("commit"))
+    background_tasks = MagicMock()
+    background_tasks.add_task.side_effect = lambda func, *args: events.append(func.__name__)
+    req = ChatRequest(messages=[{"role": "user", "content": "hi"}])
+    user = UserContext(username="U", user_id=1, wiki_id="wiki", client_id="MWAssistant")
+
+    await chat_routes._chat_turn(
+        req, user, MagicMock(), MagicMock(), MagicMock(), db, background_tasks
+    )
+
+    assert events == ["commit", "_record_usage_after_response"]
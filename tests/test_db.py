@@ -31,6 +31,13 @@ class TestChatSessionModels:
         assert session.title is None
         assert session.summary is None
 
+    def test_session_delete_cascades_in_database(self):
+        """Deleting a session must not load its messages through the ORM."""
+        rel = ChatSession.messages.property
+        assert rel.passive_deletes is True
+        fk = next(iter(ChatMessage.__table__.c.session_id.foreign_keys))
+        assert fk.ondelete == "CASCADE"
+
     def test_chat_message_creation(self):
         """Verify ChatMessage creates with required fields."""
         session_id = uuid4()
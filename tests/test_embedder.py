@@ -0,0 +1,157 @@
+"""
+Embedder Tests
+
+Tests for batch fan-out, ordering and retry behaviour of the embedding client.
+"""
+
+import base64
+import json
+import struct
+
+import httpx
+import pytest
+
+from mw_mcp_server.embeddings.embedder import Embedder, EmbeddingError
+
+
+def _make_embedder(handler) -> Embedder:
+    embedder = Embedder(
+        api_key="sk-test",
+        model="test-model",
+        max_concurrency=4,
+        backoff_base=0.0,
+    )
+    embedder._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return embedder
+
+
+def _echo_handler(request: httpx.Request) -> httpx.Response:
+    """Return one embedding per input, encoding the input index in the vector."""
+    inputs = json.loads(request.content)["input"]
+    data = [{"embedding": [float(text.split("-")[1]), 0.0]} for text in inputs]
+    return httpx.Response(200, json={"data": data})
+
+
+@pytest.mark.asyncio
+async def test_embed_preserves_input_order_across_batches():
+    embedder = _make_embedder(_echo_handler)
+    texts = [f"t-{i}" for i in range(45)]
+
+    vectors = await embedder.embed(texts, batch_size=10)
+
+    assert [v[0] for v in vectors] == [float(i) for i in range(45)]
+
+
+@pytest.mark.asyncio
+async def test_embed_retries_rate_limited_batch():
+    attempts = {"count": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts["count"] += 1
+        if attempts["count"] == 1:
+            return httpx.Response(429, json={"error": "rate limited"})
+        return _echo_handler(request)
+
+    embedder = _make_embedder(handler)
+
+    vectors = await embedder.embed(["t-0", "t-1"])
+
+    assert len(vectors) == 2
+    assert attempts["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_embed_does_not_retry_client_errors():
+    attempts = {"count": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts["count"] += 1
+        return httpx.Response(400, json={"error": "bad request"})
+
+    embedder = _make_embedder(handler)
+
+    with pytest.raises(EmbeddingError):
+        await embedder.embed(["t-0"])
+    assert attempts["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_embed_requests_and_decodes_base64_float32():
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["payload"] = json.loads(request.content)
+        packed = base64.b64encode(struct.pack("<3f", 0.5, -1.0, 2.25)).decode()
+        return httpx.Response(200, json={"data": [{"embedding": packed}]})
+
+    embedder = _make_embedder(handler)
+
+    vectors = await embedder.embed(["t-0"])
+
+    assert seen["payload"]["encoding_format"] == "base64"
+    assert vectors == [[0.5, -1.0, 2.25]]
+
+
+def test_extract_embeddings_rejects_truncated_base64():
+    packed = base64.b64encode(b"\x00\x00\x80").decode()
+    with pytest.raises(EmbeddingError):
+        Embedder._extract_embeddings({"data": [{"embedding": packed}]})
+
+
+@pytest.mark.asyncio
+async def test_embed_rejects_non_json_response():
+    embedder = _make_embedder(lambda request: httpx.Response(200, content=b"<html>"))
+
+    with pytest.raises(EmbeddingError):
+        await embedder.embed(["t-0"])
+
+
+@pytest.mark.asyncio
+async def test_embed_groups_texts_by_length_within_char_budget():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content)["input"])
+        return _echo_handler(request)
+
+    embedder = _make_embedder(handler)
+    texts = ["t-0-" + "x" * 90, "t-1", "t-2-" + "x" * 90, "t-3"]
+
+    vectors = await embedder.embed(texts, max_batch_chars=99)
+
+    assert [v[0] for v in vectors] == [0.0, 1.0, 2.0, 3.0]
+    assert sorted(map(sorted, requests)) == [["t-0-" + "x" * 90], ["t-1", "t-3"], ["t-2-" + "x" * 90]]
+
+
+@pytest.mark.asyncio
+async def test_embed_query_reuses_cached_vector():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content)["input"])
+        return _echo_handler(request)
+
+    embedder = _make_embedder(handler)
+
+    first = await embedder.embed_query("t-7")
+    second = await embedder.embed_query("t-7")
+
+    assert first == second == [7.0, 0.0]
+    assert requests == [["t-7"]]
+
+
+@pytest.mark.asyncio
+async def test_embed_queries_sends_only_uncached_queries_in_one_request():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content)["input"])
+        return _echo_handler(request)
+
+    embedder = _make_embedder(handler)
+    await embedder.embed_query("t-1")
+
+    vectors = await embedder.embed_queries(["t-2", "t-1", "t-3", "t-2"])
+
+    assert [v[0] for v in vectors] == [2.0, 1.0, 3.0, 2.0]
+    assert requests == [["t-1"], ["t-2", "t-3"]]
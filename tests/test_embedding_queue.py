@@ -55,3 +55,144 @@ async def test_get_next_job_returns_fifo():
     assert first.title == "A"
     second = await q.get_next_job()
     assert second.title == "B"
+
+
+@pytest.mark.asyncio
+async def test_enqueue_coalesces_pending_jobs_for_same_page():
+    """A newer job for a still-queued page replaces it in place."""
+    q = EmbeddingQueue(maxsize=10)
+    await q.enqueue(_make_job("A"))
+    await q.enqueue(_make_job("B"))
+    newer = _make_job("A")
+    newer.content = "newer content"
+
+    size = await q.enqueue(newer)
+
+    assert size == 2
+    first = await q.get_next_job()
+    assert first is newer
+    assert (await q.get_next_job()).title == "B"
+
+
+@pytest.mark.asyncio
+async def test_page_lock_serializes_same_page_and_cleans_up():
+    """Jobs for the same page must not overlap; lock entries are released."""
+    import asyncio
+
+    from mw_mcp_server.embeddings import queue as queue_module
+
+    active = 0
+    max_active = 0
+
+    async def work():
+        nonlocal active, max_active
+        async with queue_module._page_lock("test", "Page1"):
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0)
+            active -= 1
+
+    await asyncio.gather(work(), work(), work())
+
+    assert max_active == 1
+    assert queue_module._page_locks == {}
+    assert queue_module._page_lock_users == {}
+
+
+@pytest.mark.asyncio
+async def test_embed_unique_sends_duplicate_chunks_once():
+    from unittest.mock import AsyncMock, MagicMock
+
+    from mw_mcp_server.embeddings import queue as queue_module
+
+    embedder = MagicMock()
+    embedder.embed = AsyncMock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+
+    vectors = await queue_module._embed_unique(embedder, ["nav", "body text", "nav"])
+
+    embedder.embed.assert_awaited_once_with(["nav", "body text"])
+    assert vectors == [[3.0], [9.0], [3.0]]
+
+
+@pytest.mark.asyncio
+async def test_batcher_merges_concurrent_calls_into_one_request():
+    import asyncio
+    from unittest.mock import AsyncMock, MagicMock
+
+    from mw_mcp_server.embeddings.batcher import EmbeddingBatcher
+
+    embedder = MagicMock()
+    embedder.embed = AsyncMock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+    batcher = EmbeddingBatcher(embedder, max_texts=10, max_wait=0.01)
+
+    first, second = await asyncio.gather(
+        batcher.embed(["a", "bb"]),
+        batcher.embed(["ccc"]),
+    )
+
+    assert first == [[1.0], [2.0]]
+    assert second == [[3.0]]
+    embedder.embed.assert_awaited_once_with(["a", "bb", "ccc"])
+
+
+@pytest.mark.asyncio
+async def test_batcher_propagates_errors_to_every_caller():
+    import asyncio
+    from unittest.mock import AsyncMock, MagicMock
+
+    from mw_mcp_server.embeddings.batcher import EmbeddingBatcher
+    from mw_mcp_server.embeddings.embedder import EmbeddingError
+
+    embedder = MagicMock()
+    embedder.embed = AsyncMock(side_effect=EmbeddingError("boom"))
+    batcher = EmbeddingBatcher(embedder, max_texts=2, max_wait=1.0)
+
+    results = await asyncio.gather(
+        batcher.embed(["a"]),
+        batcher.embed(["b"]),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, EmbeddingError) for r in results)
+    embedder.embed.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_embed_changed_chunks_reuses_stored_vectors():
+    from unittest.mock import AsyncMock, MagicMock
+
+    from mw_mcp_server.embeddings import queue as queue_module
+
+    embedder = MagicMock()
+    embedder.embed = AsyncMock(return_value=[[2.0]])
+
+    vectors = await queue_module._embed_changed_chunks(
+        embedder,
+        ["kept", "edited", "kept"],
+        ["sha-kept", "sha-edited", "sha-kept"],
+        {"sha-kept": [1.0]},
+    )
+
+    assert vectors == [[1.0], [2.0], [1.0]]
+    embedder.embed.assert_awaited_once_with(["edited"])
+
+
+@pytest.mark.asyncio
+async def test_batcher_sends_text_shared_by_callers_once():
+    import asyncio
+    from unittest.mock import AsyncMock, MagicMock
+
+    from mw_mcp_server.embeddings.batcher import EmbeddingBatcher
+
+    embedder = MagicMock()
+    embedder.embed = AsyncMock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+    batcher = EmbeddingBatcher(embedder, max_texts=10, max_wait=0.01)
+
+    first, second = await asyncio.gather(
+        batcher.embed(["nav", "a"]),
+        batcher.embed(["nav", "bb"]),
+    )
+
+    assert first == [[3.0], [1.0]]
+    assert second == [[3.0], [2.0]]
+    embedder.embed.assert_awaited_once_with(["nav", "a", "bb"])
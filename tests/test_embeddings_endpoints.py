@@ -7,7 +7,10 @@ import time
 import contextlib
 
 from mw_mcp_server.main import app
+from mw_mcp_server.api import embedding_routes
 from mw_mcp_server.api.dependencies import get_vector_store, get_embedder
+from mw_mcp_server.api.models import MAX_PAGE_CONTENT_CHARS
+from mw_mcp_server.config import settings
 from mw_mcp_server.db import VectorStore
 from mw_mcp_server.embeddings.embedder import Embedder
 
@@ -64,6 +67,7 @@ def mock_embedder():
 
 @pytest.fixture
 def client(mock_vectors, mock_embedder):
+    embedding_routes._stats_cache.clear()
     app.dependency_overrides[get_vector_store] = lambda: mock_vectors
     app.dependency_overrides[get_embedder] = lambda: mock_embedder
     
@@ -103,6 +107,18 @@ def test_get_stats(client, mock_settings, mock_vectors):
     assert resp.json()["total_vectors"] == 100
     mock_vectors.get_stats.assert_awaited_once()
 
+def test_get_stats_is_cached_until_a_page_is_deleted(client, mock_settings, mock_vectors):
+    token = create_valid_token()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client.get("/embeddings/stats", headers=headers)
+    client.get("/embeddings/stats", headers=headers)
+    assert mock_vectors.get_stats.await_count == 1
+
+    client.request("DELETE", "/embeddings/page", json={"title": "Gone"}, headers=headers)
+    client.get("/embeddings/stats", headers=headers)
+    assert mock_vectors.get_stats.await_count == 2
+
 def test_update_page_embedding(client, mock_settings, mock_vectors, mock_embedder):
     token = create_valid_token()
     headers = {"Authorization": f"Bearer {token}"}
@@ -176,6 +192,61 @@ def test_update_page_embedding_rejects_invalid_rev_id(client, mock_settings):
     resp = client.post("/embeddings/page", json=payload, headers=headers)
     assert resp.status_code == 422
 
+def test_update_page_embedding_rejects_malformed_json(client, mock_settings):
+    token = create_valid_token()
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+
+    resp = client.post("/embeddings/page", content=b'{"title": "Test Page",', headers=headers)
+
+    assert resp.status_code == 422
+    assert resp.json()["detail"][0]["loc"][0] == "body"
+
+
+def test_update_page_embedding_rejects_content_over_page_limit(client, mock_settings):
+    token = create_valid_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    payload = {"title": "Test Page", "content": "x" * (MAX_PAGE_CONTENT_CHARS + 1)}
+
+    with patch("mw_mcp_server.embeddings.queue.embedding_queue.enqueue", new_callable=AsyncMock) as mock_enqueue:
+        resp = client.post("/embeddings/page", json=payload, headers=headers)
+
+    assert resp.status_code == 422
+    mock_enqueue.assert_not_called()
+
+
+def test_update_page_embedding_authenticates_before_validating_body(client, mock_settings):
+    headers = {"Content-Type": "application/json"}
+
+    resp = client.post("/embeddings/page", content=b'{"title": ', headers=headers)
+
+    assert resp.status_code == 401
+
+def test_oversized_request_body_rejected_before_parsing(client, mock_settings):
+    token = create_valid_token()
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    body = b" " * (settings.max_request_body_bytes + 1)
+
+    resp = client.post("/embeddings/page", content=body, headers=headers)
+
+    assert resp.status_code == 413
+    assert resp.json()["error"] == "request_too_large"
+    assert resp.headers["X-Request-ID"]
+
+
+def test_oversized_chunked_body_rejected_while_reading(client, mock_settings):
+    token = create_valid_token()
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    chunk = b" " * 1024
+    chunks = iter([chunk] * (settings.max_request_body_bytes // len(chunk) + 2))
+
+    with patch("mw_mcp_server.embeddings.queue.embedding_queue.enqueue", new_callable=AsyncMock) as mock_enqueue:
+        resp = client.post("/embeddings/page", content=chunks, headers=headers)
+
+    assert resp.status_code == 413
+    assert resp.json()["error"] == "request_too_large"
+    assert resp.headers["X-Request-ID"]
+    mock_enqueue.assert_not_called()
+
 def test_delete_page_embedding(client, mock_settings, mock_vectors):
     token = create_valid_token()
     headers = {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,133 @@
+"""
+LLM Client Tests
+
+Tests for request payloads and response assembly in the chat completions client.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from mw_mcp_server.llm.client import ChatResult, LLMClient, LLMTransportError
+
+
+def _make_client(handler) -> LLMClient:
+    client = LLMClient(api_key="sk-test", model="test-model")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def _sse_body(*chunks) -> bytes:
+    lines = [f"data: {json.dumps(c)}\n\n" for c in chunks]
+    lines.append("data: [DONE]\n\n")
+    return "".join(lines).encode()
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_yields_deltas_then_assembled_result():
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["payload"] = json.loads(request.content)
+        body = _sse_body(
+            {"choices": [{"delta": {"role": "assistant", "content": "Hel"}}]},
+            {"choices": [{"delta": {"content": "lo"}}]},
+            {"choices": [], "usage": {"prompt_tokens": 7, "completion_tokens": 2, "total_tokens": 9}},
+        )
+        return httpx.Response(200, content=body, headers={"content-type": "text/event-stream"})
+
+    client = _make_client(handler)
+
+    items = [item async for item in client.chat_stream("sys", [{"role": "user", "content": "hi"}])]
+
+    assert seen["payload"]["stream"] is True
+    assert seen["payload"]["stream_options"] == {"include_usage": True}
+    assert items[:2] == ["Hel", "lo"]
+    result = items[-1]
+    assert isinstance(result, ChatResult)
+    assert result.message == {"role": "assistant", "content": "Hello"}
+    assert result.usage.total_tokens == 9
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_assembles_fragmented_tool_calls():
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = _sse_body(
+            {"choices": [{"delta": {"tool_calls": [
+                {"index": 0, "id": "call_1", "type": "function",
+                 "function": {"name": "mw_get_page", "arguments": ""}},
+            ]}}]},
+            {"choices": [{"delta": {"tool_calls": [
+                {"index": 0, "function": {"arguments": '{"title": '}},
+            ]}}]},
+            {"choices": [{"delta": {"tool_calls": [
+                {"index": 0, "function": {"arguments": '"Main Page"}'}},
+            ]}}]},
+        )
+        return httpx.Response(200, content=body)
+
+    client = _make_client(handler)
+
+    items = [item async for item in client.chat_stream("sys", [])]
+
+    assert len(items) == 1
+    message = items[0].message
+    assert message["content"] is None
+    assert message["tool_calls"] == [
+        {
+            "id": "call_1",
+            "type": "function",
+            "function": {"name": "mw_get_page", "arguments": '{"title": "Main Page"}'},
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_wraps_http_errors():
+    client = _make_client(lambda request: httpx.Response(500))
+
+    with pytest.raises(LLMTransportError):
+        async for _ in client.chat_stream("sys", []):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_chat_sends_prompt_cache_key_only_when_given():
+    payloads = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payloads.append(json.loads(request.content))
+        return httpx.Response(
+            200, json={"choices": [{"message": {"role": "assistant", "content": "ok"}}]}
+        )
+
+    client = _make_client(handler)
+
+    await client.chat("sys", [], prompt_cache_key="mw-mcp:wiki:chat")
+    await client.chat("sys", [])
+
+    assert payloads[0]["prompt_cache_key"] == "mw-mcp:wiki:chat"
+    assert "prompt_cache_key" not in payloads[1]
+
+
+@pytest.mark.asyncio
+async def test_chat_sends_tools_encoded_once():
+    payloads = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payloads.append(json.loads(request.content))
+        return httpx.Response(
+            200, json={"choices": [{"message": {"role": "assistant", "content": "ok"}}]}
+        )
+
+    client = _make_client(handler)
+    tools = [{"type": "function", "function": {"name": "t", "parameters": {}}}]
+
+    await client.chat("sys", [], tools=tools)
+    encoded = client._encode_tools(tools)
+    await client.chat("sys", [], tools=tools)
+
+    assert payloads[0]["tools"] == tools
+    assert payloads[1] == payloads[0]
+    assert client._encode_tools(tools) is encoded
@@ -0,0 +1,53 @@
+"""
+MediaWiki Client Tests
+
+Tests for request batching in the MediaWiki API client.
+"""
+
+import httpx
+import pytest
+
+from mw_mcp_server.wiki import api_client as api_client_module
+from mw_mcp_server.wiki.api_client import CHECK_ACCESS_BATCH_SIZE, MediaWikiClient
+
+
+@pytest.fixture(autouse=True)
+def _stub_jwt(monkeypatch):
+    monkeypatch.setattr(api_client_module, "create_mcp_to_mw_jwt", lambda *a, **kw: "token")
+
+
+def _make_client(handler) -> MediaWikiClient:
+    client = MediaWikiClient(base_url="https://wiki.example/api.php", wiki_id="test")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_check_read_access_batches_titles():
+    batches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        titles = request.url.params["titles"].split("|")
+        batches.append(titles)
+        access = {t: (t != "Secret") for t in titles}
+        return httpx.Response(200, json={"mwassistant-check-access": {"access": access}})
+
+    client = _make_client(handler)
+    titles = [f"Page {i}" for i in range(CHECK_ACCESS_BATCH_SIZE + 10)] + ["Secret", "Page 0"]
+
+    access = await client.check_read_access(titles, "Alice")
+
+    assert sorted(len(b) for b in batches) == [11, CHECK_ACCESS_BATCH_SIZE]
+    assert access["Page 0"] is True
+    assert access["Secret"] is False
+    assert len(access) == CHECK_ACCESS_BATCH_SIZE + 11
+
+
+@pytest.mark.asyncio
+async def test_request_rejects_non_json_response():
+    from mw_mcp_server.wiki.api_client import MediaWikiResponseError
+
+    client = _make_client(lambda request: httpx.Response(200, content=b"<html>"))
+
+    with pytest.raises(MediaWikiResponseError):
+        await client.request({"action": "query"})
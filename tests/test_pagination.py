@@ -119,7 +119,7 @@ async def test_categories_prefix_mode_includes_truncation_metadata():
     vs.search.return_value = []
 
     emb = AsyncMock()
-    emb.embed.return_value = [[0.1, 0.2]]
+    emb.embed_query.return_value = [0.1, 0.2]
 
     out = await tool_get_categories(
         vector_store=vs,
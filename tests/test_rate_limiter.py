@@ -4,13 +4,23 @@ Rate Limiter Tests
 Tests for token-based rate limiting logic.
 """
 
+import time
+
 import pytest
 from datetime import date, datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from mw_mcp_server.db import rate_limiter as rate_limiter_module
 from mw_mcp_server.db.rate_limiter import RateLimiter
 
 
+@pytest.fixture(autouse=True)
+def _clear_usage_cache():
+    rate_limiter_module._usage_cache.clear()
+    yield
+    rate_limiter_module._usage_cache.clear()
+
+
 class FakeTokenUsage:
     """Minimal fake for TokenUsage rows returned by queries."""
     def __init__(self, total_tokens=0, request_count=0):
@@ -95,3 +105,80 @@ class TestRateLimiterCheckLimit:
             tzinfo=timezone.utc,
         )
         assert status.reset_time == expected_reset
+
+
+class TestRateLimiterUsageCache:
+    """Tests for the process-local usage cache in front of check_limit."""
+
+    @pytest.mark.asyncio
+    async def test_recent_check_is_served_from_cache(self):
+        session = AsyncMock()
+        result_mock = MagicMock()
+        result_mock.scalar_one_or_none.return_value = FakeTokenUsage(
+            total_tokens=10, request_count=1
+        )
+        session.execute = AsyncMock(return_value=result_mock)
+
+        with patch("mw_mcp_server.db.rate_limiter.settings") as mock_settings:
+            mock_settings.daily_token_limit = 100_000
+            limiter = RateLimiter(session)
+            await limiter.check_limit("wiki", 1)
+            status = await limiter.check_limit("wiki", 1)
+
+        assert session.execute.await_count == 1
+        assert status.tokens_used == 10
+
+    @pytest.mark.asyncio
+    async def test_record_usage_does_not_cache_uncommitted_totals(self):
+        key = ("wiki", 1, date.today())
+        rate_limiter_module._usage_cache[key] = (time.monotonic(), 10, 1)
+
+        session = AsyncMock()
+        upsert_result = MagicMock()
+        upsert_result.one.return_value = (100_000, 5)
+        session.execute = AsyncMock(return_value=upsert_result)
+
+        with patch("mw_mcp_server.db.rate_limiter.settings") as mock_settings:
+            mock_settings.daily_token_limit = 100_000
+            limiter = RateLimiter(session)
+            await limiter.record_usage("wiki", 1, prompt_tokens=10, completion_tokens=5)
+
+        assert key not in rate_limiter_module._usage_cache
+
+    @pytest.mark.asyncio
+    async def test_remember_usage_caches_committed_totals(self):
+        session = AsyncMock()
+        upsert_result = MagicMock()
+        upsert_result.one.return_value = (100_000, 5)
+        session.execute = AsyncMock(return_value=upsert_result)
+
+        with patch("mw_mcp_server.db.rate_limiter.settings") as mock_settings:
+            mock_settings.daily_token_limit = 100_000
+            limiter = RateLimiter(session)
+            recorded = await limiter.record_usage(
+                "wiki", 1, prompt_tokens=10, completion_tokens=5
+            )
+            limiter.remember_usage("wiki", 1, recorded)
+            status = await limiter.check_limit("wiki", 1)
+
+        assert session.execute.await_count == 1
+        assert status.is_limited is True
+
+    @pytest.mark.asyncio
+    async def test_stale_under_limit_entry_is_reread(self):
+        key = ("wiki", 1, date.today())
+        rate_limiter_module._usage_cache[key] = (float("-inf"), 10, 1)
+
+        session = AsyncMock()
+        result_mock = MagicMock()
+        result_mock.scalar_one_or_none.return_value = FakeTokenUsage(
+            total_tokens=500, request_count=3
+        )
+        session.execute = AsyncMock(return_value=result_mock)
+
+        with patch("mw_mcp_server.db.rate_limiter.settings") as mock_settings:
+            mock_settings.daily_token_limit = 100_000
+            status = await RateLimiter(session).check_limit("wiki", 1)
+
+        assert session.execute.await_count == 1
+        assert status.tokens_used == 500
@@ -25,7 +25,7 @@ def _make_vs(pages: list, search_results: list = ()):
 
 def _make_embedder(vector=None):
     emb = AsyncMock()
-    emb.embed.return_value = [vector or [0.1, 0.2, 0.3]]
+    emb.embed_query.return_value = vector or [0.1, 0.2, 0.3]
     return emb
 
 
@@ -78,8 +78,8 @@ async def test_categories_names_mode_emits_suggestions_for_missing():
     assert "Category:Researcher" in result["suggestions"]
     assert "Category:Organizational role" in result["suggestions"]
     # Vector search should have used the missing name as the query.
-    emb.embed.assert_awaited_once()
-    assert "LabMember" in emb.embed.call_args.args[0][0]
+    emb.embed_query.assert_awaited_once()
+    assert "LabMember" in emb.embed_query.call_args.args[0]
 
 
 @pytest.mark.asyncio
@@ -94,7 +94,7 @@ async def test_categories_names_mode_no_suggestions_when_all_found():
     assert result["found"] == ["Category:Person"]
     assert result["missing"] == []
     assert result["suggestions"] == []
-    emb.embed.assert_not_awaited()
+    emb.embed_query.assert_not_awaited()
 
 
 # ---------------------------------------------------------------------
@@ -134,7 +134,7 @@ async def test_categories_prefix_with_many_matches_skips_suggestions():
 
     assert len(result["matches"]) >= 3
     assert result["suggestions"] == []
-    emb.embed.assert_not_awaited()
+    emb.embed_query.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -147,7 +147,7 @@ async def test_categories_no_prefix_skips_suggestions():
     result = await _get_categories(vs, emb)
 
     assert result["suggestions"] == []
-    emb.embed.assert_not_awaited()
+    emb.embed_query.assert_not_awaited()
 
 
 # ---------------------------------------------------------------------
@@ -173,7 +173,7 @@ async def test_categories_namespace_locked_out():
     assert "not accessible" in result["note"]
     # No DB or embedder traffic when access is denied up front.
     vs.get_pages_by_namespace.assert_not_awaited()
-    emb.embed.assert_not_awaited()
+    emb.embed_query.assert_not_awaited()
 
 
 # ---------------------------------------------------------------------
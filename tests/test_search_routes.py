@@ -0,0 +1,69 @@
+"""
+Search Route Tests
+
+Tests for the semantic search endpoints: per-user result caching and
+batched searches.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from mw_mcp_server.api import search_routes
+from mw_mcp_server.api.models import SearchRequest, ToolSearchResult
+from mw_mcp_server.auth.models import UserContext
+
+
+@pytest.fixture(autouse=True)
+def clear_search_cache():
+    search_routes._search_cache.clear()
+    yield
+    search_routes._search_cache.clear()
+
+
+def _user(username: str) -> UserContext:
+    return UserContext(
+        username=username,
+        user_id=1,
+        wiki_id="wiki",
+        client_id="MWAssistant",
+        allowed_namespaces=[0],
+    )
+
+
+@pytest.mark.asyncio
+async def test_repeated_search_is_served_from_cache_per_user():
+    hits = [ToolSearchResult(title="Main Page", score=0.9)]
+    req = SearchRequest(query="lab safety", k=5)
+
+    with patch.object(search_routes, "vector_search", AsyncMock(return_value=hits)) as mock_search:
+        first = await search_routes.search(req, _user("A"), MagicMock(), MagicMock())
+        second = await search_routes.search(req, _user("A"), MagicMock(), MagicMock())
+        await search_routes.search(req, _user("B"), MagicMock(), MagicMock())
+
+    assert second is first
+    assert [r.title for r in first] == ["Main Page"]
+    assert mock_search.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_search_batch_checks_permissions_once_for_all_queries():
+    from mw_mcp_server.tools.search_tools import vector_search_batch
+
+    embedder = MagicMock()
+    embedder.embed_queries = AsyncMock(return_value=[[0.1], [0.2]])
+    vector_store = MagicMock()
+    vector_store.search_batch = AsyncMock(return_value=[
+        [("Secret", None, 0, 0.9), ("Main Page", None, 0, 0.8)],
+        [("Main Page", "s1", 0, 0.7)],
+    ])
+    client = MagicMock()
+    client.check_read_access = AsyncMock(return_value={"Main Page": True, "Secret": False})
+
+    batches = await vector_search_batch(
+        ["q1", "q2"], _user("A"), vector_store, embedder, k=5, client=client
+    )
+
+    assert [[r.title for r in results] for results in batches] == [["Main Page"], ["Main Page"]]
+    client.check_read_access.assert_awaited_once()
+    assert sorted(client.check_read_access.await_args.args[0]) == ["Main Page", "Secret"]
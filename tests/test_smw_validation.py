@@ -303,7 +303,7 @@ class TestSmwAskValidation:
 
 
 # ===================================================================
-# Concurrency — verify gather is used for both namespaces
+# Namespace fetches — only the namespaces the query needs
 # ===================================================================
 
 
@@ -3,6 +3,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from httpx import AsyncClient, ASGITransport
 
 from mw_mcp_server.main import app
+from mw_mcp_server.api import stats_routes
 from mw_mcp_server.db import get_async_session
 
 # Helper to create mock DB rows
@@ -18,6 +19,7 @@ def mock_db_session():
 
 @pytest.fixture
 def override_get_db(mock_db_session):
+    stats_routes._usage_cache.clear()
     async def _get_db():
         yield mock_db_session
     app.dependency_overrides[get_async_session] = _get_db
@@ -49,70 +51,33 @@ async def test_admin_dashboard_security(async_client):
 async def test_usage_aggregation_logic(async_client, mock_db_session):
     """Verify stats aggregation deals with DB results correctly."""
     
-    # Setup mocks for 4 queries: Token, Session, Message, Embedding
-    
-    # 1. Token Usage Result
-    # wiki_id, total_tokens, prompt_tokens, completion_tokens, request_count, active_users
-    token_rows = [
+    # One consolidated query returns a row per wiki with every metric
+    # already coalesced to 0.
+    rows = [
         MockRow(
-            wiki_id="wiki-1", 
-            total_tokens=1000, 
-            prompt_tokens=800, 
-            completion_tokens=200, 
-            request_count=10, 
-            active_users=5
+            wiki_id="wiki-1",
+            total_tokens=1000,
+            prompt_tokens=800,
+            completion_tokens=200,
+            request_count=10,
+            active_users=5,
+            session_count=3,
+            message_count=15,
+            embedding_count=50,
         ),
         MockRow(
-            wiki_id="wiki-2", 
-            total_tokens=500, 
-            prompt_tokens=400, 
-            completion_tokens=100, 
-            request_count=2, 
-            active_users=1
-        )
-    ]
-    
-    # 2. Session Count Result
-    # wiki_id, session_count
-    session_rows = [
-        MockRow(wiki_id="wiki-1", session_count=3),
-        MockRow(wiki_id="wiki-2", session_count=1)
-    ]
-    
-    # 3. Message Count Result
-    # wiki_id, message_count
-    message_rows = [
-        MockRow(wiki_id="wiki-1", message_count=15),
-        MockRow(wiki_id="wiki-2", message_count=5)
-    ]
-    
-    # 4. Embedding Count Result
-    # wiki_id, embedding_count
-    embedding_rows = [
-        MockRow(wiki_id="wiki-1", embedding_count=50),
-        MockRow(wiki_id="wiki-2", embedding_count=0) # maybe missing row
-    ]
-
-    # Configure db.execute to return these in order
-    # Each execute result needs to be iterable
-    
-    # We can use side_effect to return different mocks for successive calls
-    async def execute_side_effect(query):
-        # We can try to inspect the query or just return strict order if we know it
-        # The code executes: token, session, message, embedding
-        return MagicMock() # Placeholder
-
-    # To make result iterable, we need the return value of execute() to support __iter__ 
-    # But db.execute is async, so it returns a Result object that we iterate or fetchall.
-    # The code does: for row in await db.execute(...)
-    
-    # So execute return value should be an iterable of rows
-    mock_db_session.execute.side_effect = [
-        token_rows,
-        session_rows,
-        message_rows,
-        embedding_rows
+            wiki_id="wiki-2",
+            total_tokens=500,
+            prompt_tokens=400,
+            completion_tokens=100,
+            request_count=2,
+            active_users=1,
+            session_count=1,
+            message_count=5,
+            embedding_count=0,
+        ),
     ]
+    mock_db_session.execute.return_value = rows
 
     # Patch settings to allow access
     with patch("mw_mcp_server.config.settings.admin_api_key", MagicMock(get_secret_value=lambda: "secret")):
@@ -121,6 +86,7 @@ async def test_usage_aggregation_logic(async_client, mock_db_session):
     assert resp.status_code == 200
     data = resp.json()
     
+    mock_db_session.execute.assert_awaited_once()
     assert len(data["tenants"]) == 2
     
     # Verify Wiki 1
@@ -135,7 +101,19 @@ async def test_usage_aggregation_logic(async_client, mock_db_session):
     w2 = next(t for t in data["tenants"] if t["wiki_id"] == "wiki-2")
     assert w2["total_tokens"] == 500
     assert w2["active_users"] == 1
-    assert w2["embedding_count"] == 0 # Defaulted to 0 due to missing row or just explicit 0
+    assert w2["embedding_count"] == 0
+
+@pytest.mark.asyncio
+async def test_usage_stats_cached_per_window(async_client, mock_db_session):
+    mock_db_session.execute.return_value = []
+
+    with patch("mw_mcp_server.config.settings.admin_api_key", MagicMock(get_secret_value=lambda: "secret")):
+        headers = {"x-admin-key": "secret"}
+        await async_client.get("/stats/usage", params={"days": 7}, headers=headers)
+        await async_client.get("/stats/usage", params={"days": 7}, headers=headers)
+        await async_client.get("/stats/usage", params={"days": 30}, headers=headers)
+
+    assert mock_db_session.execute.await_count == 2
 
 @pytest.mark.asyncio
 async def test_dashboard_html(async_client):
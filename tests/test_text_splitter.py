@@ -0,0 +1,39 @@
+"""
+Text Splitter Tests
+
+Tests for chunk sizing, separator handling and overlap of the page splitter.
+"""
+
+from mw_mcp_server.embeddings.splitter import TextSplitter
+
+
+def test_short_text_is_a_single_stripped_chunk():
+    splitter = TextSplitter(chunk_size=100, chunk_overlap=10)
+
+    assert splitter.split_text("  hello world \n") == ["hello world"]
+    assert splitter.split_text("   ") == []
+
+
+def test_prefers_paragraph_breaks_and_keeps_separators():
+    splitter = TextSplitter(chunk_size=12, chunk_overlap=0)
+
+    chunks = splitter.split_text("first para\n\nsecond one")
+
+    assert chunks == ["first para", "second one"]
+
+
+def test_windows_overlap_and_respect_chunk_size():
+    splitter = TextSplitter(chunk_size=20, chunk_overlap=8)
+    text = " ".join(f"w{i:02d}" for i in range(30))
+
+    chunks = splitter.split_text(text)
+
+    assert all(len(c) <= 20 for c in chunks)
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert nxt.split()[0] in prev.split()
+
+
+def test_unbreakable_text_falls_back_to_characters():
+    splitter = TextSplitter(chunk_size=4, chunk_overlap=0)
+
+    assert splitter.split_text("abcdefghij") == ["abcd", "efgh", "ij"]
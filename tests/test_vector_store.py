@@ -0,0 +1,157 @@
+"""
+Vector Store Tests
+
+Tests for the write paths of the pgvector-backed store.
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mw_mcp_server.db.vector_store import COPY_MIN_ROWS, VectorStore
+
+
+def _copy_session():
+    driver = MagicMock()
+    driver.copy_to_table = AsyncMock()
+    raw = MagicMock(driver_connection=driver)
+    conn = MagicMock()
+    conn.get_raw_connection = AsyncMock(return_value=raw)
+    session = MagicMock()
+    session.connection = AsyncMock(return_value=conn)
+    return session, driver
+
+
+@pytest.mark.asyncio
+async def test_copy_documents_streams_escaped_text_rows():
+    session, driver = _copy_session()
+    store = VectorStore(session)
+
+    count = await store.copy_documents(
+        wiki_id="wiki",
+        page_titles=["Tab\there", "Back\\slash"],
+        section_ids=["chunk_0", None],
+        namespaces=[0, 0],
+        embeddings=[[0.5, -1.0], [2.0, 0.25]],
+        last_modified=datetime(2026, 1, 2, 3, 4, 5),
+        rev_id=42,
+        content_sha1=None,
+        embedding_model="m",
+        chunk_sha1s=["abc", None],
+    )
+
+    assert count == 2
+    args, kwargs = driver.copy_to_table.await_args
+    assert args == ("embedding",)
+    assert kwargs["columns"][-1] == "embedding"
+    rows = kwargs["source"].getvalue().decode().splitlines()
+    assert rows == [
+        "wiki\tTab\\there\tchunk_0\t0\t2026-01-02T03:04:05\t42\t\\N\tm\tabc\t[0.5,-1.0]",
+        "wiki\tBack\\\\slash\t\\N\t0\t2026-01-02T03:04:05\t42\t\\N\tm\t\\N\t[2.0,0.25]",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_copy_documents_skips_empty_batches():
+    session, driver = _copy_session()
+
+    assert await VectorStore(session).copy_documents("wiki", [], [], [], []) == 0
+    driver.copy_to_table.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_add_documents_issues_one_multi_row_insert():
+    session = MagicMock()
+    session.execute = AsyncMock()
+
+    count = await VectorStore(session).add_documents(
+        wiki_id="wiki",
+        page_titles=["A", "A"],
+        section_ids=["chunk_0", "chunk_1"],
+        namespaces=[0, 0],
+        embeddings=[[0.5], [1.0]],
+        chunk_sha1s=["x", "y"],
+    )
+
+    assert count == 2
+    session.execute.assert_awaited_once()
+    (stmt,) = session.execute.await_args.args
+    params = stmt.compile().params
+    assert stmt.table.name == "embedding"
+    assert [params["section_id_m0"], params["section_id_m1"]] == ["chunk_0", "chunk_1"]
+    assert [params["chunk_sha1_m0"], params["chunk_sha1_m1"]] == ["x", "y"]
+
+
+@pytest.mark.asyncio
+async def test_get_chunk_vectors_keys_vectors_by_chunk_sha1():
+    result = MagicMock()
+    result.all.return_value = [
+        MagicMock(chunk_sha1="a", embedding=[0.5, 1.0]),
+        MagicMock(chunk_sha1="b", embedding=[2.0, 0.0]),
+    ]
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=result)
+
+    vectors = await VectorStore(session).get_chunk_vectors("wiki", "Page", "model")
+
+    assert vectors == {"a": [0.5, 1.0], "b": [2.0, 0.0]}
+
+
+@pytest.mark.asyncio
+async def test_replace_page_deletes_then_picks_write_path_by_size():
+    store = VectorStore(MagicMock())
+    store.delete_page = AsyncMock(return_value=3)
+    store.add_documents = AsyncMock(return_value=2)
+    store.copy_documents = AsyncMock(return_value=COPY_MIN_ROWS)
+
+    assert await store.replace_page("wiki", "P", [None] * 2, 0, [[0.0]] * 2) == 2
+    store.add_documents.assert_awaited_once()
+
+    rows = COPY_MIN_ROWS
+    assert await store.replace_page("wiki", "P", [None] * rows, 0, [[0.0]] * rows) == rows
+    store.copy_documents.assert_awaited_once()
+    assert store.copy_documents.await_args.kwargs["page_titles"] == ["P"] * rows
+
+    assert await store.replace_page("wiki", "P", [], 0, []) == 0
+    assert store.delete_page.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_get_stats_reads_page_summary_rows():
+    result = MagicMock()
+    result.all.return_value = [
+        ("B", datetime(2026, 1, 2, 3, 4, 5), 7, 3),
+        ("A", None, None, 2),
+    ]
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=result)
+
+    stats = await VectorStore(session).get_stats("wiki")
+
+    (stmt,) = session.execute.await_args.args
+    assert stmt.get_final_froms()[0].name == "embedding_page_summary"
+    assert stats == {
+        "total_vectors": 5,
+        "total_pages": 2,
+        "embedded_pages": ["A", "B"],
+        "page_timestamps": {"B": "20260102030405"},
+        "page_revisions": {"B": 7},
+    }
+
+
+@pytest.mark.asyncio
+async def test_search_batch_splits_union_rows_by_query():
+    result = MagicMock()
+    result.all.return_value = [
+        MagicMock(query_index=1, page_title="C", section_id=None, namespace=0, score=0.4),
+        MagicMock(query_index=0, page_title="A", section_id="s", namespace=0, score=0.2),
+        MagicMock(query_index=0, page_title="B", section_id=None, namespace=0, score=0.9),
+    ]
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[MagicMock(), result])
+
+    hits = await VectorStore(session).search_batch("wiki", [[0.1], [0.2], [0.3]], k=2)
+
+    assert hits == [[("B", None, 0, 0.9), ("A", "s", 0, 0.2)], [("C", None, 0, 0.4)], []]
+    assert session.execute.await_count == 2